@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Run the corpus micro-benchmarks and compare against stored baselines.
+
+Every example function has one case, timed at several input sizes (see
+``cases.py``). Results are JSON files tagged with a machine fingerprint;
+``compare`` flags statistically significant slowdowns and exits non-zero
+when it finds any.
+
+Usage:
+    python benchmarks/bench.py run
+    python benchmarks/bench.py run --filter sha256_hex --save-baseline
+    python benchmarks/bench.py compare
+    python benchmarks/bench.py compare new.json --baseline old.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import harness
+from cases import CASES
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+BENCH_DIR = Path(__file__).parent
+DEFAULT_RESULTS = BENCH_DIR / "results" / "latest.json"
+BASELINE_DIR = BENCH_DIR / "baselines"
+
+
+def baseline_path(machine_id: str) -> Path:
+    """Return the stored baseline file for a machine fingerprint id.
+
+    Args:
+        machine_id: ``id`` from :func:`harness.machine_fingerprint`.
+
+    Returns:
+        Path of the baseline JSON file.
+    """
+    return BASELINE_DIR / f"{machine_id}.json"
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run the selected cases and store the results."""
+    selected = [c for c in CASES if not args.filter or c.name in args.filter]
+    if not selected:
+        print(f"No benchmark matches {args.filter}", file=sys.stderr)
+        return 1
+
+    measurements: list[harness.Measurement] = []
+    rows = [("benchmark", "median", "calls/sample")]
+    for case in selected:
+        for size in case.sizes:
+            m = harness.measure(
+                case.name,
+                size,
+                case.make(size),
+                min_time_ns=args.min_time_ms * 1_000_000,
+                repeat=args.repeat,
+            )
+            measurements.append(m)
+            rows.append((m.key, harness.format_ns(m.median_ns), str(m.number)))
+    harness.print_table(rows)
+
+    harness.save_results(args.output, measurements)
+    print(f"\nWrote {len(measurements)} results to {args.output}")
+    if args.save_baseline:
+        path = baseline_path(str(harness.machine_fingerprint()["id"]))
+        harness.save_results(path, measurements)
+        print(f"Saved baseline {path}")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Compare two result files and report regressions."""
+    new_machine, new = harness.load_results(args.results)
+    base_file = args.baseline or baseline_path(str(new_machine["id"]))
+    if not base_file.exists():
+        print(f"No baseline at {base_file}", file=sys.stderr)
+        return 1
+    base_machine, base = harness.load_results(base_file)
+    if base_machine["id"] != new_machine["id"]:
+        print("Warning: results come from different machines", file=sys.stderr)
+
+    comparisons = harness.compare(base, new, alpha=args.alpha, threshold=args.threshold)
+    rows = [("benchmark", "baseline", "current", "change", "p-value", "")]
+    for c in comparisons:
+        rows.append(
+            (
+                c.key,
+                harness.format_ns(c.base_ns),
+                harness.format_ns(c.new_ns),
+                f"{c.change:+.1%}",
+                f"{c.p_value:.3g}",
+                "REGRESSION" if c.regression else "",
+            )
+        )
+    harness.print_table(rows)
+
+    regressions = sum(c.regression for c in comparisons)
+    if regressions:
+        print(f"\nFAILED: {regressions} significant regression(s)")
+        return 1
+    print(f"\nOK: no significant regressions in {len(comparisons)} benchmarks")
+    return 0
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Arguments, excluding the program name.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Corpus micro-benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="time the benchmark cases")
+    run_parser.add_argument(
+        "--filter", nargs="+", metavar="NAME", help="only run these cases"
+    )
+    run_parser.add_argument("--output", type=Path, default=DEFAULT_RESULTS)
+    run_parser.add_argument(
+        "--min-time-ms",
+        type=int,
+        default=harness.DEFAULT_MIN_TIME_NS // 1_000_000,
+        help="minimum duration of one timed loop",
+    )
+    run_parser.add_argument(
+        "--repeat", type=int, default=harness.DEFAULT_REPEAT, help="timed loops"
+    )
+    run_parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="also store the results as this machine's baseline",
+    )
+    run_parser.set_defaults(handler=run)
+
+    cmp_parser = sub.add_parser("compare", help="check results against a baseline")
+    cmp_parser.add_argument("results", type=Path, nargs="?", default=DEFAULT_RESULTS)
+    cmp_parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="baseline results (default: stored baseline for this machine)",
+    )
+    cmp_parser.add_argument("--alpha", type=float, default=harness.DEFAULT_ALPHA)
+    cmp_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=harness.DEFAULT_THRESHOLD,
+        help="minimum relative slowdown to flag",
+    )
+    cmp_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    if args.command == "run" and args.repeat < 2:
+        parser.error("--repeat must be >= 2")
+    return args
+
+
+def main(argv: Sequence[str]) -> int:
+    """Dispatch to the selected subcommand."""
+    args = parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,408 @@
+"""Benchmark cases: one per corpus example function.
+
+Each :class:`Case` builds a deterministic input of a given size and returns
+a zero-argument callable that runs the example on it, so input generation
+is never part of the timed loop. Sizes are chosen so the largest one takes
+well under a second per call.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import io
+import json
+import random
+from functools import partial
+from typing import TYPE_CHECKING
+
+from reprorusted_std_only.argparse.basic_example import build_greeting
+from reprorusted_std_only.builtins.abs_example import absolute_value
+from reprorusted_std_only.collections.counter_example import count_words
+from reprorusted_std_only.collections.ngram_example import NgramCounter
+from reprorusted_std_only.collections.sketch_example import CountMinSketch
+from reprorusted_std_only.collections.topk_example import TopKCounter
+from reprorusted_std_only.collections.vocabulary_example import Vocabulary
+from reprorusted_std_only.collections.wordcount_example import count_words_stream
+from reprorusted_std_only.concurrency.threading_example import threaded_sum
+from reprorusted_std_only.contextlib.contextmanager_example import collect_items
+from reprorusted_std_only.csv.columnar_example import read_columns
+from reprorusted_std_only.csv.groupby_example import group_csv
+from reprorusted_std_only.csv.parallel_example import split_ranges
+from reprorusted_std_only.csv.reader_example import parse_csv
+from reprorusted_std_only.csv.stream_example import iter_csv
+from reprorusted_std_only.csv.writer_example import write_csv
+from reprorusted_std_only.dataclasses.basic_example import Point
+from reprorusted_std_only.datetime.basic_example import days_between
+from reprorusted_std_only.enum.basic_example import Color
+from reprorusted_std_only.functools.reduce_example import product
+from reprorusted_std_only.hashlib_secrets.hash_example import sha256_hex
+from reprorusted_std_only.io_files.stringio_example import write_and_read
+from reprorusted_std_only.itertools.chain_example import chain_lists
+from reprorusted_std_only.json.batch_example import canonicalize_jsonl
+from reprorusted_std_only.json.bytes_example import canonicalize_into
+from reprorusted_std_only.json.loads_dumps_example import json_roundtrip
+from reprorusted_std_only.json.query_example import query_many
+from reprorusted_std_only.json.stream_example import iter_canonical
+from reprorusted_std_only.json.typed_example import decode_json_list
+from reprorusted_std_only.math_stats.math_example import greatest_common_divisor
+from reprorusted_std_only.pathlib.path_ops_example import file_extension
+from reprorusted_std_only.re.match_example import is_valid_email
+from reprorusted_std_only.string_text.string_methods_example import title_case
+from reprorusted_std_only.struct_binary.pack_unpack_example import (
+    pack_two_u16,
+    unpack_two_u16,
+)
+from reprorusted_std_only.typing.generics_example import first_or_default
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Fixed seed so every run (and every machine) times the same inputs
+SEED = 20240101
+
+
+@dataclasses.dataclass(frozen=True)
+class Case:
+    """A benchmark for one example function.
+
+    Attributes:
+        name: Benchmark name, the example function's name.
+        sizes: Input sizes to run at.
+        make: Builds the timed callable for a size.
+    """
+
+    name: str
+    sizes: tuple[int, ...]
+    make: Callable[[int], Callable[[], object]]
+
+
+def _words(n: int) -> list[str]:
+    """Return ``n`` pseudo-random words from a Zipf-like vocabulary."""
+    rng = random.Random(SEED)
+    vocab = [f"w{i}" for i in range(max(1, n // 10))]
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    return rng.choices(vocab, weights, k=n)
+
+
+def _csv_text(rows: int) -> str:
+    """Return a CSV document with a header and ``rows`` data rows."""
+    rng = random.Random(SEED)
+    lines = ["id,name,score,note"]
+    for i in range(rows):
+        note = '"a, quoted note"' if i % 7 == 0 else "plain"
+        lines.append(f"{i},user{rng.randrange(1000)},{rng.random():.6f},{note}")
+    return "\n".join(lines)
+
+
+def _json_text(items: int) -> str:
+    """Return a JSON object with ``items`` nested entries in random key order."""
+    rng = random.Random(SEED)
+    keys = [f"k{i:06d}" for i in range(items)]
+    rng.shuffle(keys)
+    doc = {k: {"v": rng.random(), "tags": ["x", "y"], "n": None} for k in keys}
+    return json.dumps(doc)
+
+
+def _jsonl_text(lines: int) -> str:
+    """Return ``lines`` JSON Lines records with keys in random order."""
+    rng = random.Random(SEED)
+    records = []
+    for i in range(lines):
+        record = {"id": i, "v": rng.random(), "tags": ["x", "y"], "n": None}
+        keys = list(record)
+        rng.shuffle(keys)
+        records.append(json.dumps({k: record[k] for k in keys}))
+    return "\n".join(records) + "\n"
+
+
+def _points_text(points: int) -> str:
+    """Return a JSON array of ``points`` ``Point``-shaped objects."""
+    rng = random.Random(SEED)
+    return json.dumps([{"x": rng.random(), "y": rng.random()} for _ in range(points)])
+
+
+def _emails(n: int) -> list[str]:
+    """Return ``n`` strings, alternately valid and invalid addresses."""
+    return [f"user{i}@example{i % 10}.com" if i % 2 else f"user{i}" for i in range(n)]
+
+
+def _each(fn: Callable[[object], object], items: list) -> list:
+    """Call ``fn`` once per item (for examples that take a scalar)."""
+    return [fn(item) for item in items]
+
+
+def _repeat(fn: Callable[[], object], n: int) -> list:
+    """Call ``fn`` ``n`` times."""
+    return [fn() for _ in range(n)]
+
+
+CASES: tuple[Case, ...] = (
+    Case(
+        "sha256_hex",
+        (64, 4096, 262144),
+        lambda n: partial(sha256_hex, "x" * n),
+    ),
+    Case(
+        "parse_csv",
+        (10, 1000, 10000),
+        lambda n: partial(parse_csv, _csv_text(n)),
+    ),
+    Case(
+        "iter_csv",
+        (10, 1000, 10000),
+        lambda n: partial(_stream_csv, _csv_text(n).encode()),
+    ),
+    Case(
+        "read_columns",
+        (10, 1000, 10000),
+        lambda n: partial(_read_columns, _csv_text(n).encode()),
+    ),
+    Case(
+        "split_ranges",
+        (10, 1000, 10000),
+        lambda n: partial(split_ranges, _csv_text(n).encode(), 8),
+    ),
+    Case(
+        "group_csv",
+        (10, 1000, 10000),
+        lambda n: partial(_group_csv, _csv_text(n).encode()),
+    ),
+    Case(
+        "write_csv",
+        (10, 1000, 10000),
+        lambda n: partial(_write_csv, parse_csv(_csv_text(n))),
+    ),
+    Case(
+        "json_roundtrip",
+        (10, 1000, 10000),
+        lambda n: partial(json_roundtrip, _json_text(n)),
+    ),
+    Case(
+        "iter_canonical",
+        (10, 1000, 10000),
+        lambda n: partial(_stream_canonical, _json_text(n).encode()),
+    ),
+    Case(
+        "canonicalize_jsonl",
+        (10, 1000, 10000),
+        lambda n: partial(_canonicalize_jsonl, _jsonl_text(n).encode()),
+    ),
+    Case(
+        "canonicalize_into",
+        (10, 1000, 10000),
+        lambda n: partial(canonicalize_into, _json_text(n).encode(), bytearray()),
+    ),
+    Case(
+        "decode_json_list",
+        (10, 1000, 10000),
+        lambda n: partial(decode_json_list, Point, _points_text(n)),
+    ),
+    Case(
+        "query_many",
+        (10, 1000, 10000),
+        lambda n: partial(query_many, _json_text(n), [f"k{n - 1:06d}.tags[1]"]),
+    ),
+    Case(
+        "count_words",
+        (100, 10000, 100000),
+        lambda n: partial(count_words, " ".join(_words(n))),
+    ),
+    Case(
+        "count_words_stream",
+        (100, 10000, 100000),
+        lambda n: partial(_count_stream, " ".join(_words(n)).encode()),
+    ),
+    Case(
+        "topk_counter",
+        (100, 10000, 100000),
+        lambda n: partial(_top_words, _words(n)),
+    ),
+    Case(
+        "count_min_sketch",
+        (100, 10000, 100000),
+        lambda n: partial(_sketch_words, _words(n)),
+    ),
+    Case(
+        "vocabulary",
+        (100, 10000, 100000),
+        lambda n: partial(_vocabulary, _words(n)),
+    ),
+    Case(
+        "ngram_counter",
+        (100, 10000, 100000),
+        lambda n: partial(_trigrams, _words(n)),
+    ),
+    Case(
+        "threaded_sum",
+        (1, 8, 32),
+        lambda n: partial(threaded_sum, n),
+    ),
+    Case(
+        "build_greeting",
+        (1, 100, 10000),
+        lambda n: partial(build_greeting, "World", n),
+    ),
+    Case(
+        "absolute_value",
+        (1, 100, 10000),
+        lambda n: partial(absolute_value, -(10**n)),
+    ),
+    Case(
+        "collect_items",
+        (1, 100, 10000),
+        lambda n: partial(_fill, n),
+    ),
+    Case(
+        "distance",
+        (1, 100, 10000),
+        lambda n: partial(_distances, _points(n)),
+    ),
+    Case(
+        "days_between",
+        (1, 100, 10000),
+        lambda n: partial(
+            _repeat, partial(days_between, "2000-01-01", "2024-02-29"), n
+        ),
+    ),
+    Case(
+        "hex",
+        (1, 100, 10000),
+        lambda n: partial(_each, Color.hex, list(Color) * n),
+    ),
+    Case(
+        "product",
+        (10, 1000, 10000),
+        lambda n: partial(product, list(range(1, n + 1))),
+    ),
+    Case(
+        "write_and_read",
+        (10, 1000, 100000),
+        lambda n: partial(write_and_read, _words(n)),
+    ),
+    Case(
+        "chain_lists",
+        (10, 1000, 100000),
+        lambda n: partial(chain_lists, list(range(n)), list(range(n))),
+    ),
+    Case(
+        "greatest_common_divisor",
+        (64, 4096, 65536),
+        lambda n: partial(greatest_common_divisor, 3 ** (n // 2) * 2**n, 3**n),
+    ),
+    Case(
+        "file_extension",
+        (1, 100, 10000),
+        lambda n: partial(file_extension, "dir/" * n + "archive.tar.gz"),
+    ),
+    Case(
+        "is_valid_email",
+        (1, 100, 10000),
+        lambda n: partial(_each, is_valid_email, _emails(n)),
+    ),
+    Case(
+        "title_case",
+        (100, 10000, 1000000),
+        lambda n: partial(title_case, " ".join(_words(n // 4 or 1))),
+    ),
+    Case(
+        "pack_two_u16",
+        (1, 100, 10000),
+        lambda n: partial(_each, partial(pack_two_u16, 7), list(range(n))),
+    ),
+    Case(
+        "unpack_two_u16",
+        (1, 100, 10000),
+        lambda n: partial(_each, unpack_two_u16, [pack_two_u16(1, 2)] * n),
+    ),
+    Case(
+        "first_or_default",
+        (1, 100, 10000),
+        lambda n: partial(first_or_default, list(range(n)), -1),
+    ),
+)
+
+
+def _stream_csv(data: bytes) -> int:
+    """Stream ``data`` through ``iter_csv`` and count the rows."""
+    return sum(len(batch) for batch in iter_csv(io.BytesIO(data)))
+
+
+def _read_columns(data: bytes) -> int:
+    """Parse ``data`` into typed columns and count them."""
+    return len(read_columns(io.BytesIO(data)))
+
+
+def _group_csv(data: bytes) -> int:
+    """Sum and count ``data`` scores per name and return the group count."""
+    specs = [("sum", "score"), ("count", "*")]
+    return len(group_csv(io.BytesIO(data), ["name"], specs))
+
+
+def _write_csv(rows: list[list[str]]) -> int:
+    """Write ``rows`` into memory with ``write_csv`` and count them."""
+    return write_csv(io.BytesIO(), rows).rows
+
+
+def _stream_canonical(data: bytes) -> int:
+    """Canonicalize ``data`` with ``iter_canonical`` and return the length."""
+    return sum(map(len, iter_canonical(io.BytesIO(data))))
+
+
+def _canonicalize_jsonl(data: bytes) -> int:
+    """Canonicalize JSONL ``data`` in-process and count the written lines."""
+    return canonicalize_jsonl(io.BytesIO(data), io.BytesIO(), jobs=1).written
+
+
+def _count_stream(data: bytes) -> int:
+    """Count the words in ``data`` 16 KiB at a time and return the vocabulary size."""
+    return len(count_words_stream(io.BytesIO(data), chunk_size=1 << 14))
+
+
+def _top_words(words: list[str]) -> list[tuple[str, int]]:
+    """Summarize ``words`` in 100 counters and return the top ten."""
+    top = TopKCounter(100)
+    top.update(words)
+    return top.most_common(10)
+
+
+def _sketch_words(words: list[str]) -> int:
+    """Count ``words`` in a 4096x4 sketch and return the estimate of the first."""
+    sketch = CountMinSketch(4096)
+    sketch.update(words)
+    return sketch.estimate(words[0])
+
+
+def _vocabulary(words: list[str]) -> int:
+    """Count ``words`` into a fresh ``Vocabulary`` and return its size."""
+    vocab = Vocabulary()
+    vocab.add_tokens(words)
+    return len(vocab)
+
+
+def _trigrams(words: list[str]) -> int:
+    """Count the 3-grams of ``words`` and return how many are distinct."""
+    counter = NgramCounter(3)
+    counter.update(words)
+    return len(counter)
+
+
+def _fill(n: int) -> list[str]:
+    """Append ``n`` items inside ``collect_items``."""
+    with collect_items() as items:
+        for i in range(n):
+            items.append(str(i))
+    return items
+
+
+def _distances(pairs: list[tuple[Point, Point]]) -> list[float]:
+    """Return the distance within each point pair."""
+    return [a.distance(b) for a, b in pairs]
+
+
+def _points(n: int) -> list[tuple[Point, Point]]:
+    """Return ``n`` deterministic point pairs."""
+    rng = random.Random(SEED)
+    return [
+        (Point(rng.random(), rng.random()), Point(rng.random(), rng.random()))
+        for _ in range(n)
+    ]
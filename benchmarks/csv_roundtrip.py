@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Check that ``write_csv`` keeps up with ``parse_csv`` on the same data.
+
+Writes synthetic rows (integers, names, floats and quoted notes) with
+``write_csv`` into memory, parses the output back with ``parse_csv`` and
+checks the round trip is lossless. Both directions are timed with the
+harness and reported in rows per second, from the fastest timed loop,
+which is the one least disturbed by other load on the machine. Exits
+non-zero when the writer's throughput at any size falls below
+``--min-ratio`` times the reader's.
+
+Usage:
+    python benchmarks/csv_roundtrip.py
+    python benchmarks/csv_roundtrip.py --sizes 1000 100000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import random
+import sys
+from functools import partial
+from typing import TYPE_CHECKING
+
+import harness
+
+from reprorusted_std_only.csv.reader_example import parse_csv
+from reprorusted_std_only.csv.writer_example import write_csv
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+DEFAULT_SIZES = (10_000, 100_000)
+DEFAULT_MIN_RATIO = 1.0
+SEED = 42
+
+
+def synthetic_rows(n: int) -> list[list[str]]:
+    """Return a header and ``n`` data rows of CSV fields.
+
+    Args:
+        n: Number of data rows.
+
+    Returns:
+        Rows of strings, as ``parse_csv`` would return them.
+    """
+    rng = random.Random(SEED)
+    rows = [["id", "name", "score", "note"]]
+    for i in range(n):
+        note = "a, quoted note" if i % 7 == 0 else "plain"
+        rows.append([str(i), f"user{rng.randrange(1000)}", f"{rng.random():.6f}", note])
+    return rows
+
+
+def _write(rows: list[list[str]]) -> int:
+    """Write ``rows`` with ``write_csv`` into memory and return the row count."""
+    return write_csv(io.BytesIO(), rows).rows
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Arguments, excluding the program name.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="write_csv vs parse_csv round trip.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        metavar="N",
+        help="data rows per round trip",
+    )
+    parser.add_argument(
+        "--min-time-ms",
+        type=int,
+        default=harness.DEFAULT_MIN_TIME_NS // 1_000_000,
+        help="minimum duration of one timed loop",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=harness.DEFAULT_REPEAT, help="timed loops"
+    )
+    parser.add_argument(
+        "--min-ratio",
+        type=float,
+        default=DEFAULT_MIN_RATIO,
+        help="required writer throughput as a multiple of the reader's",
+    )
+    args = parser.parse_args(argv)
+    if min(args.sizes) < 1:
+        parser.error("--sizes must be >= 1")
+    return args
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    """Time both directions at each size and check the writer keeps up."""
+    args = parse_args(argv)
+    options = {"min_time_ns": args.min_time_ms * 1_000_000, "repeat": args.repeat}
+    table = [("rows", "write rows/s", "parse rows/s", "write/parse")]
+    worst = float("inf")
+    for size in sorted(args.sizes):
+        rows = synthetic_rows(size)
+        out = io.BytesIO()
+        write_csv(out, rows)
+        text = out.getvalue().decode()
+        if parse_csv(text) != rows:
+            print(f"FAILED: round trip at {size} rows changed the data")
+            return 1
+        write = harness.measure("write_csv", size, partial(_write, rows), **options)
+        read = harness.measure("parse_csv", size, partial(parse_csv, text), **options)
+        write_ns, read_ns = min(write.samples_ns), min(read.samples_ns)
+        ratio = read_ns / write_ns
+        worst = min(worst, ratio)
+        table.append(
+            (
+                str(size),
+                f"{len(rows) / write_ns * 1e9:,.0f}",
+                f"{len(rows) / read_ns * 1e9:,.0f}",
+                f"{ratio:.2f}x",
+            )
+        )
+    harness.print_table(table)
+
+    if worst < args.min_ratio:
+        print(f"\nFAILED: writer reached {worst:.2f}x the reader (< {args.min_ratio}x)")
+        return 1
+    print(f"\nOK: writer reached at least {worst:.2f}x the reader's throughput")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Compare ``decode_json_list`` with a naive ``Point(**d)`` loop.
+
+For each size, times ``json.loads`` alone, then ``json.loads`` followed by
+``[Point(**d) for d in ...]``, then ``decode_json_list(Point, ...)``, which
+checks every field's type on top. Exits non-zero when the two decoders
+produce different points.
+
+Usage:
+    python benchmarks/dataclass_decode.py
+    python benchmarks/dataclass_decode.py --sizes 10 1000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from functools import partial
+from typing import TYPE_CHECKING
+
+import harness
+
+from reprorusted_std_only.dataclasses.basic_example import Point
+from reprorusted_std_only.json.typed_example import decode_json_list
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+DEFAULT_SIZES = (10, 1000, 100_000)
+SEED = 42
+
+
+def synthetic_points(n: int) -> str:
+    """Return a JSON array of ``n`` point objects.
+
+    Args:
+        n: Number of points.
+
+    Returns:
+        JSON text, as ``json.dumps`` writes it.
+    """
+    rng = random.Random(SEED)
+    return json.dumps([{"x": rng.random(), "y": rng.random()} for _ in range(n)])
+
+
+def naive_decode(text: str) -> list[Point]:
+    """Decode ``text`` with one ``Point(**d)`` call per object."""
+    return [Point(**d) for d in json.loads(text)]
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Arguments, excluding the program name.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="decode_json_list vs Point(**d) over json.loads."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        metavar="N",
+        help="points per payload",
+    )
+    parser.add_argument(
+        "--min-time-ms",
+        type=int,
+        default=harness.DEFAULT_MIN_TIME_NS // 1_000_000,
+        help="minimum duration of one timed loop",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=harness.DEFAULT_REPEAT, help="timed loops"
+    )
+    args = parser.parse_args(argv)
+    if min(args.sizes) < 1:
+        parser.error("--sizes must be >= 1")
+    return args
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    """Time both decoders at each size and check they agree."""
+    args = parse_args(argv)
+    options = {"min_time_ns": args.min_time_ms * 1_000_000, "repeat": args.repeat}
+    table = [("points", "json.loads", "Point(**d)", "decode_json_list")]
+    for size in sorted(args.sizes):
+        text = synthetic_points(size)
+        if decode_json_list(Point, text) != naive_decode(text):
+            print(f"FAILED: decoded points differ at {size} points")
+            return 1
+        times = [
+            min(harness.measure(name, size, fn, **options).samples_ns)
+            for name, fn in (
+                ("json.loads", partial(json.loads, text)),
+                ("naive", partial(naive_decode, text)),
+                ("decode_json_list", partial(decode_json_list, Point, text)),
+            )
+        ]
+        table.append(
+            (
+                str(size),
+                harness.format_ns(times[0]),
+                harness.format_ns(times[1]),
+                f"{harness.format_ns(times[2])} ({times[1] / times[2]:.2f}x)",
+            )
+        )
+    harness.print_table(table)
+    print("\nOK: decode_json_list matches Point(**d) at every size")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
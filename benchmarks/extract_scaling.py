@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Check that function extraction scales linearly with module size.
+
+Times ``extract_functions`` from ``scripts/parse_cache.py`` on synthetic
+modules of increasing size (top-level functions, methods, ``async def`` and
+nested functions) and reports the cost per function. Slicing segments from
+a per-file line index keeps that cost flat; re-scanning the source for
+every function, as ``ast.get_source_segment`` does, makes it grow with the
+module. Exits non-zero when the per-function cost at the largest size
+exceeds ``--max-growth`` times the cost at the smallest.
+
+Usage:
+    python benchmarks/extract_scaling.py
+    python benchmarks/extract_scaling.py --sizes 1000 50000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import sys
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import harness
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from parse_cache import extract_functions
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+DEFAULT_SIZES = (1_000, 10_000, 50_000)
+DEFAULT_MAX_GROWTH = 2.0
+
+# One block of the synthetic module and the functions it defines
+_BLOCK = '''
+def func_{i}(x: int, y: int = {i}) -> int:
+    """Return a value for block {i}."""
+    return x + y
+
+
+async def fetch_{i}(url: str) -> str:
+    """Pretend to fetch {i} — naïvely."""
+    return url
+
+
+class Shape{i}:
+    """A shape with two methods."""
+
+    def area(self) -> float:
+        """Area of shape {i}."""
+        return {i}.0
+
+    def scaled(self, k: float) -> float:
+        def inner(v: float) -> float:
+            return v * k
+
+        return inner(self.area())
+'''
+_FUNCTIONS_PER_BLOCK = 5
+
+
+def synthetic_module(functions: int) -> str:
+    """Return Python source defining roughly ``functions`` functions.
+
+    Args:
+        functions: Target number of functions (rounded up to a whole block).
+
+    Returns:
+        Module source text.
+    """
+    blocks = -(-functions // _FUNCTIONS_PER_BLOCK)
+    return "".join(_BLOCK.format(i=i) for i in range(blocks))
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Arguments, excluding the program name.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="extract_functions scaling check.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        metavar="N",
+        help="functions per synthetic module",
+    )
+    parser.add_argument(
+        "--min-time-ms",
+        type=int,
+        default=harness.DEFAULT_MIN_TIME_NS // 1_000_000,
+        help="minimum duration of one timed loop",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=harness.DEFAULT_REPEAT, help="timed loops"
+    )
+    parser.add_argument(
+        "--max-growth",
+        type=float,
+        default=DEFAULT_MAX_GROWTH,
+        help="allowed ratio of per-function cost, largest over smallest size",
+    )
+    args = parser.parse_args(argv)
+    if min(args.sizes) < 1:
+        parser.error("--sizes must be >= 1")
+    return args
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    """Time extraction at each size and check the per-function cost."""
+    args = parse_args(argv)
+    rows = [("functions", "median", "per function", "vs smallest")]
+    per_function: list[float] = []
+    for size in sorted(args.sizes):
+        source = synthetic_module(size)
+        # Parse outside the timed loop: only the extraction is measured
+        tree = ast.parse(source)
+        count = len(extract_functions(source, tree))
+        m = harness.measure(
+            "extract_functions",
+            count,
+            partial(extract_functions, source, tree),
+            min_time_ns=args.min_time_ms * 1_000_000,
+            repeat=args.repeat,
+        )
+        per_function.append(m.median_ns / count)
+        rows.append(
+            (
+                str(count),
+                harness.format_ns(m.median_ns),
+                harness.format_ns(per_function[-1]),
+                f"{per_function[-1] / per_function[0]:.2f}x",
+            )
+        )
+    harness.print_table(rows)
+
+    growth = per_function[-1] / per_function[0]
+    if growth > args.max_growth:
+        print(f"\nFAILED: per-function cost grew {growth:.2f}x (> {args.max_growth}x)")
+        return 1
+    print(f"\nOK: per-function cost grew {growth:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
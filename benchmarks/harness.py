@@ -0,0 +1,340 @@
+"""Timing, result storage and regression detection for the benchmark suite.
+
+Stdlib-only, like the corpus it measures. Each benchmark is a zero-argument
+callable; :func:`measure` calibrates how many calls fit in a minimum time
+window, then records several such windows with ``time.perf_counter_ns``.
+Results carry a machine fingerprint so that :func:`compare` only trusts
+baselines recorded on the same hardware and interpreter.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import gc
+import hashlib
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+# Bumped whenever the results file layout changes
+RESULTS_VERSION = 1
+
+DEFAULT_MIN_TIME_NS = 20_000_000
+DEFAULT_REPEAT = 7
+
+# A slowdown must be both statistically significant and at least this large
+DEFAULT_ALPHA = 0.01
+DEFAULT_THRESHOLD = 0.05
+
+
+@dataclasses.dataclass(frozen=True)
+class Measurement:
+    """Timing samples for one benchmark at one input size.
+
+    Attributes:
+        name: Benchmark name.
+        size: Input size parameter.
+        number: Calls per sample, found by calibration.
+        samples_ns: Mean nanoseconds per call, one entry per sample.
+    """
+
+    name: str
+    size: int
+    number: int
+    samples_ns: list[float]
+
+    @property
+    def key(self) -> str:
+        """Identifier used to pair measurements across result files."""
+        return f"{self.name}[{self.size}]"
+
+    @property
+    def median_ns(self) -> float:
+        """Median nanoseconds per call."""
+        return statistics.median(self.samples_ns)
+
+
+def machine_fingerprint() -> dict[str, str | int]:
+    """Describe the hardware and interpreter the results come from.
+
+    Only the CPU, core count and Python implementation and version go into
+    the ``id``, so the same hardware keeps its baselines across hostnames,
+    containers and kernel updates. The host and OS are kept alongside for
+    reference.
+
+    Returns:
+        Dict of platform facts plus an ``id`` hashed from the keyed ones.
+    """
+    keyed: dict[str, str | int] = {
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count() or 0,
+        "implementation": platform.python_implementation(),
+        "python": platform.python_version(),
+    }
+    digest = hashlib.sha256(json.dumps(keyed, sort_keys=True).encode())
+    return {
+        **keyed,
+        "system": platform.system(),
+        "release": platform.release(),
+        "node": platform.node(),
+        "id": digest.hexdigest()[:16],
+    }
+
+
+def _time_loop(fn: Callable[[], object], number: int) -> int:
+    """Return the nanoseconds taken by ``number`` calls of ``fn``."""
+    loop = range(number)
+    start = time.perf_counter_ns()
+    for _ in loop:
+        fn()
+    return time.perf_counter_ns() - start
+
+
+def calibrate(fn: Callable[[], object], min_time_ns: int) -> int:
+    """Find a call count whose loop takes at least ``min_time_ns``.
+
+    Args:
+        fn: Benchmark callable.
+        min_time_ns: Minimum duration of one timed loop.
+
+    Returns:
+        Number of calls per timed loop (a power of two).
+    """
+    number = 1
+    while _time_loop(fn, number) < min_time_ns:
+        number *= 2
+    return number
+
+
+def measure(
+    name: str,
+    size: int,
+    fn: Callable[[], object],
+    *,
+    min_time_ns: int = DEFAULT_MIN_TIME_NS,
+    repeat: int = DEFAULT_REPEAT,
+) -> Measurement:
+    """Time ``fn`` in calibrated loops.
+
+    The garbage collector is disabled while a loop runs, as ``timeit``
+    does, so collections triggered by earlier work do not land in a sample.
+
+    Args:
+        name: Benchmark name.
+        size: Input size parameter.
+        fn: Benchmark callable, already bound to its input.
+        min_time_ns: Minimum duration of one timed loop.
+        repeat: Number of timed loops.
+
+    Returns:
+        The recorded measurement.
+    """
+    number = calibrate(fn, min_time_ns)
+    samples: list[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            samples.append(_time_loop(fn, number) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return Measurement(name, size, number, samples)
+
+
+def save_results(path: Path, measurements: list[Measurement]) -> None:
+    """Write measurements and the machine fingerprint as JSON.
+
+    Args:
+        path: Destination file; parent directories are created.
+        measurements: Results to store.
+    """
+    payload = {
+        "version": RESULTS_VERSION,
+        "machine": machine_fingerprint(),
+        "created_ns": time.time_ns(),
+        "results": [dataclasses.asdict(m) for m in measurements],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=1) + "\n")
+
+
+def load_results(path: Path) -> tuple[dict, list[Measurement]]:
+    """Read a file written by :func:`save_results`.
+
+    Args:
+        path: Results file.
+
+    Returns:
+        Tuple of (machine fingerprint, measurements).
+
+    Raises:
+        ValueError: When the file has an unsupported layout version.
+    """
+    payload = json.loads(path.read_text())
+    if payload.get("version") != RESULTS_VERSION:
+        msg = f"{path}: unsupported results version {payload.get('version')!r}"
+        raise ValueError(msg)
+    return payload["machine"], [Measurement(**r) for r in payload["results"]]
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    """Continued fraction for the incomplete beta function (Lentz)."""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        for aa in (
+            m * (b - m) * x / ((qam + m2) * (a + m2)),
+            -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2)),
+        ):
+            d = 1.0 + aa * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + aa / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return h
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta function ``I_x(a, b)``."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    ln_front = (
+        math.lgamma(a + b)
+        - math.lgamma(a)
+        - math.lgamma(b)
+        + a * math.log(x)
+        + b * math.log1p(-x)
+    )
+    front = math.exp(ln_front)
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def welch_t_test(base: list[float], new: list[float]) -> tuple[float, float]:
+    """Two-sided Welch's t-test for a difference in means.
+
+    Args:
+        base: Baseline samples (at least two).
+        new: Candidate samples (at least two).
+
+    Returns:
+        Tuple of (t statistic, p-value). ``t`` is positive when ``new`` is
+        slower than ``base``.
+    """
+    mean_base, mean_new = statistics.fmean(base), statistics.fmean(new)
+    var_base = statistics.variance(base) / len(base)
+    var_new = statistics.variance(new) / len(new)
+    se2 = var_base + var_new
+    if se2 == 0.0:
+        if mean_base == mean_new:
+            return 0.0, 1.0
+        return math.copysign(math.inf, mean_new - mean_base), 0.0
+    t = (mean_new - mean_base) / math.sqrt(se2)
+    df = se2**2 / (var_base**2 / (len(base) - 1) + var_new**2 / (len(new) - 1))
+    p = _betainc(df / 2.0, 0.5, df / (df + t * t))
+    return t, p
+
+
+@dataclasses.dataclass(frozen=True)
+class Comparison:
+    """Outcome of comparing one benchmark against its baseline.
+
+    Attributes:
+        key: Benchmark identifier (``name[size]``).
+        base_ns: Baseline median nanoseconds per call.
+        new_ns: Candidate median nanoseconds per call.
+        p_value: Welch's t-test p-value.
+        regression: Whether the slowdown is significant and large enough.
+    """
+
+    key: str
+    base_ns: float
+    new_ns: float
+    p_value: float
+    regression: bool
+
+    @property
+    def change(self) -> float:
+        """Relative change of the median (positive means slower)."""
+        return self.new_ns / self.base_ns - 1.0
+
+
+def compare(
+    base: list[Measurement],
+    new: list[Measurement],
+    *,
+    alpha: float = DEFAULT_ALPHA,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Comparison]:
+    """Pair measurements by key and flag significant regressions.
+
+    A benchmark regresses when Welch's t-test rejects equal means at
+    ``alpha`` and the median slowed down by more than ``threshold``.
+    Benchmarks present in only one input are skipped.
+
+    Args:
+        base: Baseline measurements.
+        new: Candidate measurements.
+        alpha: Significance level.
+        threshold: Minimum relative slowdown to report.
+
+    Returns:
+        One comparison per benchmark present in both inputs, in ``new`` order.
+    """
+    baseline = {m.key: m for m in base}
+    comparisons: list[Comparison] = []
+    for m in new:
+        old = baseline.get(m.key)
+        if old is None:
+            continue
+        t, p = welch_t_test(old.samples_ns, m.samples_ns)
+        slower = m.median_ns > old.median_ns * (1.0 + threshold)
+        comparisons.append(
+            Comparison(
+                m.key, old.median_ns, m.median_ns, p, t > 0 and p < alpha and slower
+            )
+        )
+    return comparisons
+
+
+def format_ns(ns: float) -> str:
+    """Format a duration with a readable unit.
+
+    Args:
+        ns: Duration in nanoseconds.
+
+    Returns:
+        e.g. ``"812 ns"``, ``"12.3 us"``, ``"4.56 ms"``.
+    """
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.3g} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def print_table(rows: list[tuple[str, ...]]) -> None:
+    """Print rows as left-aligned columns."""
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        line = "  ".join(cell.ljust(w) for cell, w in zip(row, widths, strict=True))
+        print(line.rstrip(), file=sys.stdout)
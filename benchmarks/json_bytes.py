@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Compare ``canonicalize_into`` with ``json_roundtrip`` on byte payloads.
+
+For each payload size, times the str API as a bytes caller has to use it
+(``json_roundtrip(data.decode()).encode()``) against ``canonicalize_into``
+writing into one reused ``bytearray``, without and with canonical-input
+detection. Without detection ``canonicalize_into`` does the same decode,
+parse, serialize and encode plus a copy into the buffer, so it is
+expected to match the str API, not beat it. Payloads are measured both
+with shuffled keys and already in canonical form, where detection copies
+them through without re-serializing. Exits non-zero when any output
+differs from ``json_roundtrip``'s.
+
+Usage:
+    python benchmarks/json_bytes.py
+    python benchmarks/json_bytes.py --sizes 10 1000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from functools import partial
+from typing import TYPE_CHECKING
+
+import harness
+
+from reprorusted_std_only.json.bytes_example import canonicalize_into
+from reprorusted_std_only.json.loads_dumps_example import json_roundtrip
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+DEFAULT_SIZES = (1, 100, 10_000)
+SEED = 42
+
+
+def synthetic_payload(n: int) -> bytes:
+    """Return a JSON array of ``n`` records with keys in random order.
+
+    Args:
+        n: Number of records.
+
+    Returns:
+        UTF-8 encoded JSON, as read from a socket or file.
+    """
+    rng = random.Random(SEED)
+    records = []
+    for i in range(n):
+        record = {
+            "id": i,
+            "name": f"user {rng.randrange(1000)}",
+            "score": rng.randrange(10**6) / 100,
+            "tags": ["alpha", "beta"][: rng.randrange(3)],
+            "active": rng.random() < 0.5,
+            "city": "Zürich" if i % 5 == 0 else "Oslo",
+        }
+        keys = list(record)
+        rng.shuffle(keys)
+        records.append({k: record[k] for k in keys})
+    return json.dumps(records, ensure_ascii=False).encode()
+
+
+def _via_str(data: bytes) -> bytes:
+    """Canonicalize ``data`` through the str API."""
+    return json_roundtrip(data.decode()).encode()
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Arguments, excluding the program name.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="canonicalize_into vs json_roundtrip on bytes."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        metavar="N",
+        help="records per payload",
+    )
+    parser.add_argument(
+        "--min-time-ms",
+        type=int,
+        default=harness.DEFAULT_MIN_TIME_NS // 1_000_000,
+        help="minimum duration of one timed loop",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=harness.DEFAULT_REPEAT, help="timed loops"
+    )
+    args = parser.parse_args(argv)
+    if min(args.sizes) < 1:
+        parser.error("--sizes must be >= 1")
+    return args
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    """Time both APIs at each size and check they agree."""
+    args = parse_args(argv)
+    options = {"min_time_ns": args.min_time_ms * 1_000_000, "repeat": args.repeat}
+    table = [("records", "bytes", "input", "json_roundtrip", "into", "into, detect")]
+    out = bytearray()
+    for size in sorted(args.sizes):
+        shuffled = synthetic_payload(size)
+        canonical = _via_str(shuffled)
+        for label, data in (("shuffled", shuffled), ("canonical", canonical)):
+            for detect in (False, True):
+                canonicalize_into(data, out, detect)
+                if out != canonical:
+                    print(f"FAILED: {label} output at {size} records differs")
+                    return 1
+            base = harness.measure(
+                "json_roundtrip", size, partial(_via_str, data), **options
+            )
+            times = [min(base.samples_ns)]
+            for detect in (False, True):
+                fn = partial(canonicalize_into, data, out, detect)
+                times.append(
+                    min(harness.measure("into", size, fn, **options).samples_ns)
+                )
+            table.append(
+                (
+                    str(size),
+                    f"{len(data):,}",
+                    label,
+                    harness.format_ns(times[0]),
+                    f"{harness.format_ns(times[1])} ({times[0] / times[1]:.2f}x)",
+                    f"{harness.format_ns(times[2])} ({times[0] / times[2]:.2f}x)",
+                )
+            )
+    harness.print_table(table)
+    print("\nOK: canonicalize_into matches json_roundtrip at every size")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
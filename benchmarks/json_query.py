@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Compare ``query_many`` with a full ``json.loads`` for a few paths.
+
+For each size, builds a document with a small header, an array of records
+and a trailer, then times three ways of reading a few values: a full
+``json.loads`` followed by indexing, ``query_many`` for paths in the
+header and ``query_many`` for paths at the very end. Both queries skip
+every record, since a later duplicate key would replace the header. Exits
+non-zero when any queried value differs from the fully parsed one.
+
+Usage:
+    python benchmarks/json_query.py
+    python benchmarks/json_query.py --sizes 10 1000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import harness
+
+from reprorusted_std_only.json.query_example import parse_path, query_many
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+DEFAULT_SIZES = (100, 10_000, 50_000)
+SEED = 42
+
+
+def synthetic_document(n: int) -> str:
+    """Return a JSON document holding ``n`` records between a header and trailer.
+
+    Args:
+        n: Number of records.
+
+    Returns:
+        JSON text; 50,000 records make about 8 MB.
+    """
+    rng = random.Random(SEED)
+    records = [
+        {
+            "id": i,
+            "name": f"user {rng.randrange(1000)}",
+            "score": rng.random(),
+            "tags": ["alpha", "beta"][: rng.randrange(3)],
+            "address": {"city": "Oslo", "lines": [f"{i} Main St", None]},
+        }
+        for i in range(n)
+    ]
+    return json.dumps(
+        {
+            "meta": {"version": 3, "source": "synthetic"},
+            "records": records,
+            "trailer": {"count": n},
+        }
+    )
+
+
+def paths_for(n: int) -> tuple[list[str], list[str]]:
+    """Return paths near the start and at the end of ``synthetic_document(n)``."""
+    head = ["meta.version", "records[0].name"]
+    tail = [f"records[{n - 1}].address.city", "trailer.count"]
+    return head, tail
+
+
+def full_parse(text: str, paths: list[str]) -> dict[str, Any]:
+    """Look up ``paths`` in a fully parsed document."""
+    doc = json.loads(text)
+    values = {}
+    for path in paths:
+        value = doc
+        for step in parse_path(path):
+            value = value[step]
+        values[path] = value
+    return values
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Arguments, excluding the program name.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="query_many vs a full json.loads.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        metavar="N",
+        help="records per document",
+    )
+    parser.add_argument(
+        "--min-time-ms",
+        type=int,
+        default=harness.DEFAULT_MIN_TIME_NS // 1_000_000,
+        help="minimum duration of one timed loop",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=harness.DEFAULT_REPEAT, help="timed loops"
+    )
+    args = parser.parse_args(argv)
+    if min(args.sizes) < 1:
+        parser.error("--sizes must be >= 1")
+    return args
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    """Time the full parse and both queries at each size and check they agree."""
+    args = parse_args(argv)
+    options = {"min_time_ns": args.min_time_ms * 1_000_000, "repeat": args.repeat}
+    table = [("records", "bytes", "json.loads", "query (head)", "query (tail)")]
+    for size in sorted(args.sizes):
+        text = synthetic_document(size)
+        head, tail = paths_for(size)
+        for paths in (head, tail):
+            if query_many(text, paths) != full_parse(text, paths):
+                print(f"FAILED: queried values differ at {size} records")
+                return 1
+        base = harness.measure(
+            "json.loads", size, partial(full_parse, text, head + tail), **options
+        )
+        times = [min(base.samples_ns)]
+        for paths in (head, tail):
+            fn = partial(query_many, text, paths)
+            times.append(min(harness.measure("query", size, fn, **options).samples_ns))
+        table.append(
+            (
+                str(size),
+                f"{len(text):,}",
+                harness.format_ns(times[0]),
+                f"{harness.format_ns(times[1])} ({times[0] / times[1]:.0f}x)",
+                f"{harness.format_ns(times[2])} ({times[0] / times[2]:.1f}x)",
+            )
+        )
+    harness.print_table(table)
+    print("\nOK: query_many matches json.loads at every size")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,101 +1,1233 @@
 #!/usr/bin/env python3
 """Export stdlib corpus to Apache Parquet format.
 
+Records are streamed into the output file in fixed-size batches, so memory
+stays bounded by the batch size rather than the corpus size. With ``--jobs``
+the files are parsed across a process pool; results are consumed in sorted
+path order, so the output is byte-identical to a serial run.
+
+With ``--incremental`` a sidecar ``<output name>.manifest.json`` records the
+options that shape the output (format, functions table, batch size) and
+the size, ``mtime_ns`` and SHA-256 of every module; only changed modules
+are parsed
+again and merged into the existing output. ``--watch`` keeps running and
+does the same after every save, polling file stats rather than contents.
+
+With ``--shard-bytes`` the corpus is split into size-targeted shards in a
+directory, plus a ``_metadata`` file holding every shard's row counts and
+category ranges.
+
+``--format arrow`` writes uncompressed Arrow IPC (Feather v2) files that
+readers can memory-map, and ``--format jsonl`` gzip-compressed JSON Lines
+that need no pyarrow at all (the default when pyarrow is missing). Every
+format is fed by the same record pipeline.
+
+Alongside the module table, ``functions.parquet`` holds one row per function
+(qualified name, signature, docstring, line and source segment), with one
+category per row group so readers can filter by category without scanning
+the corpus.
+
 Usage:
-    python -m reprorusted_std_only.export_corpus
+    python scripts/export_corpus.py
     python scripts/export_corpus.py --output data/corpus.parquet
+    python scripts/export_corpus.py --jobs 0 --batch-size 512
+    python scripts/export_corpus.py --incremental
+    python scripts/export_corpus.py --watch --interval 0.25
+    python scripts/export_corpus.py --shard-bytes 128MB
+    python scripts/export_corpus.py --format arrow
+    python scripts/export_corpus.py --functions-output data/functions.parquet
 """
 
 from __future__ import annotations
 
-import ast
+import argparse
+import collections
+import contextlib
+import functools
+import gzip
+import hashlib
+import heapq
+import io
+import itertools
+import json
+import os
+import re
+import shutil
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from parse_cache import DEFAULT_CACHE_DIR, ParseCache, analyze_source
+
+# Note: pyarrow is a dev dependency, not in the corpus source. Without it
+# only the stdlib jsonl format is available.
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+
+SRC_DIR = Path(__file__).parent.parent / "src" / "reprorusted_std_only"
+DEFAULT_OUTPUT = Path(__file__).parent.parent / "data" / "corpus.parquet"
+
+# Export formats and their file suffixes. ``parquet`` is zstd-compressed;
+# ``arrow`` is an uncompressed Arrow IPC file (Feather v2) that readers can
+# memory-map; ``jsonl`` is gzip-compressed JSON Lines written with the
+# stdlib alone.
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow", "jsonl": ".jsonl.gz"}
+DEFAULT_FORMAT = "parquet" if pa is not None else "jsonl"
+
+# Written next to the corpus output unless --functions-output says otherwise
+FUNCTIONS_STEM = "functions"
+
+# Rows per record batch (and therefore per Parquet row group)
+DEFAULT_BATCH_SIZE = 1024
+
+# Bumped whenever the manifest layout or the record schema changes
+MANIFEST_VERSION = 4
+
+# Shard file names and the summary file of a --shard-bytes export
+SHARD_PATTERN = "part-{:05d}.parquet"
+SHARD_METADATA = "_metadata"
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+# Seconds between polls of the source tree in --watch mode
+DEFAULT_WATCH_INTERVAL = 0.5
+
+# Files handed to a worker process per task, to amortize IPC overhead
+CHUNK_SIZE = 64
 
-# Note: pyarrow is a dev dependency, not in the corpus source
-import pyarrow as pa
-import pyarrow.parquet as pq
+CORPUS_COLUMNS = ("module", "category", "content", "function_count", "line_count")
+FUNCTION_COLUMNS = (
+    "module",
+    "category",
+    "name",
+    "qualname",
+    "is_async",
+    "signature",
+    "docstring",
+    "line_number",
+    "source",
+)
 
+CORPUS_SCHEMA = FUNCTION_SCHEMA = None
+if pa is not None:
+    CORPUS_SCHEMA = pa.schema(
+        [
+            ("module", pa.string()),
+            ("category", pa.string()),
+            ("content", pa.string()),
+            ("function_count", pa.int64()),
+            ("line_count", pa.int64()),
+        ]
+    )
 
-def extract_functions(source: str) -> list[dict[str, str | int]]:
-    """Extract function metadata from Python source.
+    # One row per function. Low-cardinality columns are Arrow dictionaries
+    # (and Parquet dictionary pages); free-text columns are stored plain.
+    _DICT_STRING = pa.dictionary(pa.int32(), pa.string())
+    FUNCTION_SCHEMA = pa.schema(
+        [
+            ("module", _DICT_STRING),
+            ("category", _DICT_STRING),
+            ("name", pa.string()),
+            ("qualname", pa.string()),
+            ("is_async", pa.bool_()),
+            ("signature", pa.string()),
+            ("docstring", pa.string()),
+            ("line_number", pa.int64()),
+            ("source", pa.string()),
+        ]
+    )
+_FUNCTION_DICT_COLUMNS = ["module", "category", "name"]
+
+
+def _category(rel_path: Path) -> str:
+    """Return the corpus category of a module path relative to the package."""
+    return rel_path.parts[0] if len(rel_path.parts) > 1 else "root"
+
+
+def export_key(module: str) -> tuple[str, Path]:
+    """Sort key giving the export order of a module.
+
+    Modules are grouped by category and sorted by path within it, so every
+    category forms one contiguous run of rows.
 
     Args:
-        source: Python source code.
+        module: Module path relative to the source package.
 
     Returns:
-        List of function metadata dicts.
+        ``(category, path)`` tuple.
     """
-    tree = ast.parse(source)
-    functions: list[dict[str, str | int]] = []
+    path = Path(module)
+    return _category(path), path
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            sig = ast.get_source_segment(source, node) or ""
-            first_line = sig.split("\n")[0] if sig else ""
-            functions.append(
-                {
-                    "name": node.name,
-                    "signature": first_line,
-                    "docstring": ast.get_docstring(node) or "",
-                    "line_number": node.lineno,
-                }
-            )
-    return functions
+
+def discover_sources(src_dir: Path) -> list[Path]:
+    """List corpus modules in deterministic export order.
+
+    Args:
+        src_dir: Path to source package.
+
+    Returns:
+        ``.py`` files in :func:`export_key` order, excluding ``__init__.py``.
+    """
+    files = [p for p in src_dir.rglob("*.py") if p.name != "__init__.py"]
+    return sorted(files, key=lambda p: export_key(str(p.relative_to(src_dir))))
+
+
+def build_record(src_dir: Path, py_file: Path, cache: ParseCache | None = None) -> dict:
+    """Build the corpus record for a single module.
+
+    Args:
+        src_dir: Path to source package.
+        py_file: Module file inside ``src_dir``.
+        cache: Shared parse cache; ``None`` always parses.
+
+    Returns:
+        Module record.
+    """
+    rel_path = py_file.relative_to(src_dir)
+    content = py_file.read_text()
+    analysis = cache.analyze(content) if cache else analyze_source(content)
+
+    return {
+        "module": str(rel_path),
+        "category": _category(rel_path),
+        "content": content,
+        "function_count": len(analysis["functions"]),
+        "line_count": analysis["line_count"],
+        # Not a corpus column; carried along for the functions table
+        "functions": analysis["functions"],
+    }
+
+
+def function_rows(record: dict, cache: ParseCache | None = None) -> list[dict]:
+    """Expand a module record into one row per function.
+
+    Records without function metadata have their content analyzed again,
+    which is a cache hit when a cache is given. Incremental exports attach
+    the rows of the previous functions table instead, so unchanged modules
+    are never re-parsed.
+
+    Args:
+        record: Module record.
+        cache: Shared parse cache; ``None`` always parses.
+
+    Returns:
+        Rows matching :data:`FUNCTION_SCHEMA`.
+    """
+    functions = record.get("functions")
+    if functions is None:
+        content = record["content"]
+        analysis = cache.analyze(content) if cache else analyze_source(content)
+        functions = analysis["functions"]
+    return [
+        {
+            "module": record["module"],
+            "category": record["category"],
+            "name": func["name"],
+            "qualname": func["qualname"],
+            "is_async": func["is_async"],
+            "signature": func["signature"],
+            "docstring": func["docstring"],
+            "line_number": func["line_number"],
+            "source": func["source"],
+        }
+        for func in functions
+    ]
+
+
+def _build_chunk(
+    src_dir: Path, cache: ParseCache | None, files: Sequence[Path]
+) -> list[dict]:
+    """Build records for a chunk of files (process pool entry point)."""
+    return [build_record(src_dir, f, cache) for f in files]
+
+
+def _chunked(items: Sequence[Path], size: int) -> Iterator[Sequence[Path]]:
+    """Yield consecutive slices of ``items`` of at most ``size`` elements."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _ordered_map(
+    fn: Callable[[Sequence[Path]], list[dict]],
+    chunks: Iterable[Sequence[Path]],
+    jobs: int,
+) -> Iterator[list[dict]]:
+    """Map ``fn`` over ``chunks`` in a process pool, yielding in input order.
+
+    At most ``2 * jobs`` chunks are in flight at once, so finished results
+    never pile up faster than the consumer drains them.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: collections.deque = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(fn, chunk))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_records(
+    src_dir: Path,
+    jobs: int = 1,
+    files: Sequence[Path] | None = None,
+    cache: ParseCache | None = None,
+) -> Iterator[dict]:
+    """Yield module records in the order of ``files``.
+
+    By default that is the :func:`export_key` order of
+    :func:`discover_sources`: by category, then by path within it.
+
+    Args:
+        src_dir: Path to source package.
+        jobs: Worker processes; ``1`` parses in-process, ``0`` uses all cores.
+        files: Modules to export; defaults to :func:`discover_sources`.
+        cache: Shared parse cache; ``None`` always parses.
+
+    Yields:
+        Module records, in the same order regardless of ``jobs``.
+    """
+    if files is None:
+        files = discover_sources(src_dir)
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs == 1 or len(files) <= CHUNK_SIZE:
+        for py_file in files:
+            yield build_record(src_dir, py_file, cache)
+        return
+
+    worker = functools.partial(_build_chunk, src_dir, cache)
+    for records in _ordered_map(worker, _chunked(files, CHUNK_SIZE), jobs):
+        yield from records
 
 
-def build_corpus(src_dir: Path) -> list[dict]:
+def build_corpus(
+    src_dir: Path, jobs: int = 1, cache: ParseCache | None = None
+) -> list[dict]:
     """Build corpus from source directory.
 
     Args:
         src_dir: Path to source package.
+        jobs: Worker processes; ``1`` parses in-process, ``0`` uses all cores.
+        cache: Shared parse cache; ``None`` always parses.
 
     Returns:
         List of module records.
     """
-    records: list[dict] = []
+    return list(iter_records(src_dir, jobs, cache=cache))
+
+
+class _TableFile:
+    """One output table written row batch by row batch in an export format.
+
+    Rows go to a temporary sibling of ``path``, which :meth:`close` either
+    moves into place or deletes, so readers never see a partial file.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fmt: str,
+        columns: Sequence[str],
+        schema: pa.Schema | None = None,
+        **parquet_options: object,
+    ) -> None:
+        self.path = path
+        self.fmt = fmt
+        self.columns = columns
+        self.schema = schema
+        self._tmp_path = path.with_name(path.name + ".tmp")
+        if fmt == "jsonl":
+            # No file name or timestamp in the gzip header: output depends
+            # only on the rows
+            raw = self._tmp_path.open("wb")
+            self._sink = gzip.GzipFile("", "wb", compresslevel=6, fileobj=raw, mtime=0)
+            self._raw = raw
+            self._text = io.TextIOWrapper(self._sink, encoding="utf-8", newline="\n")
+        elif fmt == "arrow":
+            # Uncompressed IPC file (Feather v2), readable via memory mapping.
+            # IPC files allow one dictionary per field for the whole file,
+            # but batches are built independently: store those as plain values.
+            self.schema = schema = pa.schema(
+                field.with_type(field.type.value_type)
+                if pa.types.is_dictionary(field.type)
+                else field
+                for field in schema
+            )
+            self._sink = pa.OSFile(str(self._tmp_path), "wb")
+            self._writer = pa.ipc.new_file(self._sink, schema)
+        else:
+            self._writer = pq.ParquetWriter(
+                self._tmp_path, schema, compression="zstd", **parquet_options
+            )
+
+    def write(self, rows: list[dict]) -> None:
+        """Append rows; for Parquet they form one row group."""
+        if self.fmt == "jsonl":
+            for row in rows:
+                line = {column: row[column] for column in self.columns}
+                self._text.write(json.dumps(line, ensure_ascii=False) + "\n")
+            return
+        batch = pa.RecordBatch.from_pylist(rows, self.schema)
+        if self.fmt == "arrow":
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write_batch(batch, row_group_size=len(rows))
+
+    def close(self, commit: bool = True) -> None:
+        """Finish the file and move it into place, or delete it."""
+        if self.fmt == "jsonl":
+            self._text.close()
+            self._raw.close()
+        else:
+            self._writer.close()
+            if self.fmt == "arrow":
+                self._sink.close()
+        if commit:
+            self._tmp_path.replace(self.path)
+        else:
+            self._tmp_path.unlink(missing_ok=True)
+
+
+def read_rows(path: Path, fmt: str = "parquet") -> Iterator[dict]:
+    """Stream the rows of a table written in any export format.
+
+    Args:
+        path: Table file.
+        fmt: Export format of the file (see :data:`FORMATS`).
+
+    Yields:
+        Rows as dicts, in file order.
+    """
+    if fmt == "jsonl":
+        with gzip.open(path, "rt", encoding="utf-8") as lines:
+            for line in lines:
+                yield json.loads(line)
+    elif fmt == "arrow":
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield from reader.get_batch(i).to_pylist()
+    else:
+        with pq.ParquetFile(path) as parquet_file:
+            for batch in parquet_file.iter_batches():
+                yield from batch.to_pylist()
+
+
+class FunctionTableWriter:
+    """Stream function rows into a table, one category per batch.
+
+    Rows must arrive grouped by category (see :func:`export_key`). A batch
+    is closed whenever the category changes or ``batch_size`` rows are
+    buffered. In Parquet every batch is a row group, so every row group
+    holds a single category and its column statistics let readers skip
+    whole row groups with predicate pushdown, e.g.
+    ``pq.read_table(path, filters=[("category", "==", "json")])``.
+
+    Like :func:`write_records`, the file is written beside ``path`` and moved
+    into place on a clean exit.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        cache: ParseCache | None = None,
+        fmt: str = "parquet",
+    ) -> None:
+        """Prepare a writer for ``path``.
+
+        Args:
+            path: Destination file.
+            batch_size: Maximum rows per batch (row group for Parquet).
+            cache: Shared parse cache, for records without function metadata.
+            fmt: Export format (see :data:`FORMATS`).
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.cache = cache
+        self.fmt = fmt
+        self.rows = 0
+        self._batch: list[dict] = []
+        self._category: str | None = None
+        self._table: _TableFile | None = None
+
+    def __enter__(self) -> FunctionTableWriter:
+        """Open the temporary output file."""
+        self._table = _TableFile(
+            self.path,
+            self.fmt,
+            FUNCTION_COLUMNS,
+            FUNCTION_SCHEMA,
+            use_dictionary=_FUNCTION_DICT_COLUMNS,
+            write_statistics=True,
+        )
+        return self
+
+    def add(self, record: dict) -> None:
+        """Append the functions of one module record.
+
+        Args:
+            record: Module record.
+        """
+        if record["category"] != self._category:
+            self._flush()
+            self._category = record["category"]
+        for row in function_rows(record, self.cache):
+            self._batch.append(row)
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._batch and self._table is not None:
+            self._table.write(self._batch)
+            self.rows += len(self._batch)
+            self._batch = []
+
+    def __exit__(self, exc_type: object, *_: object) -> None:
+        """Flush, close and move the file into place unless exiting on error."""
+        if exc_type is None:
+            self._flush()
+        if self._table is not None:
+            self._table.close(commit=exc_type is None)
+
 
-    for py_file in sorted(src_dir.rglob("*.py")):
-        if py_file.name == "__init__.py":
+def write_records(
+    records: Iterable[dict],
+    output_path: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    functions_path: Path | None = None,
+    cache: ParseCache | None = None,
+    fmt: str = "parquet",
+) -> tuple[int, set[str]]:
+    """Stream records into a corpus table in any export format.
+
+    Only ``batch_size`` records are held in memory at a time; each batch
+    becomes one Parquet row group or Arrow record batch. The file is written
+    beside ``output_path`` and moved into place once complete, so readers
+    never see a partial file and ``records`` may safely stream from the
+    previous ``output_path``.
+
+    Args:
+        records: Module records, in output order.
+        output_path: Destination file.
+        batch_size: Rows per record batch.
+        functions_path: Also write the per-function table here, in the same
+            pass and format (see :class:`FunctionTableWriter`).
+        cache: Shared parse cache, for records without function metadata.
+        fmt: Export format (see :data:`FORMATS`).
+
+    Returns:
+        Tuple of (rows written, distinct categories seen).
+    """
+    rows = 0
+    categories: set[str] = set()
+    batch: list[dict] = []
+    table = _TableFile(output_path, fmt, CORPUS_COLUMNS, CORPUS_SCHEMA)
+
+    try:
+        with contextlib.ExitStack() as stack:
+            functions = None
+            if functions_path is not None:
+                functions = stack.enter_context(
+                    FunctionTableWriter(functions_path, batch_size, cache, fmt)
+                )
+            for record in records:
+                batch.append(record)
+                categories.add(record["category"])
+                if functions is not None:
+                    functions.add(record)
+                if len(batch) >= batch_size:
+                    table.write(batch)
+                    rows += len(batch)
+                    batch = []
+            if batch:
+                table.write(batch)
+                rows += len(batch)
+    except BaseException:
+        table.close(commit=False)
+        raise
+
+    table.close()
+    return rows, categories
+
+
+def write_parquet(
+    records: Iterable[dict],
+    output_path: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    functions_path: Path | None = None,
+    cache: ParseCache | None = None,
+) -> tuple[int, set[str]]:
+    """Stream records into a zstd-compressed Parquet file.
+
+    Shorthand for :func:`write_records` with ``fmt="parquet"``.
+
+    Returns:
+        Tuple of (rows written, distinct categories seen).
+    """
+    return write_records(records, output_path, batch_size, functions_path, cache)
+
+
+def parse_size(text: str) -> int:
+    """Parse a byte size such as ``128MB``, ``64KiB`` or ``1000000``.
+
+    Suffixes are binary multiples: ``KB`` and ``KiB`` both mean 1024.
+
+    Args:
+        text: Size with an optional ``K``/``M``/``G`` suffix.
+
+    Returns:
+        Size in bytes.
+
+    Raises:
+        argparse.ArgumentTypeError: When ``text`` is not a positive size.
+    """
+    match = re.fullmatch(r"(\d+)\s*(?:([KMG])(?:I?B)?)?", text.strip().upper())
+    if match is None or int(match[1]) == 0:
+        msg = f"invalid size {text!r} (expected e.g. 128MB)"
+        raise argparse.ArgumentTypeError(msg)
+    return int(match[1]) * _SIZE_UNITS[match[2] or ""]
+
+
+def shard_dir_for(output_path: Path) -> Path:
+    """Return the directory holding the shards of a sharded export.
+
+    Args:
+        output_path: Destination ``.parquet`` file of an unsharded export.
+
+    Returns:
+        ``output_path`` without its suffix, e.g. ``data/corpus``.
+    """
+    return output_path.with_suffix("")
+
+
+class _ShardWriter:
+    """Write record batches into numbered shards of about ``shard_bytes``."""
+
+    def __init__(self, shard_dir: Path, shard_bytes: int) -> None:
+        self.shard_dir = shard_dir
+        self.shard_bytes = shard_bytes
+        self.metadata: list[pq.FileMetaData] = []
+        self._sink: pa.OSFile | None = None
+        self._writer: pq.ParquetWriter | None = None
+        self._name = ""
+
+    def write(self, batch: list[dict]) -> None:
+        """Append a batch, closing the shard once it reaches its target size."""
+        if self._writer is None:
+            self._name = SHARD_PATTERN.format(len(self.metadata))
+            self._sink = pa.OSFile(str(self.shard_dir / self._name), "wb")
+            self._writer = pq.ParquetWriter(
+                self._sink,
+                CORPUS_SCHEMA,
+                compression="zstd",
+                metadata_collector=self.metadata,
+            )
+        self._writer.write_batch(pa.RecordBatch.from_pylist(batch, CORPUS_SCHEMA))
+        if self._sink is not None and self._sink.tell() >= self.shard_bytes:
+            self.close()
+
+    def close(self) -> None:
+        """Finish the open shard, if any, and record its file path."""
+        if self._writer is None or self._sink is None:
+            return
+        self._writer.close()
+        self._sink.close()
+        # Row groups in _metadata point at their shard relative to the directory
+        self.metadata[-1].set_file_path(self._name)
+        self._writer = self._sink = None
+
+
+def write_shards(
+    records: Iterable[dict],
+    shard_dir: Path,
+    shard_bytes: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    functions_path: Path | None = None,
+    cache: ParseCache | None = None,
+) -> tuple[int, set[str], int]:
+    """Stream records into size-targeted Parquet shards.
+
+    Shard size is checked after every record batch, so a shard overshoots
+    ``shard_bytes`` by at most one compressed batch. Rows keep export order
+    across shards, so each shard covers one contiguous category range.
+
+    Beside the shards, ``_metadata`` holds the footers of all of them: a
+    data-less Parquet file, as written by Spark and Dask, listing every row
+    group with its shard path, row count and column statistics. Readers can
+    pick shards from it without opening them (see :func:`shard_summary`).
+
+    The shards are written to a sibling temporary directory, which replaces
+    ``shard_dir`` once complete.
+
+    Args:
+        records: Module records, in output order.
+        shard_dir: Destination directory.
+        shard_bytes: Target size of one shard file.
+        batch_size: Rows per record batch.
+        functions_path: Also write the per-function table here.
+        cache: Shared parse cache, for records without function metadata.
+
+    Returns:
+        Tuple of (rows written, distinct categories seen, shards written).
+    """
+    rows = 0
+    categories: set[str] = set()
+    batch: list[dict] = []
+    tmp_dir = shard_dir.with_name(shard_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    shards = _ShardWriter(tmp_dir, shard_bytes)
+
+    try:
+        with contextlib.ExitStack() as stack:
+            stack.callback(shards.close)
+            functions = None
+            if functions_path is not None:
+                functions = stack.enter_context(
+                    FunctionTableWriter(functions_path, batch_size, cache)
+                )
+            for record in records:
+                batch.append(record)
+                categories.add(record["category"])
+                if functions is not None:
+                    functions.add(record)
+                if len(batch) >= batch_size:
+                    shards.write(batch)
+                    rows += len(batch)
+                    batch = []
+            if batch:
+                shards.write(batch)
+                rows += len(batch)
+        pq.write_metadata(
+            CORPUS_SCHEMA, tmp_dir / SHARD_METADATA, metadata_collector=shards.metadata
+        )
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    old_dir = shard_dir.with_name(shard_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if shard_dir.exists():
+        shard_dir.rename(old_dir)
+    tmp_dir.rename(shard_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return rows, categories, len(shards.metadata)
+
+
+def shard_summary(shard_dir: Path) -> list[dict[str, str | int | None]]:
+    """Summarize a sharded export from its ``_metadata`` file alone.
+
+    Args:
+        shard_dir: Directory written by :func:`write_shards`.
+
+    Returns:
+        One dict per shard, in order, with ``path``, ``rows``,
+        ``min_category`` and ``max_category``.
+    """
+    metadata = pq.read_metadata(shard_dir / SHARD_METADATA)
+    category = metadata.schema.names.index("category")
+    summary: dict[str, dict[str, str | int | None]] = {}
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        column = row_group.column(category)
+        stats = column.statistics
+        low = stats.min if stats is not None and stats.has_min_max else None
+        high = stats.max if stats is not None and stats.has_min_max else None
+        entry = summary.setdefault(
+            column.file_path,
+            {"path": column.file_path, "rows": 0, "min_category": low},
+        )
+        entry["rows"] = int(entry["rows"] or 0) + row_group.num_rows
+        entry["max_category"] = high
+    return list(summary.values())
+
+
+def manifest_path_for(output_path: Path) -> Path:
+    """Return the sidecar manifest path for an output file.
+
+    The full file name is kept, so outputs that differ only in their
+    extension, such as ``corpus.parquet`` and ``corpus.arrow``, never share
+    a manifest.
+
+    Args:
+        output_path: Destination file.
+
+    Returns:
+        ``<name>.manifest.json`` next to ``output_path``.
+    """
+    return output_path.with_name(output_path.name + ".manifest.json")
+
+
+def export_options(
+    fmt: str = "parquet",
+    functions_path: Path | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, str | int | None]:
+    """Return the export options a manifest is only valid for.
+
+    Args:
+        fmt: Export format (see :data:`FORMATS`).
+        functions_path: Per-function table written alongside, if any.
+        batch_size: Rows per record batch.
+
+    Returns:
+        JSON-serializable mapping stored in the manifest.
+    """
+    functions = None if functions_path is None else str(functions_path.resolve())
+    return {"format": fmt, "functions": functions, "batch_size": batch_size}
+
+
+def load_manifest(
+    path: Path, options: dict[str, str | int | None] | None = None
+) -> dict[str, dict[str, int | str]] | None:
+    """Load a manifest written by :func:`save_manifest`.
+
+    Args:
+        path: Manifest file.
+        options: :func:`export_options` of the export about to run;
+            ``None`` means the defaults.
+
+    Returns:
+        Mapping of module path to its ``size``/``mtime_ns``/``sha256`` entry,
+        or ``None`` when the manifest is missing, unreadable, outdated or
+        was written with other options.
+    """
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+    if data.get("options") != (options or export_options()):
+        return None
+    return data["files"]
+
+
+def save_manifest(
+    path: Path,
+    files: dict[str, dict[str, int | str]],
+    options: dict[str, str | int | None] | None = None,
+) -> None:
+    """Atomically write a manifest.
+
+    Args:
+        path: Manifest file.
+        files: Mapping of module path to its fingerprint entry.
+        options: :func:`export_options` the outputs were written with;
+            ``None`` means the defaults.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    payload = {
+        "version": MANIFEST_VERSION,
+        "options": options or export_options(),
+        "files": files,
+    }
+    tmp_path.write_text(json.dumps(payload, indent=1, sort_keys=True) + "\n")
+    tmp_path.replace(path)
+
+
+def scan_changes(
+    src_dir: Path,
+    files: Sequence[Path],
+    previous: dict[str, dict[str, int | str]],
+) -> tuple[dict[str, dict[str, int | str]], list[Path]]:
+    """Fingerprint ``files`` and find the ones that differ from ``previous``.
+
+    A file whose size and ``mtime_ns`` match its previous entry is trusted
+    without being read. Otherwise it is hashed, so a touched-but-identical
+    file is not re-extracted.
+
+    Args:
+        src_dir: Path to source package.
+        files: Current corpus modules.
+        previous: Manifest entries from the last export.
+
+    Returns:
+        Tuple of (new manifest entries, modules whose content changed).
+    """
+    manifest: dict[str, dict[str, int | str]] = {}
+    changed: list[Path] = []
+
+    for py_file in files:
+        module = str(py_file.relative_to(src_dir))
+        st = py_file.stat()
+        old = previous.get(module)
+        if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+            manifest[module] = old
             continue
 
-        rel_path = py_file.relative_to(src_dir)
-        category = rel_path.parts[0] if len(rel_path.parts) > 1 else "root"
-        content = py_file.read_text()
-        functions = extract_functions(content)
-
-        records.append(
-            {
-                "module": str(rel_path),
-                "category": category,
-                "content": content,
-                "function_count": len(functions),
-                "line_count": len(content.splitlines()),
-            }
+        digest = hashlib.sha256(py_file.read_bytes()).hexdigest()
+        manifest[module] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": digest,
+        }
+        if not old or old["sha256"] != digest:
+            changed.append(py_file)
+
+    return manifest, changed
+
+
+def _attach_functions(
+    records: Iterable[dict], functions: Iterable[dict]
+) -> Iterator[dict]:
+    """Give each record the rows of a functions table written alongside it.
+
+    Both tables are in export order, so the function rows of each module
+    form one run that lines up with its record.
+    """
+    groups = itertools.groupby(functions, key=lambda row: row["module"])
+    module, rows = next(groups, (None, iter(())))
+    for record in records:
+        if record["module"] == module:
+            record["functions"] = list(rows)
+            module, rows = next(groups, (None, iter(())))
+        else:
+            record["functions"] = []
+        yield record
+
+
+def _merge_records(
+    existing: Path,
+    fmt: str,
+    drop: set[str],
+    fresh: Iterable[dict],
+    functions_path: Path | None = None,
+) -> Iterator[dict]:
+    """Merge fresh records into the rows of an existing export.
+
+    Both inputs are in export order, so a streaming merge keeps the result
+    in the order a full export would produce. Rows of modules in ``drop``
+    are skipped. With ``functions_path``, kept rows carry their function
+    rows from that table.
+    """
+    rows = read_rows(existing, fmt)
+    if functions_path is not None:
+        rows = _attach_functions(rows, read_rows(functions_path, fmt))
+    kept = (row for row in rows if row["module"] not in drop)
+    yield from heapq.merge(kept, fresh, key=lambda r: export_key(r["module"]))
+
+
+def export_incremental(
+    src_dir: Path,
+    output_path: Path,
+    jobs: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    cache: ParseCache | None = None,
+    functions_path: Path | None = None,
+    files: Sequence[Path] | None = None,
+    fmt: str = "parquet",
+) -> tuple[int, int, int] | None:
+    """Re-export only the modules that changed since the last export.
+
+    Rows for unchanged modules are copied from the existing output,
+    rows for deleted modules are dropped and changed modules are
+    re-extracted. Without a usable manifest, or when it was written with
+    another format, functions table or batch size, this is a full export.
+
+    Args:
+        src_dir: Path to source package.
+        output_path: Destination file.
+        jobs: Worker processes; ``1`` parses in-process, ``0`` uses all cores.
+        batch_size: Rows per record batch.
+        cache: Shared parse cache; ``None`` always parses.
+        functions_path: Also rewrite the per-function table here.
+        files: Current corpus modules in export order; defaults to
+            :func:`discover_sources`.
+        fmt: Export format of both tables (see :data:`FORMATS`).
+
+    Returns:
+        Tuple of (rows written, modules re-extracted, modules deleted), or
+        ``None`` when the output was already up to date.
+    """
+    manifest_path = manifest_path_for(output_path)
+    options = export_options(fmt, functions_path, batch_size)
+    outputs = [output_path] if functions_path is None else [output_path, functions_path]
+    previous = None
+    if all(path.exists() for path in outputs):
+        previous = load_manifest(manifest_path, options)
+    if files is None:
+        files = discover_sources(src_dir)
+    manifest, changed = scan_changes(src_dir, files, previous or {})
+    deleted = set(previous or {}) - set(manifest)
+
+    if previous is not None and not changed and not deleted:
+        if manifest != previous:
+            save_manifest(manifest_path, manifest, options)
+        return None
+
+    if previous is None:
+        records = iter_records(src_dir, jobs, files, cache)
+    else:
+        drop = deleted | {str(f.relative_to(src_dir)) for f in changed}
+        fresh = iter_records(src_dir, jobs, changed, cache)
+        records = _merge_records(output_path, fmt, drop, fresh, functions_path)
+
+    rows, _ = write_records(
+        records, output_path, batch_size, functions_path, cache, fmt
+    )
+    save_manifest(manifest_path, manifest, options)
+    return rows, len(changed), len(deleted)
+
+
+def snapshot_tree(src_dir: Path) -> dict[Path, tuple[int, int]]:
+    """Stat every corpus module without reading any file.
+
+    Walks the tree with ``os.scandir``, whose entries already know their
+    file type, so only candidate ``.py`` files cost a ``stat`` call.
+
+    Args:
+        src_dir: Path to source package.
+
+    Returns:
+        Mapping of module path to ``(size, mtime_ns)``.
+    """
+    snapshot: dict[Path, tuple[int, int]] = {}
+    pending = [src_dir]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    pending.append(Path(entry.path))
+                elif entry.name.endswith(".py") and entry.name != "__init__.py":
+                    with contextlib.suppress(FileNotFoundError):
+                        st = entry.stat()
+                        snapshot[Path(entry.path)] = (st.st_size, st.st_mtime_ns)
+    return snapshot
+
+
+def watch_changes(
+    src_dir: Path,
+    interval: float = DEFAULT_WATCH_INTERVAL,
+    sleep: Callable[[float], object] = time.sleep,
+) -> Iterator[list[Path]]:
+    """Poll the source tree and yield its modules whenever it changes.
+
+    Each poll compares a :func:`snapshot_tree` with the previous one, so an
+    idle tree costs one directory walk per ``interval`` and no reads.
+
+    Args:
+        src_dir: Path to source package.
+        interval: Seconds to sleep between polls of an unchanged tree.
+        sleep: Sleep function, replaceable for tests.
+
+    Yields:
+        Current modules in export order: once at start, then after every
+        change.
+    """
+    previous = None
+    while True:
+        snapshot = snapshot_tree(src_dir)
+        if snapshot != previous:
+            previous = snapshot
+            yield sorted(
+                snapshot, key=lambda p: export_key(str(p.relative_to(src_dir)))
+            )
+        else:
+            sleep(interval)
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Arguments, excluding the program name.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Export stdlib corpus to Apache Parquet format."
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=DEFAULT_FORMAT,
+        help=f"output format (default: {DEFAULT_FORMAT})",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="corpus table (default: data/corpus with the format's suffix)",
+    )
+    parser.add_argument(
+        "--functions-output",
+        type=Path,
+        help=f"per-function table (default: {FUNCTIONS_STEM} beside --output)",
+    )
+    parser.add_argument(
+        "--no-functions",
+        action="store_true",
+        help="skip the per-function table",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes (0 = all cores, 1 = serial)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="rows per record batch",
+    )
+    parser.add_argument(
+        "--shard-bytes",
+        type=parse_size,
+        metavar="SIZE",
+        help="split the corpus into shards of about SIZE (e.g. 128MB) in a "
+        "directory named after --output, with a _metadata summary",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="re-extract only modules changed since the last export",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and re-export incrementally after every change",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        help="seconds between polls in --watch mode",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="parse cache shared with the Gate 0 scanner",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="parse every file from scratch"
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be >= 1")
+    if args.interval <= 0:
+        parser.error("--interval must be > 0")
+    if args.shard_bytes and (args.incremental or args.watch):
+        parser.error("--shard-bytes cannot be combined with --incremental or --watch")
+    if args.shard_bytes and args.format != "parquet":
+        parser.error("--shard-bytes requires --format parquet")
+    if pa is None and args.format != "jsonl":
+        parser.error(f"--format {args.format} requires pyarrow; use --format jsonl")
+    suffix = FORMATS[args.format]
+    if args.output is None:
+        args.output = DEFAULT_OUTPUT.with_name("corpus" + suffix)
+    if args.no_functions:
+        args.functions_output = None
+    elif args.functions_output is None:
+        args.functions_output = args.output.with_name(FUNCTIONS_STEM + suffix)
+    return args
+
+
+def _export(args: argparse.Namespace, cache: ParseCache | None) -> None:
+    """Run the export selected by ``args`` and print a summary."""
+    output_path: Path = args.output
+    functions_path: Path | None = args.functions_output
+
+    if args.incremental:
+        result = export_incremental(
+            SRC_DIR,
+            output_path,
+            args.jobs,
+            args.batch_size,
+            cache,
+            functions_path,
+            fmt=args.format,
         )
+        if result is None:
+            print(f"Up to date: {output_path}")
+            return
+        count, changed, deleted = result
+        print(f"Exported {count} modules to {output_path}")
+        print(f"Re-extracted: {changed}, deleted: {deleted}")
+        return
 
-    return records
+    records = iter_records(SRC_DIR, args.jobs, cache=cache)
+    if args.shard_bytes:
+        shard_dir = shard_dir_for(output_path)
+        count, categories, shards = write_shards(
+            records, shard_dir, args.shard_bytes, args.batch_size, functions_path, cache
+        )
+        print(f"Exported {count} modules to {shard_dir} in {shards} shards")
+    else:
+        count, categories = write_records(
+            records, output_path, args.batch_size, functions_path, cache, args.format
+        )
+        print(f"Exported {count} modules to {output_path}")
+    # A full export invalidates any manifest from earlier incremental runs
+    manifest_path_for(output_path).unlink(missing_ok=True)
+
+    print(f"Categories: {len(categories)}")
+    if functions_path is not None:
+        print(f"Functions: {functions_path}")
 
 
-def main() -> int:
+def _watch(args: argparse.Namespace, cache: ParseCache | None) -> None:
+    """Re-export incrementally on every change until interrupted."""
+    output_path: Path = args.output
+    print(f"Watching {SRC_DIR} (Ctrl-C to stop)")
+    for files in watch_changes(SRC_DIR, args.interval):
+        start = time.perf_counter()
+        try:
+            result = export_incremental(
+                SRC_DIR,
+                output_path,
+                args.jobs,
+                args.batch_size,
+                cache,
+                args.functions_output,
+                files,
+                args.format,
+            )
+        except (SyntaxError, UnicodeDecodeError, OSError) as exc:
+            # Keep the last good output and wait for the next save
+            print(f"Export failed, keeping {output_path}: {exc}", file=sys.stderr)
+            continue
+        if result is not None:
+            _, changed, deleted = result
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"Re-extracted: {changed}, deleted: {deleted} in {elapsed_ms:.1f} ms")
+        if cache is not None:
+            cache.prune()
+
+
+def main(argv: Sequence[str] = ()) -> int:
     """Export corpus to Parquet."""
-    src_dir = Path(__file__).parent.parent / "src" / "reprorusted_std_only"
-    output_dir = Path(__file__).parent.parent / "data"
-    output_dir.mkdir(exist_ok=True)
-    output_path = output_dir / "corpus.parquet"
+    args = parse_args(argv)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
 
-    records = build_corpus(src_dir)
-    if not records:
+    if not discover_sources(SRC_DIR):
         print("No source files found", file=sys.stderr)
         return 1
 
-    table = pa.Table.from_pylist(records)
-    pq.write_table(table, output_path, compression="zstd")
-
-    print(f"Exported {len(records)} modules to {output_path}")
-    print(f"Categories: {len({r['category'] for r in records})}")
+    cache = None if args.no_cache else ParseCache(args.cache_dir)
+    if args.watch:
+        with contextlib.suppress(KeyboardInterrupt):
+            _watch(args, cache)
+        return 0
+    _export(args, cache)
+    if cache is not None:
+        cache.prune()
     return 0
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,283 @@
+"""Content-addressed cache of per-file parse results.
+
+Gate 0 (``validate_stdlib_only.py``) and the corpus exporter both need facts
+that come from parsing the same modules. :func:`analyze_source` collects all
+of them from a single ``ast.parse``; :class:`ParseCache` stores the result on
+disk keyed by the SHA-256 of the file content, so each tool pays for at most
+one parse per changed file. Entries are evicted least-recently-used first
+once the cache grows past its size budget.
+
+Usage:
+    cache = ParseCache(DEFAULT_CACHE_DIR)
+    result = cache.analyze(path.read_text())
+    cache.prune()
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".corpus_cache" / "parse"
+
+# Size budget for all entries together
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bumped whenever the shape of an analysis result changes
+CACHE_VERSION = 3
+
+
+def extract_imports(tree: ast.AST) -> list[list[str | int]]:
+    """List the modules imported anywhere in a parsed module.
+
+    Args:
+        tree: Parsed module.
+
+    Returns:
+        ``[module, line_number]`` pairs, one per ``import`` alias and one per
+        ``from ... import`` with a module name.
+    """
+    imports: list[list[str | int]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend([alias.name, node.lineno] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            imports.append([node.module, node.lineno])
+    return imports
+
+
+# Line terminators as the tokenizer sees them
+_NEWLINE = re.compile(r"\r\n|\r|\n")
+
+
+class LineIndex:
+    """Character offset of every line start, built once per source.
+
+    Lines are split exactly as the parser counts them (LF, CRLF or a lone
+    CR), so AST line numbers index straight into the table
+    and a node's source segment is a single slice of the original string.
+    """
+
+    def __init__(self, source: str) -> None:
+        """Index the line starts of ``source``.
+
+        Args:
+            source: Python source code.
+        """
+        self.source = source
+        self.starts = [0]
+        self.starts.extend(m.end() for m in _NEWLINE.finditer(source))
+
+    def offset(self, lineno: int, col_offset: int) -> int:
+        """Convert an AST position to a character offset into the source.
+
+        AST column offsets count UTF-8 bytes; only lines containing
+        non-ASCII text need re-encoding to turn them into characters.
+        """
+        start = self.starts[lineno - 1]
+        line = self.source[start : start + col_offset]
+        if line.isascii():
+            return start + col_offset
+        return start + len(line.encode()[:col_offset].decode(errors="ignore"))
+
+    def segment(self, node: ast.AST) -> str:
+        """Return the source text of ``node``, like ``ast.get_source_segment``."""
+        end_lineno = getattr(node, "end_lineno", None)
+        end_col_offset = getattr(node, "end_col_offset", None)
+        if end_lineno is None or end_col_offset is None:
+            return ""
+        start = self.offset(node.lineno, node.col_offset)  # type: ignore[attr-defined]
+        return self.source[start : self.offset(end_lineno, end_col_offset)]
+
+
+# Node types whose subtrees can contain a function definition
+_BODY = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def extract_functions(
+    source: str, tree: ast.AST | None = None
+) -> list[dict[str, str | int | bool]]:
+    """Extract function metadata from Python source.
+
+    Covers ``def`` and ``async def`` at any depth, in source order. Each
+    function gets a ``qualname`` following Python's ``__qualname__`` rules,
+    e.g. ``Point.distance`` or ``outer.<locals>.inner``. Segments are sliced
+    from a :class:`LineIndex` built once, so the cost is linear in the size
+    of the module rather than in functions times lines.
+
+    Args:
+        source: Python source code.
+        tree: ``source`` already parsed, to avoid parsing it twice.
+
+    Returns:
+        List of function metadata dicts.
+    """
+    if tree is None:
+        tree = ast.parse(source)
+    index = LineIndex(source)
+    functions: list[dict[str, str | int | bool]] = []
+
+    # Pre-order walk in source order, carrying each node's qualname prefix
+    stack: list[tuple[ast.AST, str]] = [(tree, "")]
+    while stack:
+        node, prefix = stack.pop()
+        child_prefix = prefix
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            qualname = prefix + node.name
+            child_prefix = qualname + ".<locals>."
+            segment = index.segment(node)
+            functions.append(
+                {
+                    "name": node.name,
+                    "qualname": qualname,
+                    "is_async": isinstance(node, ast.AsyncFunctionDef),
+                    "signature": _NEWLINE.split(segment, maxsplit=1)[0],
+                    "docstring": ast.get_docstring(node) or "",
+                    "line_number": node.lineno,
+                    "source": segment,
+                }
+            )
+        elif isinstance(node, ast.ClassDef):
+            child_prefix = f"{prefix}{node.name}."
+        # Definitions only live in statement bodies; skip expression subtrees
+        children = [c for c in ast.iter_child_nodes(node) if isinstance(c, _BODY)]
+        stack.extend((child, child_prefix) for child in reversed(children))
+    return functions
+
+
+def analyze_source(source: str) -> dict:
+    """Collect everything the corpus tools need from one parse.
+
+    Args:
+        source: Python source code.
+
+    Returns:
+        Dict with ``imports`` (see :func:`extract_imports`), ``functions``
+        (see :func:`extract_functions`) and ``line_count``.
+
+    Raises:
+        SyntaxError: When ``source`` is not valid Python.
+    """
+    tree = ast.parse(source)
+    return {
+        "imports": extract_imports(tree),
+        "functions": extract_functions(source, tree),
+        "line_count": len(source.splitlines()),
+    }
+
+
+class ParseCache:
+    """On-disk cache of :func:`analyze_source` results.
+
+    Each entry is a JSON file named after the content hash, sharded into
+    subdirectories by the first two hex digits. Writes go through a
+    temporary file and ``os.replace``, so concurrent processes can share a
+    cache directory.
+
+    Attributes:
+        cache_dir: Directory holding the entries.
+        max_bytes: Size budget enforced by :meth:`prune`.
+        hits: Lookups answered from disk.
+        misses: Lookups that required a parse.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Create a cache rooted at ``cache_dir``.
+
+        Args:
+            cache_dir: Directory holding the entries; created on first write.
+            max_bytes: Size budget enforced by :meth:`prune`.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source: str) -> str:
+        """Return the cache key for ``source``.
+
+        The key covers the cache format and the Python version, since the
+        AST (and therefore the result) can differ between interpreters.
+        """
+        digest = hashlib.sha256(
+            f"{CACHE_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:".encode()
+        )
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, source: str) -> dict | None:
+        """Return the cached analysis of ``source`` without parsing.
+
+        Args:
+            source: Python source code.
+
+        Returns:
+            The cached :func:`analyze_source` result, or ``None`` on a miss.
+        """
+        path = self._entry_path(self.key(source))
+        try:
+            result = json.loads(path.read_text())
+            # Refresh the mtime so pruning evicts least-recently-used entries
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        self.hits += 1
+        return result
+
+    def analyze(self, source: str) -> dict:
+        """Return the analysis of ``source``, parsing only on a cache miss.
+
+        Args:
+            source: Python source code.
+
+        Returns:
+            The :func:`analyze_source` result.
+
+        Raises:
+            SyntaxError: When ``source`` is not valid Python.
+        """
+        result = self.get(source)
+        if result is not None:
+            return result
+
+        self.misses += 1
+        result = analyze_source(source)
+        path = self._entry_path(self.key(source))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(result, separators=(",", ":")))
+        tmp_path.replace(path)
+        return result
+
+    def prune(self) -> int:
+        """Evict least-recently-used entries until under ``max_bytes``.
+
+        Returns:
+            Number of entries removed.
+        """
+        if not self.cache_dir.is_dir():
+            return 0
+        entries: list[tuple[int, int, Path]] = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
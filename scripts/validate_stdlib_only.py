@@ -4,18 +4,39 @@
 Gate 0 in the Jidoka CI pipeline. Scans every .py file under src/
 and rejects any import not in the CPython 3.11 stdlib.
 
+Each file costs at most one ``ast`` parse, which both rejects files that
+do not parse and yields every import, nested or not. The result is shared
+with the corpus exporter through the on-disk parse cache, so unchanged
+files are not parsed again on later runs. With ``--jobs`` files are
+checked across a process pool.
+
 Usage:
     python scripts/validate_stdlib_only.py
+    python scripts/validate_stdlib_only.py --jobs 0 --no-cache
 """
 
 from __future__ import annotations
 
+import argparse
 import ast
+import functools
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from parse_cache import DEFAULT_CACHE_DIR, ParseCache, extract_imports
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
 
 STDLIB_MODULES: frozenset[str] = frozenset(sys.stdlib_module_names)
 
+# Files handed to a worker process per task, to amortize IPC overhead
+CHUNK_SIZE = 64
+
 # Also allow the package itself
 ALLOWED_FIRST_PARTY: frozenset[str] = frozenset({"reprorusted_std_only"})
 
@@ -26,57 +47,141 @@ def _is_allowed_module(module_name: str) -> bool:
     return top in STDLIB_MODULES or top in ALLOWED_FIRST_PARTY
 
 
-def _check_import_node(node: ast.Import, path: Path) -> list[str]:
-    """Check an Import node for violations."""
-    violations: list[str] = []
-    for alias in node.names:
-        if not _is_allowed_module(alias.name):
-            violations.append(f"{path}:{node.lineno} imports '{alias.name}'")
-    return violations
+def _collect_imports(
+    source: str, cache: ParseCache | None, filename: str = "<unknown>"
+) -> tuple[list, bool]:
+    """Return ``(imports, fully_parsed)`` from at most one ``ast`` parse.
+
+    A cache hit costs no parse at all. A miss is parsed once, which both
+    rejects files that do not parse and yields their imports; with a
+    cache the analysis is stored for the exporter and the next run.
+
+    Raises:
+        SyntaxError: When ``source`` does not parse.
+    """
+    cached = cache.get(source) if cache is not None else None
+    if cached is not None:
+        return cached["imports"], False
+    if cache is not None:
+        return cache.analyze(source)["imports"], True
+    return extract_imports(ast.parse(source, filename)), True
 
 
-def _check_import_from_node(node: ast.ImportFrom, path: Path) -> list[str]:
-    """Check an ImportFrom node for violations."""
-    if node.module and not _is_allowed_module(node.module):
-        return [f"{path}:{node.lineno} imports '{node.module}'"]
-    return []
+def _violations(path: Path, imports: list) -> list[str]:
+    """Format the disallowed entries of ``imports`` as violation strings."""
+    return [
+        f"{path}:{lineno} imports '{module}'"
+        for module, lineno in imports
+        if not _is_allowed_module(module)
+    ]
 
 
-def check_file(path: Path) -> list[str]:
+def check_file(path: Path, cache: ParseCache | None = None) -> list[str]:
     """Return list of non-stdlib top-level imports.
 
     Args:
         path: Path to Python file to check.
+        cache: Parse cache shared with the exporter; ``None`` disables it.
 
     Returns:
         List of violation descriptions.
+
+    Raises:
+        SyntaxError: When the file does not parse.
+    """
+    imports, _ = _collect_imports(path.read_text(), cache, str(path))
+    return _violations(path, imports)
+
+
+def _scan_chunk(
+    cache: ParseCache | None, paths: Sequence[Path]
+) -> tuple[list[str], int]:
+    """Check a chunk of files (process pool entry point).
+
+    Returns:
+        Tuple of (violations, files that needed a full ``ast`` parse).
     """
-    tree = ast.parse(path.read_text())
     violations: list[str] = []
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            violations.extend(_check_import_node(node, path))
-        elif isinstance(node, ast.ImportFrom):
-            violations.extend(_check_import_from_node(node, path))
-    return violations
+    full_parses = 0
+    for path in paths:
+        imports, fully_parsed = _collect_imports(path.read_text(), cache, str(path))
+        violations.extend(_violations(path, imports))
+        full_parses += fully_parsed
+    return violations, full_parses
+
 
+def scan_files(
+    paths: Sequence[Path], jobs: int = 1, cache: ParseCache | None = None
+) -> tuple[list[str], int]:
+    """Check many files, fanning out over a process pool.
 
-def main() -> int:
+    Args:
+        paths: Files to check.
+        jobs: Worker processes; ``1`` scans in-process, ``0`` uses all cores.
+        cache: Parse cache shared with the exporter; ``None`` disables it.
+
+    Returns:
+        Tuple of (violations in ``paths`` order, files fully parsed).
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    chunks = [paths[i : i + CHUNK_SIZE] for i in range(0, len(paths), CHUNK_SIZE)]
+    worker = functools.partial(_scan_chunk, cache)
+    if jobs == 1 or len(chunks) <= 1:
+        return _combine(map(worker, chunks))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return _combine(executor.map(worker, chunks))
+
+
+def _combine(results: Iterable[tuple[list[str], int]]) -> tuple[list[str], int]:
+    """Concatenate per-chunk scan results in order."""
+    violations: list[str] = []
+    full_parses = 0
+    for chunk_violations, chunk_full_parses in results:
+        violations.extend(chunk_violations)
+        full_parses += chunk_full_parses
+    return violations, full_parses
+
+
+def main(argv: Sequence[str] = ()) -> int:
     """Scan all source files for non-stdlib imports."""
+    parser = argparse.ArgumentParser(description="Gate 0: stdlib-only imports.")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="parse cache shared with the corpus exporter",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="parse every file from scratch"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes (0 = all cores, 1 = serial)",
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+
     src_dir = Path(__file__).parent.parent / "src" / "reprorusted_std_only"
     if not src_dir.exists():
         print(f"Error: {src_dir} not found", file=sys.stderr)
         return 1
 
-    all_violations: list[str] = []
-    files_checked = 0
+    cache = None if args.no_cache else ParseCache(args.cache_dir)
+    start = time.perf_counter()
+    files = sorted(src_dir.rglob("*.py"))
+    all_violations, full_parses = scan_files(files, args.jobs, cache)
+    elapsed = time.perf_counter() - start
 
-    for py_file in sorted(src_dir.rglob("*.py")):
-        files_checked += 1
-        violations = check_file(py_file)
-        all_violations.extend(violations)
+    if cache is not None:
+        cache.prune()
 
-    print(f"Checked {files_checked} files")
+    rate = len(files) / elapsed if elapsed > 0 else float("inf")
+    print(f"Checked {len(files)} files in {elapsed:.3f}s ({rate:,.0f} files/sec)")
+    print(f"Full AST parses: {full_parses} ({len(files) - full_parses} from cache)")
 
     if all_violations:
         print(f"\nFAILED: {len(all_violations)} third-party import(s) found:\n")
@@ -89,4 +194,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(main(sys.argv[1:]))
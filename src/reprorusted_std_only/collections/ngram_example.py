@@ -0,0 +1,265 @@
+r"""Streaming n-gram counts keyed by vocabulary ids.
+
+Demonstrates counting phrases over a token stream far larger than memory.
+Tokens are read a chunk at a time and mapped to ids by a ``Vocabulary``;
+each n-gram is a tuple of ids that shares the vocabulary's id objects,
+so no joined string is ever built. A ``collections.deque`` of the last
+``n - 1`` ids carries the window across chunk boundaries, so every
+n-gram of the stream is counted exactly once. When a minimum count or a
+budget is set, rare n-grams are pruned between chunks and the most a
+count can fall short is tracked.
+
+Rust equivalent:
+    use std::collections::{HashMap, VecDeque};
+
+    type Counts = HashMap<Vec<u32>, u64>;
+
+    fn count_ngrams(ids: impl Iterator<Item = u32>, n: usize) -> Counts {
+        let mut window = VecDeque::with_capacity(n);
+        let mut counts = HashMap::new();
+        for id in ids {
+            if window.len() == n {
+                window.pop_front();
+            }
+            window.push_back(id);
+            if window.len() == n {
+                *counts.entry(window.iter().copied().collect()).or_insert(0) += 1;
+            }
+        }
+        counts
+    }
+
+Examples:
+    >>> from reprorusted_std_only.collections.ngram_example import NgramCounter
+    >>> bigrams = NgramCounter(2)
+    >>> bigrams.update("to be or not to be".split())
+    >>> bigrams.count_of(("to", "be")), bigrams.most_common(1)
+    (2, [((0, 1), 2)])
+    >>> bigrams.words((0, 1))
+    ('to', 'be')
+"""
+
+from __future__ import annotations
+
+import collections
+import itertools
+from typing import TYPE_CHECKING
+
+from reprorusted_std_only.collections.vocabulary_example import Vocabulary
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class NgramCounter:
+    """Counts of the ``n``-token sequences of a stream.
+
+    With the defaults every count is exact. After each chunk, n-grams
+    seen fewer than ``min_count`` times are dropped, and when more than
+    ``max_ngrams`` distinct n-grams remain, so are as many of the rarest
+    as it takes to get down to half the budget. A dropped n-gram that
+    shows up again starts over, so counts never exceed the true count and
+    fall short of it by at most ``error``.
+
+    Attributes:
+        n: Tokens per n-gram.
+        min_count: Count below which n-grams are dropped after each chunk.
+        max_ngrams: Distinct n-grams held before pruning; ``None`` never
+            prunes.
+        vocabulary: Every token seen, with its exact count.
+        error: Most that any n-gram count may fall short of the true
+            count.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        min_count: int = 1,
+        max_ngrams: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """Create an empty counter.
+
+        Args:
+            n: Tokens per n-gram; at least 1.
+            min_count: Count below which n-grams are dropped after each
+                chunk; at least 1, and 1 keeps them all.
+            max_ngrams: Distinct n-grams held before pruning; ``None``
+                keeps them all.
+            chunk_size: Tokens read per chunk.
+
+        Raises:
+            ValueError: When ``n``, ``min_count``, ``max_ngrams`` or
+                ``chunk_size`` is not positive.
+        """
+        if n < 1:
+            msg = "n must be positive"
+            raise ValueError(msg)
+        if min_count < 1:
+            msg = "min_count must be positive"
+            raise ValueError(msg)
+        if max_ngrams is not None and max_ngrams < 1:
+            msg = "max_ngrams must be positive"
+            raise ValueError(msg)
+        if chunk_size < 1:
+            msg = "chunk_size must be positive"
+            raise ValueError(msg)
+        self.n = n
+        self.min_count = min_count
+        self.max_ngrams = max_ngrams
+        self.vocabulary = Vocabulary()
+        self.error = 0
+        self._chunk_size = chunk_size
+        self._counts: collections.Counter[tuple[int, ...]] = collections.Counter()
+        self._window: collections.deque[int] = collections.deque(maxlen=n - 1)
+
+    def __len__(self) -> int:
+        """Return the number of distinct n-grams held."""
+        return len(self._counts)
+
+    def update(self, tokens: Iterable[str]) -> None:
+        """Count the n-grams of the next part of the stream.
+
+        The stream continues across calls: the last ``n - 1`` tokens of one
+        call start n-grams that end in the next.
+
+        Args:
+            tokens: Tokens to count; consumed lazily.
+
+        Examples:
+            >>> trigrams = NgramCounter(3)
+            >>> trigrams.update(["a", "b"])
+            >>> len(trigrams)
+            0
+
+            >>> trigrams.update(iter(["c", "a"]))
+            >>> sorted(map(trigrams.words, trigrams.ngrams()))
+            [('a', 'b', 'c'), ('b', 'c', 'a')]
+
+            >>> trigrams.update([])
+            >>> trigrams.vocabulary.most_common(1)
+            [('a', 2)]
+        """
+        vocab, counts, window = self.vocabulary, self._counts, self._window
+        tokens = iter(tokens)
+        while chunk := list(itertools.islice(tokens, self._chunk_size)):
+            ids = [*window, *vocab.intern(chunk)]
+            # Shifted views of the ids zip into every n-gram; zip stops at the
+            # last complete one
+            shifted = [itertools.islice(ids, k, None) for k in range(self.n)]
+            counts.update(zip(*shifted, strict=False))
+            window.extend(ids)
+            self._prune()
+            counts = self._counts
+
+    def ngrams(self) -> list[tuple[int, ...]]:
+        """Return the n-grams held, as tuples of ids in order of first count.
+
+        Examples:
+            >>> bigrams = NgramCounter(2)
+            >>> bigrams.update("x y x".split())
+            >>> bigrams.ngrams()
+            [(0, 1), (1, 0)]
+
+            >>> NgramCounter(2).ngrams()
+            []
+
+            >>> bigrams = NgramCounter(2, chunk_size=1)
+            >>> bigrams.update("abc")
+            >>> bigrams.ngrams()
+            [(0, 1), (1, 2)]
+        """
+        return list(self._counts)
+
+    def most_common(self, k: int | None = None) -> list[tuple[tuple[int, ...], int]]:
+        """Return n-grams with their counts, most frequent first.
+
+        Args:
+            k: Number of n-grams to return; ``None`` returns all of them.
+
+        Returns:
+            ``(ids, count)`` pairs; ``words`` turns ids back into tokens.
+
+        Examples:
+            >>> bigrams = NgramCounter(2)
+            >>> bigrams.update("a b a b".split())
+            >>> bigrams.most_common()
+            [((0, 1), 2), ((1, 0), 1)]
+
+            >>> [(bigrams.words(g), c) for g, c in bigrams.most_common(1)]
+            [(('a', 'b'), 2)]
+
+            >>> NgramCounter(2).most_common(5)
+            []
+        """
+        return self._counts.most_common(k)
+
+    def count_of(self, words: Sequence[str]) -> int:
+        """Return the count of the n-gram made of ``words``.
+
+        Args:
+            words: ``n`` tokens.
+
+        Returns:
+            The count, or 0 when it is not held.
+
+        Examples:
+            >>> bigrams = NgramCounter(2)
+            >>> bigrams.update("a b a".split())
+            >>> bigrams.count_of(["b", "a"])
+            1
+
+            >>> bigrams.count_of(["a", "a"])
+            0
+
+            >>> bigrams.count_of(["a", "zzz"])
+            0
+        """
+        try:
+            ids = tuple(self.vocabulary.encode(words))
+        except KeyError:
+            return 0
+        return self._counts[ids]
+
+    def words(self, ngram: tuple[int, ...]) -> tuple[str, ...]:
+        """Return the tokens of an n-gram of ids.
+
+        Args:
+            ngram: Ids, as ``most_common`` returns them.
+
+        Returns:
+            The tokens.
+
+        Raises:
+            IndexError: When an id is not in the vocabulary.
+
+        Examples:
+            >>> unigrams = NgramCounter(1)
+            >>> unigrams.update(["hi"])
+            >>> unigrams.words((0,))
+            ('hi',)
+
+            >>> unigrams.words(())
+            ()
+
+            >>> unigrams.words((1,))
+            Traceback (most recent call last):
+            IndexError: no word with id 1
+        """
+        return tuple(map(self.vocabulary.word_of, ngram))
+
+    def _prune(self) -> None:
+        """Drop n-grams below ``min_count``, and more if over ``max_ngrams``."""
+        counts = self._counts
+        threshold = self.min_count
+        if self.max_ngrams is not None and len(counts) > self.max_ngrams:
+            cut = sorted(counts.values(), reverse=True)[self.max_ngrams // 2]
+            # Keeping only counts above cut leaves at most max_ngrams // 2
+            threshold = max(threshold, cut + 1)
+        if threshold > 1:
+            kept = {ngram: c for ngram, c in counts.items() if c >= threshold}
+            if len(kept) < len(counts):
+                self._counts = collections.Counter(kept)
+                self.error += threshold - 1
@@ -0,0 +1,327 @@
+r"""Approximate word frequencies with a Count-Min sketch.
+
+Demonstrates counting an unbounded stream in memory fixed in advance. The
+sketch is a ``depth`` by ``width`` table of 32-bit counters held in one flat
+``array('I')``; each word is hashed with BLAKE2b to one counter per row. A
+word's estimate is the smallest of its counters, which never undercounts
+and overcounts only by what collided with it. Conservative update raises
+only the counters that are needed, which shrinks the overcount, and
+sketches of the same shape built by different workers add up cell by cell.
+
+Rust equivalent:
+    use blake2::{Blake2bVar, digest::{Update, VariableOutput}};
+
+    struct CountMin { width: usize, depth: usize, cells: Vec<u32> }
+
+    impl CountMin {
+        fn indices(&self, word: &str) -> Vec<usize> {
+            let mut hasher = Blake2bVar::new(8 * self.depth).unwrap();
+            hasher.update(word.as_bytes());
+            let mut digest = vec![0u8; 8 * self.depth];
+            hasher.finalize_variable(&mut digest).unwrap();
+            digest
+                .chunks_exact(8)
+                .enumerate()
+                .map(|(row, h)| {
+                    let h = u64::from_le_bytes(h.try_into().unwrap());
+                    row * self.width + (h % self.width as u64) as usize
+                })
+                .collect()
+        }
+
+        fn add(&mut self, word: &str, count: u32) {
+            let indices = self.indices(word);
+            let low = indices.iter().map(|&i| self.cells[i]).min().unwrap();
+            let target = low.saturating_add(count);
+            for i in indices {
+                self.cells[i] = self.cells[i].max(target);
+            }
+        }
+    }
+
+Examples:
+    >>> from reprorusted_std_only.collections.sketch_example import CountMinSketch
+    >>> sketch = CountMinSketch(width=64, depth=4)
+    >>> sketch.update("to be or not to be".split())
+    >>> sketch.estimate("to"), sketch.estimate("be"), sketch.estimate("xyz")
+    (2, 2, 0)
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import itertools
+import operator
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# Counters saturate here instead of overflowing the 32-bit cells
+MAX_COUNT = 0xFFFFFFFF
+# BLAKE2b digests are at most 64 bytes, eight 64-bit row hashes
+MAX_DEPTH = 8
+# Words counted exactly per batch before they are added to the sketch
+_BATCH = 1 << 16
+# Magic, then width, depth and total; the last magic byte is the byte
+# order of the cells that follow
+_HEADER = struct.Struct("<4sIIQ")
+_MAGIC = {"little": b"CMSL", "big": b"CMSB"}
+
+
+class CountMinSketch:
+    """Approximate counts of words in fixed memory.
+
+    An estimate is never below the true count. It exceeds it by more
+    than ``2 * total / width`` with probability at most ``2 ** -depth``,
+    so ``width`` sets the accuracy and ``depth`` the confidence. The
+    sketch takes ``4 * width * depth`` bytes whatever the vocabulary.
+
+    Attributes:
+        width: Counters per row.
+        depth: Rows, each with its own hash of the word.
+        total: Words counted.
+    """
+
+    def __init__(self, width: int, depth: int = 4) -> None:
+        """Create an empty sketch.
+
+        Args:
+            width: Counters per row; at least 1.
+            depth: Rows; from 1 to ``MAX_DEPTH``.
+
+        Raises:
+            ValueError: When ``width`` is not positive or ``depth`` is out
+                of range.
+        """
+        if width < 1:
+            msg = "width must be positive"
+            raise ValueError(msg)
+        if not 1 <= depth <= MAX_DEPTH:
+            msg = f"depth must be between 1 and {MAX_DEPTH}"
+            raise ValueError(msg)
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._cells = array("I", bytes(4 * width * depth))
+        self._hashes = struct.Struct(f"<{depth}Q")
+        self._offsets = range(0, width * depth, width)
+
+    def add(self, word: str, count: int = 1) -> None:
+        """Count ``count`` occurrences of ``word``.
+
+        Args:
+            word: Word to count.
+            count: Occurrences to add; at least 1.
+
+        Raises:
+            ValueError: When ``count`` is not positive.
+
+        Examples:
+            >>> sketch = CountMinSketch(16, depth=2)
+            >>> sketch.add("x", 5)
+            >>> sketch.estimate("x"), sketch.total
+            (5, 5)
+
+            >>> sketch.add("x")
+            >>> sketch.estimate("x")
+            6
+
+            >>> sketch.add("x", 0)
+            Traceback (most recent call last):
+            ValueError: count must be positive
+        """
+        if count < 1:
+            msg = "count must be positive"
+            raise ValueError(msg)
+        self.total += count
+        self._add(word, count)
+
+    def update(self, words: Iterable[str]) -> None:
+        """Count a stream of words.
+
+        Words are counted exactly a batch at a time, so each distinct word
+        of a batch is hashed once.
+
+        Args:
+            words: Words to count; consumed lazily.
+
+        Examples:
+            >>> sketch = CountMinSketch(32)
+            >>> sketch.update(iter("a b a".split()))
+            >>> sketch.estimate("a"), sketch.total
+            (2, 3)
+
+            >>> sketch.update([])
+            >>> sketch.total
+            3
+
+            >>> sketch.update(["a"] * 3)
+            >>> sketch.estimate("a")
+            5
+        """
+        words = iter(words)
+        while batch := list(itertools.islice(words, _BATCH)):
+            self.total += len(batch)
+            for word, count in collections.Counter(batch).items():
+                self._add(word, count)
+
+    def estimate(self, word: str) -> int:
+        """Return an upper bound on the count of ``word``.
+
+        Args:
+            word: Word to look up.
+
+        Returns:
+            The smallest of the word's counters.
+
+        Examples:
+            >>> sketch = CountMinSketch(1, depth=1)
+            >>> sketch.update("a b".split())
+            >>> sketch.estimate("a"), sketch.estimate("c")
+            (2, 2)
+
+            >>> CountMinSketch(8).estimate("a")
+            0
+
+            >>> sketch = CountMinSketch(1000)
+            >>> sketch.update(["ü"] * 7)
+            >>> sketch.estimate("ü")
+            7
+        """
+        return min(map(self._cells.__getitem__, self._indices(word)))
+
+    def merge(self, other: CountMinSketch) -> None:
+        """Add the counters of a sketch of the same shape.
+
+        Estimates of the merged sketch stay upper bounds of the counts over
+        both streams.
+
+        Args:
+            other: Sketch of another stream, such as another worker's.
+
+        Raises:
+            TypeError: When ``other`` is not a ``CountMinSketch``.
+            ValueError: When the widths or depths differ.
+
+        Examples:
+            >>> a, b = CountMinSketch(64), CountMinSketch(64)
+            >>> a.update("x y".split())
+            >>> b.update("x x".split())
+            >>> a.merge(b)
+            >>> a.estimate("x"), a.total
+            (3, 4)
+
+            >>> a.merge(CountMinSketch(32))
+            Traceback (most recent call last):
+            ValueError: cannot merge a 32x4 sketch into a 64x4 one
+
+            >>> a.merge({})  # doctest: +IGNORE_EXCEPTION_DETAIL
+            Traceback (most recent call last):
+            TypeError: ...
+        """
+        if not isinstance(other, CountMinSketch):
+            msg = f"expected CountMinSketch, got {type(other).__name__}"
+            raise TypeError(msg)
+        if (other.width, other.depth) != (self.width, self.depth):
+            msg = (
+                f"cannot merge a {other.width}x{other.depth} sketch"
+                f" into a {self.width}x{self.depth} one"
+            )
+            raise ValueError(msg)
+        sums = list(map(operator.add, self._cells, other._cells))
+        if max(sums) > MAX_COUNT:
+            sums = [min(n, MAX_COUNT) for n in sums]
+        self._cells = array("I", sums)
+        self.total += other.total
+
+    def to_bytes(self) -> bytes:
+        """Serialize the sketch.
+
+        Returns:
+            A 20-byte header followed by the counters in native byte order.
+
+        Examples:
+            >>> sketch = CountMinSketch(4, depth=2)
+            >>> len(sketch.to_bytes())
+            52
+
+            >>> sketch.add("a")
+            >>> CountMinSketch.from_bytes(sketch.to_bytes()).estimate("a")
+            1
+
+            >>> CountMinSketch(1, 1).to_bytes()[:4] in (b"CMSL", b"CMSB")
+            True
+        """
+        magic = _MAGIC[sys.byteorder]
+        header = _HEADER.pack(magic, self.width, self.depth, self.total)
+        return header + self._cells.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> CountMinSketch:
+        """Rebuild a sketch written by ``to_bytes``, on any platform.
+
+        Args:
+            data: Serialized sketch.
+
+        Returns:
+            The sketch.
+
+        Raises:
+            ValueError: When ``data`` is not a serialized sketch or its size
+                does not match its header.
+
+        Examples:
+            >>> sketch = CountMinSketch(8)
+            >>> sketch.update("a a b".split())
+            >>> copy = CountMinSketch.from_bytes(sketch.to_bytes())
+            >>> copy.estimate("a"), copy.total, copy.width, copy.depth
+            (2, 3, 8, 4)
+
+            >>> CountMinSketch.from_bytes(b"CMSL")
+            Traceback (most recent call last):
+            ValueError: not a serialized Count-Min sketch
+
+            >>> CountMinSketch.from_bytes(CountMinSketch(8).to_bytes()[:-1])
+            Traceback (most recent call last):
+            ValueError: expected 128 bytes of counters, got 127
+        """
+        if len(data) < _HEADER.size or data[:4] not in _MAGIC.values():
+            msg = "not a serialized Count-Min sketch"
+            raise ValueError(msg)
+        magic, width, depth, total = _HEADER.unpack_from(data)
+        sketch = cls(width, depth)
+        cells = memoryview(data)[_HEADER.size :]
+        if len(cells) != 4 * width * depth:
+            msg = f"expected {4 * width * depth} bytes of counters, got {len(cells)}"
+            raise ValueError(msg)
+        sketch._cells = array("I")
+        sketch._cells.frombytes(cells)
+        if magic != _MAGIC[sys.byteorder]:
+            sketch._cells.byteswap()
+        sketch.total = total
+        return sketch
+
+    def _indices(self, word: str) -> map[int]:
+        """Return the index of the counter for ``word`` in each row."""
+        digest = hashlib.blake2b(word.encode(), digest_size=8 * self.depth).digest()
+        width = self.width
+        return map(
+            operator.add,
+            self._offsets,
+            [h % width for h in self._hashes.unpack(digest)],
+        )
+
+    def _add(self, word: str, count: int) -> None:
+        """Raise the counters of ``word`` to at least its estimate plus ``count``."""
+        cells = self._cells
+        indices = list(self._indices(word))
+        target = min(min(map(cells.__getitem__, indices)) + count, MAX_COUNT)
+        # Conservative update: counters already above target stay as they are
+        for i in indices:
+            if cells[i] < target:
+                cells[i] = target
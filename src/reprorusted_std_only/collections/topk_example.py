@@ -0,0 +1,221 @@
+r"""Bounded-memory heavy hitters with the Misra-Gries summary.
+
+Demonstrates counting the most frequent words of a stream whose vocabulary
+does not fit in memory. At most ``capacity`` counters are kept; when there
+are more, the count of the ``capacity + 1``-th most frequent word is
+subtracted from every counter and the ones that reach zero are dropped.
+What was subtracted is tracked, so every count comes with an error bound,
+and two summaries of different shards merge into a summary of both.
+
+Rust equivalent:
+    use std::collections::HashMap;
+
+    struct TopK { capacity: usize, counts: HashMap<String, u64>, error: u64 }
+
+    impl TopK {
+        fn add(&mut self, word: &str) {
+            *self.counts.entry(word.to_string()).or_insert(0) += 1;
+            if self.counts.len() > self.capacity {
+                let mut values: Vec<u64> = self.counts.values().copied().collect();
+                values.sort_unstable_by(|a, b| b.cmp(a));
+                let cut = values[self.capacity];
+                self.counts.retain(|_, n| { *n = n.saturating_sub(cut); *n > 0 });
+                self.error += cut;
+            }
+        }
+    }
+
+Examples:
+    >>> from reprorusted_std_only.collections.topk_example import TopKCounter
+    >>> top = TopKCounter(capacity=1)
+    >>> top.update("a b a c a b d a".split())
+    >>> top.most_common(1), top.bounds("a"), top.bounds("c")
+    ([('a', 2)], (2, 4), (0, 2))
+"""
+
+from __future__ import annotations
+
+import collections
+import itertools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class TopKCounter:
+    """Approximate word counts that keep only the frequent words.
+
+    Counts never exceed the true count and fall short of it by at most
+    ``error``, which stays below ``total / (capacity + 1)``. So every word
+    seen more than ``total / (capacity + 1)`` times is kept, and the order
+    of ``most_common`` is exact wherever neighbouring counts differ by
+    more than ``error``. To rank the top ``k`` words reliably, make
+    ``capacity`` a few times ``k``.
+
+    Compaction is deferred until ``2 * capacity`` counters are exceeded,
+    so the summary holds at most that many between updates and up to
+    ``3 * capacity`` while a batch is being added.
+
+    Attributes:
+        capacity: Counters kept after each compaction.
+        total: Words counted, including those no longer tracked.
+        error: Most that any count may fall short of the true count.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Create an empty summary.
+
+        Args:
+            capacity: Counters to keep; at least 1.
+
+        Raises:
+            ValueError: When ``capacity`` is not positive.
+        """
+        if capacity < 1:
+            msg = "capacity must be positive"
+            raise ValueError(msg)
+        self.capacity = capacity
+        self.total = 0
+        self.error = 0
+        self._counts: collections.Counter[str] = collections.Counter()
+
+    def __len__(self) -> int:
+        """Return the number of words currently tracked."""
+        return len(self._counts)
+
+    def update(self, words: Iterable[str]) -> None:
+        """Count a stream of words.
+
+        Words are counted exactly a batch at a time with a ``Counter`` and
+        then added to the summary, which is compacted whenever it holds
+        more than ``2 * capacity`` words.
+
+        Args:
+            words: Words to count; consumed lazily.
+
+        Examples:
+            >>> top = TopKCounter(3)
+            >>> top.update(iter("x y x z x".split()))
+            >>> top.most_common()
+            [('x', 3), ('y', 1), ('z', 1)]
+
+            >>> top.update([])
+            >>> top.total, top.error
+            (5, 0)
+
+            >>> top.update(["w", "v"])
+            >>> len(top), top.error
+            (5, 0)
+        """
+        counts = self._counts
+        words = iter(words)
+        while batch := list(itertools.islice(words, self.capacity)):
+            self.total += len(batch)
+            counts.update(batch)
+            if len(counts) > 2 * self.capacity:
+                self._compact()
+                counts = self._counts
+
+    def most_common(self, n: int | None = None) -> list[tuple[str, int]]:
+        """Return the tracked words with their counts, most frequent first.
+
+        Args:
+            n: Number of words to return; ``None`` returns all tracked ones.
+
+        Returns:
+            ``(word, count)`` pairs, as ``Counter.most_common`` returns.
+
+        Examples:
+            >>> top = TopKCounter(10)
+            >>> top.update("b a b c b a".split())
+            >>> top.most_common(2)
+            [('b', 3), ('a', 2)]
+
+            >>> TopKCounter(1).most_common()
+            []
+
+            >>> top.most_common(0)
+            []
+        """
+        return self._counts.most_common(n)
+
+    def bounds(self, word: str) -> tuple[int, int]:
+        """Return the range the true count of ``word`` lies in.
+
+        Args:
+            word: Word to look up; it need not be tracked.
+
+        Returns:
+            ``(low, high)``, inclusive.
+
+        Examples:
+            >>> top = TopKCounter(1)
+            >>> top.update("a b c a a".split())
+            >>> top.bounds("a"), top.bounds("b")
+            ((2, 3), (0, 1))
+
+            >>> TopKCounter(1).bounds("never")
+            (0, 0)
+
+            >>> top.error <= top.total / (top.capacity + 1)
+            True
+        """
+        count = self._counts.get(word, 0)
+        return count, count + self.error
+
+    def merge(self, other: TopKCounter) -> None:
+        """Add the counts of another summary, such as one of another shard.
+
+        Both summaries must have the same capacity, so the merged one keeps
+        ``capacity`` counters and its error stays below
+        ``total / (capacity + 1)`` for the combined total.
+
+        Args:
+            other: A summary built over different words.
+
+        Raises:
+            TypeError: When ``other`` is not a ``TopKCounter``.
+            ValueError: When the capacities differ.
+
+        Examples:
+            >>> a, b = TopKCounter(2), TopKCounter(2)
+            >>> a.update("x x y".split())
+            >>> b.update("x z z z".split())
+            >>> a.merge(b)
+            >>> a.most_common(), a.total, a.error
+            ([('x', 2), ('z', 2)], 7, 1)
+
+            >>> a.merge(TopKCounter(5))
+            Traceback (most recent call last):
+            ValueError: cannot merge a capacity-5 summary into a capacity-2 one
+
+            >>> a.merge({})  # doctest: +IGNORE_EXCEPTION_DETAIL
+            Traceback (most recent call last):
+            TypeError: ...
+        """
+        if not isinstance(other, TopKCounter):
+            msg = f"expected TopKCounter, got {type(other).__name__}"
+            raise TypeError(msg)
+        if other.capacity != self.capacity:
+            # A smaller summary may already be off by more than this bound
+            msg = (
+                f"cannot merge a capacity-{other.capacity} summary"
+                f" into a capacity-{self.capacity} one"
+            )
+            raise ValueError(msg)
+        self._counts.update(other._counts)
+        self.total += other.total
+        self.error += other.error
+        if len(self._counts) > self.capacity:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Subtract the ``capacity + 1``-th largest count from every counter."""
+        cut = sorted(self._counts.values(), reverse=True)[self.capacity]
+        # At least capacity + 1 counters lose cut each, so the error grows
+        # by at most 1 / (capacity + 1) of the words removed
+        self._counts = collections.Counter(
+            {word: n - cut for word, n in self._counts.items() if n > cut}
+        )
+        self.error += cut
@@ -0,0 +1,302 @@
+r"""Parallel map-reduce word counting over files.
+
+Demonstrates counting words in files far larger than memory. Each file is
+split into byte ranges that start just after a whitespace byte, so no word
+straddles two ranges; each range is read in fixed-size chunks, carrying a
+word cut at a chunk boundary over to the next chunk, and counted in a
+worker process. Each range's ``Counter`` is added to one running total as
+soon as it arrives, with at most two ranges per worker in flight. Memory
+stays bounded by the chunk size and the vocabulary, not the corpus.
+
+Rust equivalent:
+    use rayon::prelude::*;
+    use std::collections::HashMap;
+    use std::sync::mpsc::sync_channel;
+
+    fn count_words(texts: &[String]) -> HashMap<String, usize> {
+        // A bounded channel keeps at most a few partial maps waiting
+        let (tx, rx) = sync_channel(2 * rayon::current_num_threads());
+        let mut total = HashMap::new();
+        rayon::scope(|s| {
+            s.spawn(move |_| {
+                texts.par_iter().for_each_with(tx, |tx, text| {
+                    let mut counts = HashMap::new();
+                    for word in text.split_whitespace() {
+                        *counts.entry(word.to_string()).or_insert(0) += 1;
+                    }
+                    tx.send(counts).unwrap();
+                })
+            });
+            for counts in rx {
+                for (word, n) in counts {
+                    *total.entry(word).or_insert(0) += n;
+                }
+            }
+        });
+        total
+    }
+
+Examples:
+    >>> import io
+    >>> from reprorusted_std_only.collections.wordcount_example import (
+    ...     count_words_stream,
+    ... )
+    >>> count_words_stream(io.BytesIO(b"to be or\nnot to be"), chunk_size=4)
+    Counter({'to': 2, 'be': 2, 'or': 1, 'not': 1})
+"""
+
+from __future__ import annotations
+
+import codecs
+import collections
+import itertools
+import os
+import re
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+DEFAULT_MIN_RANGE_BYTES = 1 << 24
+# Ranges per worker, so one slow range does not leave the other cores idle
+_RANGES_PER_JOB = 4
+# ASCII bytes that str.split() treats as whitespace; in UTF-8 and other
+# ASCII-compatible encodings they never occur inside a multi-byte character
+_SPACE = re.compile(rb"[\t\n\x0b\x0c\r\x1c-\x1f ]")
+
+
+def count_words_stream(
+    stream: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> collections.Counter[str]:
+    r"""Count whitespace-separated words in a binary stream, in-process.
+
+    The stream is read ``chunk_size`` bytes at a time; the result equals
+    ``Counter(text.split())`` on the whole decoded text.
+
+    Args:
+        stream: Binary file object, read to the end and left open.
+        chunk_size: Bytes read per call.
+        encoding: Text encoding of the stream.
+
+    Returns:
+        Count of each word.
+
+    Raises:
+        ValueError: When ``chunk_size`` is not positive.
+        UnicodeDecodeError: When the bytes are not valid in ``encoding``.
+
+    Examples:
+        >>> import io
+        >>> count_words_stream(io.BytesIO("ça va\tça".encode()), chunk_size=1)
+        Counter({'ça': 2, 'va': 1})
+
+        >>> count_words_stream(io.BytesIO(b" \n "))
+        Counter()
+
+        >>> count_words_stream(io.BytesIO(b""), chunk_size=0)
+        Traceback (most recent call last):
+        ValueError: chunk_size must be positive
+    """
+    if chunk_size < 1:
+        msg = "chunk_size must be positive"
+        raise ValueError(msg)
+    return _count_chunks(iter(lambda: stream.read(chunk_size), b""), encoding)
+
+
+def count_words_in_files(
+    paths: Iterable[str | os.PathLike[str]],
+    jobs: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    min_range_bytes: int = DEFAULT_MIN_RANGE_BYTES,
+    encoding: str = "utf-8",
+) -> collections.Counter[str]:
+    r"""Count whitespace-separated words across files on several cores.
+
+    Files are split into ranges of at least ``min_range_bytes`` at
+    whitespace, and each range is counted by a worker that reads it
+    ``chunk_size`` bytes at a time. Each partial count is added to the
+    total as soon as its worker finishes, and at most ``2 * jobs`` ranges
+    are in flight, so partial counts never pile up. The result equals
+    ``Counter(text.split())`` summed over the decoded files.
+
+    Args:
+        paths: Paths of the files to count.
+        jobs: Worker processes; ``1`` counts in-process, ``0`` uses all
+            cores.
+        chunk_size: Bytes read per call in each worker.
+        min_range_bytes: Smallest range handed to a worker; input smaller
+            than two ranges is counted in-process.
+        encoding: Text encoding of the files; must be ASCII-compatible,
+            such as UTF-8 or Latin-1.
+
+    Returns:
+        Count of each word.
+
+    Raises:
+        ValueError: When ``jobs`` is negative or ``chunk_size`` or
+            ``min_range_bytes`` is not positive.
+        UnicodeDecodeError: When a file is not valid in ``encoding``.
+
+    Examples:
+        >>> import os, tempfile
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     for name, text in (("a.log", b"GET /\nGET /x\n"), ("b.log", b"PUT /")):
+        ...         with open(os.path.join(tmp, name), "wb") as f:
+        ...             _ = f.write(text)
+        ...     paths = [os.path.join(tmp, name) for name in ("a.log", "b.log")]
+        ...     counts = count_words_in_files(paths, jobs=2, min_range_bytes=4)
+        >>> sorted(counts.items())
+        [('/', 2), ('/x', 1), ('GET', 2), ('PUT', 1)]
+
+        >>> count_words_in_files([])
+        Counter()
+
+        >>> count_words_in_files([], jobs=-1)
+        Traceback (most recent call last):
+        ValueError: jobs must be non-negative
+    """
+    if jobs < 0:
+        msg = "jobs must be non-negative"
+        raise ValueError(msg)
+    if chunk_size < 1:
+        msg = "chunk_size must be positive"
+        raise ValueError(msg)
+    if min_range_bytes < 1:
+        msg = "min_range_bytes must be positive"
+        raise ValueError(msg)
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    tasks = [
+        (path, start, end)
+        for path in map(os.fspath, paths)
+        for start, end in _split_file(path, jobs * _RANGES_PER_JOB, min_range_bytes)
+    ]
+    if jobs == 1 or len(tasks) <= 1:
+        return merge_counters(
+            _count_range(path, start, end, chunk_size, encoding)
+            for path, start, end in tasks
+        )
+    return merge_counters(_count_in_pool(tasks, jobs, chunk_size, encoding))
+
+
+def merge_counters(
+    parts: Iterable[collections.Counter[str]],
+) -> collections.Counter[str]:
+    """Sum ``Counter`` objects, folding each into one total as it arrives.
+
+    ``parts`` is consumed lazily, so each counter can be freed as soon as
+    it has been added and only the total and the current part are alive.
+
+    Args:
+        parts: Counters to add up; they may be modified.
+
+    Returns:
+        The sum of ``parts``, which is one of them when there are any.
+
+    Examples:
+        >>> from collections import Counter
+        >>> merge_counters([Counter("ab"), Counter("b"), Counter("bcc")])
+        Counter({'b': 3, 'c': 2, 'a': 1})
+
+        >>> merge_counters([Counter(x=1)])
+        Counter({'x': 1})
+
+        >>> merge_counters([])
+        Counter()
+    """
+    total: collections.Counter[str] = collections.Counter()
+    for part in parts:
+        # Updating the larger one touches fewer keys
+        if len(part) > len(total):
+            total, part = part, total
+        total.update(part)
+    return total
+
+
+def _count_in_pool(
+    tasks: Iterable[tuple[str, int, int]], jobs: int, chunk_size: int, encoding: str
+) -> Iterator[collections.Counter[str]]:
+    """Count ranges in a process pool, yielding each count as it finishes.
+
+    At most ``2 * jobs`` ranges are in flight at once, so finished counts
+    are merged before more ranges are handed out.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: set[Future[collections.Counter[str]]] = set()
+        for path, start, end in tasks:
+            pending.add(
+                executor.submit(_count_range, path, start, end, chunk_size, encoding)
+            )
+            if len(pending) >= 2 * jobs:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+        yield from (future.result() for future in as_completed(pending))
+
+
+def _split_file(path: str, ranges: int, min_range_bytes: int) -> list[tuple[int, int]]:
+    """Split ``path`` into byte ranges that each begin after a whitespace byte."""
+    size = os.path.getsize(path)
+    step = max(size // ranges, min_range_bytes)
+    points = [0]
+    with open(path, "rb") as f:
+        for target in range(step, size, step):
+            if target <= points[-1]:
+                continue
+            # Start one byte early: whitespace just before target ends a word
+            f.seek(target - 1)
+            pos = target - 1
+            while block := f.read(1 << 16):
+                match = _SPACE.search(block)
+                if match:
+                    points.append(pos + match.end())
+                    break
+                pos += len(block)
+            else:
+                # No whitespace after target: the rest is one range
+                break
+    if size:
+        points.append(size)
+    # A boundary can land at the very end; drop the empty range it leaves
+    return [(start, end) for start, end in itertools.pairwise(points) if start < end]
+
+
+def _count_range(
+    path: str, start: int, end: int, chunk_size: int, encoding: str
+) -> collections.Counter[str]:
+    """Count the words stored in bytes ``start`` to ``end`` of ``path``."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        return _count_chunks(_read_range(f, end - start, chunk_size), encoding)
+
+
+def _read_range(f: BinaryIO, size: int, chunk_size: int) -> Iterator[bytes]:
+    """Yield the next ``size`` bytes of ``f`` in chunks of ``chunk_size``."""
+    while size > 0 and (chunk := f.read(min(chunk_size, size))):
+        size -= len(chunk)
+        yield chunk
+
+
+def _count_chunks(chunks: Iterable[bytes], encoding: str) -> collections.Counter[str]:
+    """Count the words in ``chunks``, joining words cut at chunk boundaries."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    counts: collections.Counter[str] = collections.Counter()
+    carry = ""
+    for chunk in chunks:
+        text = carry + decoder.decode(chunk)
+        words = text.split()
+        # A chunk that ends mid-word leaves that word for the next one
+        carry = words.pop() if words and not text[-1].isspace() else ""
+        counts.update(words)
+    words = (carry + decoder.decode(b"", final=True)).split()
+    counts.update(words)
+    return counts
@@ -0,0 +1,341 @@
+r"""Streaming hash aggregation over CSV rows.
+
+Demonstrates a group-by engine that reduces rows into a hash table keyed by
+the group columns as they are parsed, so memory grows with the number of
+groups rather than the number of rows. Partial tables built from different
+parts of a file, for example by parallel workers, merge into one.
+
+Rust equivalent:
+    use std::collections::HashMap;
+
+    #[derive(Default, Clone)]
+    struct Acc { count: u64, sum: f64, min: Option<f64>, max: Option<f64> }
+
+    impl Acc {
+        fn push(&mut self, v: f64) {
+            self.count += 1;
+            self.sum += v;
+            self.min = Some(self.min.map_or(v, |m| m.min(v)));
+            self.max = Some(self.max.map_or(v, |m| m.max(v)));
+        }
+        fn merge(&mut self, o: &Acc) {
+            self.count += o.count;
+            self.sum += o.sum;
+            self.min = self.min.into_iter().chain(o.min).reduce(f64::min);
+            self.max = self.max.into_iter().chain(o.max).reduce(f64::max);
+        }
+    }
+
+    fn group_sum(rows: impl Iterator<Item = (String, f64)>) -> HashMap<String, Acc> {
+        let mut table: HashMap<String, Acc> = HashMap::new();
+        for (key, value) in rows {
+            table.entry(key).or_default().push(value);
+        }
+        table
+    }
+
+Examples:
+    >>> import io
+    >>> from reprorusted_std_only.csv.groupby_example import group_csv
+    >>> data = b"city,sales\nOslo,3\nRome,5\nOslo,4\n"
+    >>> group_csv(io.BytesIO(data), ["city"], [("sum", "sales")]).result()
+    {('Oslo',): (7.0,), ('Rome',): (5.0,)}
+"""
+
+from __future__ import annotations
+
+import operator
+from typing import TYPE_CHECKING, BinaryIO
+
+from reprorusted_std_only.csv.stream_example import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    iter_csv,
+)
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable, Sequence
+
+# Aggregate functions and the number of state slots each one needs
+AGGREGATES = {"count": 1, "sum": 1, "min": 1, "max": 1, "mean": 2}
+# Starting state slots of each aggregate; mean keeps a sum and a count
+_INITIAL: dict[str, list[float | int | None]] = {
+    "count": [0],
+    "sum": [0.0],
+    "min": [None],
+    "max": [None],
+    "mean": [0.0, 0],
+}
+
+
+class GroupBy:
+    """Incremental group-by over rows of CSV fields.
+
+    Each group keeps one small list of running totals, so memory is
+    proportional to the number of distinct keys. Value cells are parsed as
+    floats; empty cells are skipped by every aggregate except ``count``,
+    which counts rows.
+
+    Attributes:
+        header: Column names of the rows being aggregated.
+        keys: Names of the columns that form the group key.
+        aggregates: ``(function, column)`` pairs; ``column`` is ignored for
+            ``count``.
+    """
+
+    def __init__(
+        self,
+        header: Sequence[str],
+        keys: Sequence[str],
+        aggregates: Sequence[tuple[str, str]],
+    ) -> None:
+        """Compile the key and aggregate specs against ``header``.
+
+        Args:
+            header: Column names of the rows to aggregate.
+            keys: Group key columns; at least one.
+            aggregates: ``(function, column)`` pairs, with functions from
+                ``AGGREGATES``.
+
+        Raises:
+            ValueError: When ``keys`` is empty or a spec names an unknown
+                column or function.
+        """
+        self.header = list(header)
+        self.keys = list(keys)
+        self.aggregates = [tuple(spec) for spec in aggregates]
+        if not self.keys:
+            msg = "at least one key column is required"
+            raise ValueError(msg)
+        key_index = [self._column(name) for name in self.keys]
+        self._key = operator.itemgetter(*key_index)
+        self._ops: list[tuple[str, int, int]] = []
+        slots = 0
+        for func, column in self.aggregates:
+            if func not in AGGREGATES:
+                msg = f"unknown aggregate {func!r}"
+                raise ValueError(msg)
+            index = 0 if func == "count" else self._column(column)
+            self._ops.append((func, index, slots))
+            slots += AGGREGATES[func]
+        self._initial: list[float | int | None] = []
+        for func, _, _ in self._ops:
+            self._initial += _INITIAL[func]
+        self._table: dict[object, list] = {}
+
+    def __len__(self) -> int:
+        """Return the number of groups seen so far."""
+        return len(self._table)
+
+    def update(self, rows: Iterable[Sequence[str]]) -> None:
+        """Fold rows into the running aggregates.
+
+        Args:
+            rows: Rows of field strings laid out as ``header``.
+
+        Raises:
+            ValueError: When a row is too short for a key or value column,
+                or a value cell is not a number.
+
+        Examples:
+            >>> g = GroupBy(["k", "v"], ["k"], [("count", "*"), ("max", "v")])
+            >>> g.update([["a", "1"], ["a", "3"], ["b", ""]])
+            >>> g.result()
+            {('a',): (2, 3.0), ('b',): (1, None)}
+
+            >>> g.update([])
+            >>> len(g)
+            2
+
+            >>> g.update([["c"]])
+            Traceback (most recent call last):
+            ValueError: row ['c'] has fewer fields than the header
+        """
+        table = self._table
+        key_of = self._key
+        ops = self._ops
+        initial = self._initial
+        for row in rows:
+            if not row:
+                # Blank lines carry no fields, as in csv.DictReader
+                continue
+            try:
+                key = key_of(row)
+                state = table.get(key)
+                if state is None:
+                    state = table[key] = initial.copy()
+                for func, index, slot in ops:
+                    if func == "count":
+                        state[slot] += 1
+                        continue
+                    text = row[index]
+                    if not text:
+                        continue
+                    value = float(text)
+                    if func == "sum":
+                        state[slot] += value
+                    elif func == "mean":
+                        state[slot] += value
+                        state[slot + 1] += 1
+                    elif func == "min":
+                        if state[slot] is None or value < state[slot]:
+                            state[slot] = value
+                    elif state[slot] is None or value > state[slot]:
+                        state[slot] = value
+            except IndexError:
+                msg = f"row {list(row)} has fewer fields than the header"
+                raise ValueError(msg) from None
+
+    def merge(self, other: GroupBy) -> None:
+        """Combine another partial aggregate into this one.
+
+        Args:
+            other: A ``GroupBy`` with the same header, keys and aggregates,
+                typically built over a different part of the input.
+
+        Raises:
+            TypeError: When ``other`` is not a ``GroupBy``.
+            ValueError: When ``other`` was built from different specs.
+
+        Examples:
+            >>> spec = (["k", "v"], ["k"], [("sum", "v"), ("min", "v")])
+            >>> a, b = GroupBy(*spec), GroupBy(*spec)
+            >>> a.update([["x", "1"]])
+            >>> b.update([["x", "-2"], ["y", "5"]])
+            >>> a.merge(b)
+            >>> a.result()
+            {('x',): (-1.0, -2.0), ('y',): (5.0, 5.0)}
+
+            >>> a.merge(GroupBy(["k", "v"], ["v"], [("sum", "v")]))
+            Traceback (most recent call last):
+            ValueError: cannot merge aggregates built from different specs
+
+            >>> a.merge({})  # doctest: +IGNORE_EXCEPTION_DETAIL
+            Traceback (most recent call last):
+            TypeError: ...
+        """
+        if not isinstance(other, GroupBy):
+            msg = f"expected GroupBy, got {type(other).__name__}"
+            raise TypeError(msg)
+        if (other.header, other.keys, other.aggregates) != (
+            self.header,
+            self.keys,
+            self.aggregates,
+        ):
+            msg = "cannot merge aggregates built from different specs"
+            raise ValueError(msg)
+        table = self._table
+        for key, theirs in other._table.items():
+            state = table.get(key)
+            if state is None:
+                table[key] = theirs.copy()
+                continue
+            for func, _, slot in self._ops:
+                value = theirs[slot]
+                if func == "mean":
+                    state[slot + 1] += theirs[slot + 1]
+                if func not in ("min", "max"):
+                    state[slot] += value
+                elif state[slot] is None:
+                    state[slot] = value
+                elif value is not None:
+                    pick = min if func == "min" else max
+                    state[slot] = pick(state[slot], value)
+
+    def result(self) -> dict[tuple[str, ...], tuple[float | int | None, ...]]:
+        """Return the final value of every aggregate, per group.
+
+        Returns:
+            Mapping of key tuple to one value per aggregate, in the order
+            groups were first seen. ``mean``, ``min`` and ``max`` are
+            ``None`` for a group without values.
+
+        Examples:
+            >>> g = GroupBy(["a", "b", "v"], ["a", "b"], [("mean", "v")])
+            >>> g.update([["x", "y", "1"], ["x", "y", "2"], ["x", "z", ""]])
+            >>> g.result()
+            {('x', 'y'): (1.5,), ('x', 'z'): (None,)}
+
+            >>> GroupBy(["a"], ["a"], []).result()
+            {}
+
+            >>> g = GroupBy(["a"], ["a"], [("count", "*")])
+            >>> g.update([["q"]] * 3)
+            >>> g.result()
+            {('q',): (3,)}
+        """
+        single = len(self.keys) == 1
+        out: dict[tuple[str, ...], tuple[float | int | None, ...]] = {}
+        for key, state in self._table.items():
+            values: list[float | int | None] = []
+            for func, _, slot in self._ops:
+                if func == "mean":
+                    count = state[slot + 1]
+                    values.append(state[slot] / count if count else None)
+                else:
+                    values.append(state[slot])
+            out[(key,) if single else key] = tuple(values)
+        return out
+
+    def _column(self, name: str) -> int:
+        """Return the index of column ``name`` in the header."""
+        try:
+            return self.header.index(name)
+        except ValueError:
+            msg = f"unknown column {name!r}"
+            raise ValueError(msg) from None
+
+
+def group_csv(
+    source: str | os.PathLike[str] | BinaryIO,
+    keys: Sequence[str],
+    aggregates: Sequence[tuple[str, str]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> GroupBy:
+    r"""Aggregate a CSV file with a header row while streaming it.
+
+    Rows are parsed with ``iter_csv`` and folded into a ``GroupBy`` one
+    batch at a time; no batch outlives its update.
+
+    Args:
+        source: Path of a CSV file, or a binary file object (left open).
+        keys: Group key columns.
+        aggregates: ``(function, column)`` pairs, as for ``GroupBy``.
+        batch_size: Rows parsed and folded per step.
+        chunk_size: Bytes read from the file at a time.
+        encoding: Text encoding of the file.
+
+    Returns:
+        The filled ``GroupBy``; call ``result()`` for the values or
+        ``merge()`` to combine it with others.
+
+    Raises:
+        TypeError: When ``source`` is neither a path nor a binary file.
+        ValueError: When the file is empty or a spec does not match it.
+
+    Examples:
+        >>> import io
+        >>> data = b"k,v\na,1\nb,2\na,3\n"
+        >>> group_csv(io.BytesIO(data), ["k"], [("mean", "v")]).result()
+        {('a',): (2.0,), ('b',): (2.0,)}
+
+        >>> len(group_csv(io.BytesIO(b"k,v\n"), ["k"], [("sum", "v")]))
+        0
+
+        >>> group_csv(io.BytesIO(b""), ["k"], [])
+        Traceback (most recent call last):
+        ValueError: cannot aggregate an empty file: no header row
+    """
+    batches = iter_csv(source, batch_size, chunk_size, encoding)
+    first = next(batches, None)
+    if first is None:
+        msg = "cannot aggregate an empty file: no header row"
+        raise ValueError(msg)
+    groups = GroupBy(first[0], keys, aggregates)
+    groups.update(first[1:])
+    for batch in batches:
+        groups.update(batch)
+    return groups
@@ -0,0 +1,294 @@
+r"""Multi-core CSV parsing over a memory-mapped file.
+
+Demonstrates splitting a CSV file into byte ranges that each start at a
+record boundary, parsing the ranges in a process pool and concatenating the
+results in file order. A newline is a record boundary only when an even
+number of quote characters precedes it; otherwise it sits inside a quoted
+field. Counting quotes is a fast byte scan over the ``mmap``, so finding
+boundaries costs little next to parsing.
+
+Rust equivalent:
+    use memchr::memchr_iter;
+    use rayon::prelude::*;
+
+    fn split_points(data: &[u8], ranges: usize) -> Vec<usize> {
+        let step = data.len() / ranges;
+        let (mut points, mut quotes, mut pos) = (vec![0], 0usize, 0);
+        for target in (1..ranges).map(|i| i * step) {
+            if target <= pos { continue; }
+            quotes += memchr_iter(b'"', &data[pos..target]).count();
+            pos = target;
+            while let Some(nl) = data[pos..].iter().position(|&b| b == b'\n') {
+                quotes += memchr_iter(b'"', &data[pos..pos + nl]).count();
+                pos += nl + 1;
+                if quotes % 2 == 0 { points.push(pos); break; }
+            }
+        }
+        points
+    }
+
+    fn parse_parallel(data: &[u8], ranges: usize) -> Vec<csv::StringRecord> {
+        let mut points = split_points(data, ranges);
+        points.push(data.len());
+        points.par_windows(2)
+            .flat_map_iter(|w| csv::ReaderBuilder::new().has_headers(false)
+                .from_reader(&data[w[0]..w[1]]).into_records().map(Result::unwrap))
+            .collect()
+    }
+
+Examples:
+    >>> import tempfile
+    >>> from reprorusted_std_only.csv.parallel_example import parse_csv_parallel
+    >>> with tempfile.NamedTemporaryFile(suffix=".csv") as f:
+    ...     _ = f.write(b'a,b\n"x\ny",2\n')
+    ...     f.flush()
+    ...     parse_csv_parallel(f.name)
+    [['a', 'b'], ['x\ny', '2']]
+"""
+
+from __future__ import annotations
+
+import collections
+import csv
+import io
+import itertools
+import mmap
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from reprorusted_std_only.csv.columnar_example import columns_from_batches
+
+if TYPE_CHECKING:
+    from array import array
+    from collections.abc import Iterator, Mapping
+
+    from reprorusted_std_only.csv.columnar_example import DictColumn
+
+DEFAULT_MIN_RANGE_BYTES = 1 << 20
+# Ranges per worker, so one slow range does not leave the other cores idle
+_RANGES_PER_JOB = 4
+# Bytes copied out of the map at a time while counting quotes
+_SCAN_BLOCK = 1 << 20
+
+
+def split_ranges(
+    data: bytes | mmap.mmap, ranges: int, min_range_bytes: int = 1
+) -> list[tuple[int, int]]:
+    r"""Split CSV bytes into ranges that start and end on record boundaries.
+
+    Aims for ``ranges`` ranges of equal size, each at least
+    ``min_range_bytes`` long, moving every split point forward to just
+    after the next newline that is outside quotes. Assumes RFC 4180
+    quoting, where quote characters only appear around fields or doubled
+    inside them.
+
+    Args:
+        data: The whole file, as bytes or a memory map.
+        ranges: Desired number of ranges.
+        min_range_bytes: Smallest range worth splitting off.
+
+    Returns:
+        Consecutive ``(start, end)`` byte offsets covering ``data``; empty
+        when ``data`` is empty.
+
+    Raises:
+        ValueError: When ``ranges`` or ``min_range_bytes`` is not positive.
+
+    Examples:
+        >>> split_ranges(b"a\nb\nc\nd\n", 2)
+        [(0, 4), (4, 8)]
+
+        >>> split_ranges(b'"x\ny\nz",1\nb\n', 3)
+        [(0, 10), (10, 12)]
+
+        >>> split_ranges(b"", 4)
+        []
+    """
+    if ranges < 1 or min_range_bytes < 1:
+        msg = "ranges and min_range_bytes must be positive"
+        raise ValueError(msg)
+    size = len(data)
+    step = max(size // ranges, min_range_bytes)
+    points = [0]
+    quotes = 0
+    pos = 0
+    for target in range(step, size, step):
+        if target <= pos:
+            continue
+        # Start one byte early: a newline just before target is a boundary
+        quotes += _count_quotes(data, pos, target - 1)
+        pos = target - 1
+        while True:
+            newline = data.find(b"\n", pos)
+            if newline < 0:
+                pos = size
+                break
+            quotes += _count_quotes(data, pos, newline)
+            pos = newline + 1
+            if quotes % 2 == 0:
+                break
+        if pos >= size:
+            break
+        points.append(pos)
+    if size:
+        points.append(size)
+    return list(itertools.pairwise(points))
+
+
+def parse_csv_parallel(
+    path: str | os.PathLike[str],
+    jobs: int = 0,
+    min_range_bytes: int = DEFAULT_MIN_RANGE_BYTES,
+    encoding: str = "utf-8",
+) -> list[list[str]]:
+    r"""Parse a CSV file on several cores, keeping the original row order.
+
+    The file is memory-mapped and split with ``split_ranges``; each range
+    is parsed in a worker process that maps the file itself, so only the
+    parsed rows cross process boundaries. At most two ranges per worker
+    are in flight at once. The result equals ``parse_csv`` on the decoded
+    file.
+
+    Args:
+        path: Path of the CSV file.
+        jobs: Worker processes; ``1`` parses in-process, ``0`` uses all
+            cores.
+        min_range_bytes: Smallest range handed to a worker; files below
+            twice this size are parsed in-process.
+        encoding: Text encoding of the file.
+
+    Returns:
+        List of rows, where each row is a list of field strings.
+
+    Raises:
+        ValueError: When ``jobs`` is negative or ``min_range_bytes`` is not
+            positive.
+
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix=".csv") as f:
+        ...     _ = f.write(b"n\n1\n2\n3\n")
+        ...     f.flush()
+        ...     parse_csv_parallel(f.name, jobs=2, min_range_bytes=2)
+        [['n'], ['1'], ['2'], ['3']]
+
+        >>> with tempfile.NamedTemporaryFile() as f:
+        ...     parse_csv_parallel(f.name)
+        []
+
+        >>> parse_csv_parallel("x.csv", jobs=-1)
+        Traceback (most recent call last):
+        ValueError: jobs must be non-negative
+    """
+    rows: list[list[str]] = []
+    for chunk in _parse_ranges(path, jobs, min_range_bytes, encoding):
+        rows.extend(chunk)
+    return rows
+
+
+def read_columns_parallel(
+    path: str | os.PathLike[str],
+    schema: Mapping[str, str] | None = None,
+    jobs: int = 0,
+    min_range_bytes: int = DEFAULT_MIN_RANGE_BYTES,
+    encoding: str = "utf-8",
+) -> dict[str, array[int] | array[float] | DictColumn]:
+    r"""Parse a CSV file with a header row into typed columns on several cores.
+
+    Ranges are parsed as in ``parse_csv_parallel`` and converted, in file
+    order, with ``columns_from_batches``, so each range's rows are freed
+    once appended to the columns. Types are inferred from the first range
+    that has rows and widen as later ranges need, as in ``read_columns``.
+    At most two ranges per worker are parsed ahead of the conversion.
+
+    Args:
+        path: Path of the CSV file.
+        schema: Optional type per column name, as for ``read_columns``.
+        jobs: Worker processes; ``1`` parses in-process, ``0`` uses all
+            cores.
+        min_range_bytes: Smallest range handed to a worker.
+        encoding: Text encoding of the file.
+
+    Returns:
+        Mapping of column name to ``array('q')``, ``array('d')`` or
+        ``DictColumn``, in header order.
+
+    Raises:
+        ValueError: As for ``parse_csv_parallel`` and ``read_columns``.
+
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix=".csv") as f:
+        ...     _ = f.write(b"n,s\n1,a\n2,b\n")
+        ...     f.flush()
+        ...     cols = read_columns_parallel(f.name, jobs=1)
+        >>> cols["n"], cols["s"].values
+        (array('q', [1, 2]), ['a', 'b'])
+
+        >>> with tempfile.NamedTemporaryFile() as f:
+        ...     read_columns_parallel(f.name)
+        {}
+
+        >>> read_columns_parallel("x.csv", min_range_bytes=0)
+        Traceback (most recent call last):
+        ValueError: min_range_bytes must be positive
+    """
+    chunks = _parse_ranges(path, jobs, min_range_bytes, encoding)
+    return columns_from_batches(chunks, schema)
+
+
+def _parse_ranges(
+    path: str | os.PathLike[str], jobs: int, min_range_bytes: int, encoding: str
+) -> Iterator[list[list[str]]]:
+    """Split the file at ``path`` and yield each range's rows in file order."""
+    if jobs < 0:
+        msg = "jobs must be non-negative"
+        raise ValueError(msg)
+    if min_range_bytes < 1:
+        msg = "min_range_bytes must be positive"
+        raise ValueError(msg)
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    path = os.fspath(path)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            # mmap cannot map an empty file
+            ranges = split_ranges(b"", jobs, min_range_bytes)
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                ranges = split_ranges(data, jobs * _RANGES_PER_JOB, min_range_bytes)
+    # Below two full ranges, the tail range is too small to be worth a pool
+    if jobs == 1 or len(ranges) <= 1 or size < 2 * min_range_bytes:
+        for start, end in ranges:
+            yield _parse_range(path, start, end, encoding)
+        return
+    # At most 2 * jobs ranges are in flight, so parsed rows never pile up
+    # faster than the consumer drains them
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: collections.deque[Future[list[list[str]]]] = collections.deque()
+        for start, end in ranges:
+            pending.append(executor.submit(_parse_range, path, start, end, encoding))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _parse_range(path: str, start: int, end: int, encoding: str) -> list[list[str]]:
+    """Parse the rows stored in bytes ``start`` to ``end`` of ``path``."""
+    with (
+        open(path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        text = data[start:end].decode(encoding)
+    return list(csv.reader(io.StringIO(text)))
+
+
+def _count_quotes(data: bytes | mmap.mmap, start: int, end: int) -> int:
+    """Count quote characters in ``data[start:end]`` a block at a time."""
+    count = 0
+    for block in range(start, end, _SCAN_BLOCK):
+        count += data[block : min(block + _SCAN_BLOCK, end)].count(b'"')
+    return count
@@ -0,0 +1,175 @@
+r"""Streaming CSV parsing in bounded memory.
+
+Demonstrates feeding ``csv.reader`` from a binary file read in fixed-size
+chunks, so peak memory depends on the chunk and batch sizes rather than on
+the file size. Rows are yielded in batches to amortize generator overhead.
+
+Rust equivalent:
+    use std::fs::File;
+    use std::io::BufReader;
+
+    fn iter_csv(path: &str, chunk_size: usize, batch_size: usize)
+        -> impl Iterator<Item = Vec<Vec<String>>>
+    {
+        let file = BufReader::with_capacity(chunk_size, File::open(path).unwrap());
+        let mut rdr = csv::ReaderBuilder::new()
+            .has_headers(false)
+            .flexible(true)
+            .from_reader(file);
+        let mut rows = rdr.into_records()
+            .map(|r| r.unwrap().iter().map(String::from).collect::<Vec<_>>());
+        std::iter::from_fn(move || {
+            let batch: Vec<_> = rows.by_ref().take(batch_size).collect();
+            (!batch.is_empty()).then_some(batch)
+        })
+    }
+
+Examples:
+    >>> import io
+    >>> from reprorusted_std_only.csv.stream_example import iter_csv
+    >>> list(iter_csv(io.BytesIO(b"a,b\n1,2\n3,4\n"), batch_size=2))
+    [[['a', 'b'], ['1', '2']], [['3', '4']]]
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import os
+import re
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+DEFAULT_BATCH_SIZE = 1024
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# One physical line, including its terminator, as ``newline=""`` splits them
+_LINE = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)")
+
+
+def iter_lines(
+    stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8"
+) -> Iterator[str]:
+    r"""Decode a binary stream chunk by chunk into lines.
+
+    Lines keep their terminator, which may be ``\n``, ``\r\n`` or ``\r``,
+    exactly as a text file opened with ``newline=""`` yields them. A
+    multi-byte character or a ``\r\n`` pair split across two chunks is
+    reassembled.
+
+    Args:
+        stream: Binary file object.
+        chunk_size: Bytes read per ``read`` call.
+        encoding: Text encoding of the stream.
+
+    Yields:
+        Lines, the last one possibly without a terminator.
+
+    Examples:
+        >>> import io
+        >>> list(iter_lines(io.BytesIO(b"a\r\nb\nc"), chunk_size=2))
+        ['a\r\n', 'b\n', 'c']
+
+        >>> list(iter_lines(io.BytesIO("é\n".encode()), chunk_size=1))
+        ['é\n']
+
+        >>> list(iter_lines(io.BytesIO(b"")))
+        []
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+        decoded = decoder.decode(chunk, final=final)
+        if not final and "\n" not in decoded and "\r" not in decoded:
+            # Still inside one long line: nothing to split yet
+            pending += decoded
+            continue
+        text = pending + decoded
+        end = 0
+        for match in _LINE.finditer(text):
+            # A trailing "\r" may be the first half of a "\r\n" pair
+            if not final and match.end() == len(text) and text[-1] == "\r":
+                break
+            yield match.group()
+            end = match.end()
+        pending = text[end:]
+        if final:
+            if pending:
+                yield pending
+            return
+
+
+def iter_csv(
+    source: str | os.PathLike[str] | BinaryIO,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Iterator[list[list[str]]]:
+    r"""Parse CSV from a file in constant memory, one batch of rows at a time.
+
+    The input is read ``chunk_size`` bytes at a time and at most
+    ``batch_size`` parsed rows are held before being yielded, so memory
+    stays bounded for files of any size. Uses the default CSV dialect, like
+    ``parse_csv``; quoted fields may span lines.
+
+    Args:
+        source: Path of a CSV file, or a binary file object (left open).
+        batch_size: Maximum rows per yielded batch.
+        chunk_size: Bytes read from the file at a time.
+        encoding: Text encoding of the file.
+
+    Returns:
+        Iterator over batches of rows; each row is a list of field strings.
+
+    Raises:
+        TypeError: When ``source`` is neither a path nor a binary file.
+        ValueError: When ``batch_size`` or ``chunk_size`` is not positive.
+
+    Examples:
+        >>> import io
+        >>> [len(b) for b in iter_csv(io.BytesIO(b"x\n" * 5), batch_size=2)]
+        [2, 2, 1]
+
+        >>> list(iter_csv(io.BytesIO(b'"multi\nline",2\n')))
+        [[['multi\nline', '2']]]
+
+        >>> iter_csv(io.StringIO("a,b"))  # doctest: +IGNORE_EXCEPTION_DETAIL
+        Traceback (most recent call last):
+        TypeError: ...
+    """
+    if batch_size < 1 or chunk_size < 1:
+        msg = "batch_size and chunk_size must be positive"
+        raise ValueError(msg)
+    if isinstance(source, (str, os.PathLike)):
+        return _iter_path(os.fspath(source), batch_size, chunk_size, encoding)
+    if isinstance(source, io.TextIOBase) or not hasattr(source, "read"):
+        msg = f"expected a path or binary file, got {type(source).__name__}"
+        raise TypeError(msg)
+    return _iter_batches(source, batch_size, chunk_size, encoding)
+
+
+def _iter_path(
+    path: str, batch_size: int, chunk_size: int, encoding: str
+) -> Iterator[list[list[str]]]:
+    """Yield batches from the file at ``path``, closing it when done."""
+    with open(path, "rb", buffering=0) as stream:
+        yield from _iter_batches(stream, batch_size, chunk_size, encoding)
+
+
+def _iter_batches(
+    stream: BinaryIO, batch_size: int, chunk_size: int, encoding: str
+) -> Iterator[list[list[str]]]:
+    """Yield lists of up to ``batch_size`` rows parsed from ``stream``."""
+    batch: list[list[str]] = []
+    for row in csv.reader(iter_lines(stream, chunk_size, encoding)):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
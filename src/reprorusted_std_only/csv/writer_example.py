@@ -0,0 +1,269 @@
+r"""Buffered bulk CSV writing with the csv module.
+
+Demonstrates ``csv.writer.writerows`` fed in batches into an in-memory text
+buffer that is encoded and written out whenever it passes a size
+threshold, so the output file sees a few large writes instead of one per
+row. Output may be gzip-compressed, and rows can come from an iterable or
+from typed columns such as those returned by ``read_columns``.
+
+Rust equivalent:
+    use std::fs::File;
+    use std::io::BufWriter;
+
+    fn write_csv(path: &str, rows: &[Vec<String>], buffer_size: usize) -> u64 {
+        let file = BufWriter::with_capacity(buffer_size, File::create(path).unwrap());
+        let mut wtr = csv::WriterBuilder::new()
+            .terminator(csv::Terminator::CRLF)
+            .from_writer(file);
+        for row in rows {
+            wtr.write_record(row).unwrap();
+        }
+        wtr.flush().unwrap();
+        rows.len() as u64
+    }
+
+Examples:
+    >>> import io
+    >>> from reprorusted_std_only.csv.writer_example import write_csv
+    >>> out = io.BytesIO()
+    >>> write_csv(out, [["a", "b"], [1, "x, y"]]).rows
+    2
+    >>> out.getvalue()
+    b'a,b\r\n1,"x, y"\r\n'
+"""
+
+from __future__ import annotations
+
+import csv
+import dataclasses
+import gzip
+import io
+import itertools
+import operator
+import os
+import time
+from array import array
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, BinaryIO
+
+from reprorusted_std_only.csv.columnar_example import DictColumn
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+DEFAULT_BATCH_SIZE = 1024
+DEFAULT_BUFFER_SIZE = 1 << 20
+DEFAULT_COMPRESSLEVEL = 6
+
+
+@dataclasses.dataclass(frozen=True)
+class WriteStats:
+    """Summary of one ``write_csv`` call.
+
+    Attributes:
+        rows: Rows written, including the header.
+        bytes: Encoded CSV bytes, before any compression.
+        seconds: Wall-clock time spent writing.
+    """
+
+    rows: int
+    bytes: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Write throughput in rows per second."""
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+def write_csv(
+    target: str | os.PathLike[str] | BinaryIO,
+    data: Iterable[Sequence[object]] | Mapping[str, Sequence[object]],
+    compress: bool | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    encoding: str = "utf-8",
+) -> WriteStats:
+    r"""Write rows or columns as CSV through a sized write buffer.
+
+    Rows are passed to ``writerows`` ``batch_size`` at a time, into a text
+    buffer that is flushed to ``target`` once it holds ``buffer_size``
+    characters. Rows of string fields that need no quoting are joined
+    directly, which gives the same bytes several times faster. Uses the
+    default CSV dialect, so ``parse_csv`` reads the output back.
+
+    Args:
+        target: Path to create or replace, or a binary file object (left
+            open).
+        data: Iterable of rows, or a mapping of column name to column (a
+            sequence, an ``array`` or a ``DictColumn``). Columns are written
+            with their names as a header row.
+        compress: Gzip the output; ``None`` compresses paths ending in
+            ``.gz`` and leaves file objects uncompressed.
+        batch_size: Rows per ``writerows`` call.
+        buffer_size: Characters buffered before each write to ``target``.
+        encoding: Text encoding of the output.
+
+    Returns:
+        Row and byte counts with the elapsed time; see ``WriteStats``.
+
+    Raises:
+        TypeError: When ``target`` is neither a path nor a binary file.
+        ValueError: When ``batch_size`` or ``buffer_size`` is not positive,
+            or columns differ in length.
+
+    Examples:
+        >>> import gzip, io
+        >>> out = io.BytesIO()
+        >>> stats = write_csv(out, {"n": [1, 2], "s": ["a", "b"]}, compress=True)
+        >>> gzip.decompress(out.getvalue())
+        b'n,s\r\n1,a\r\n2,b\r\n'
+        >>> stats.rows, stats.bytes
+        (3, 15)
+
+        >>> write_csv(io.BytesIO(), []).rows
+        0
+
+        >>> write_csv(io.StringIO(), [])  # doctest: +IGNORE_EXCEPTION_DETAIL
+        Traceback (most recent call last):
+        TypeError: ...
+    """
+    if batch_size < 1 or buffer_size < 1:
+        msg = "batch_size and buffer_size must be positive"
+        raise ValueError(msg)
+    rows = _columns_to_rows(data) if isinstance(data, Mapping) else data
+    if isinstance(target, (str, os.PathLike)):
+        if compress is None:
+            compress = os.fspath(target).endswith(".gz")
+        with open(target, "wb") as stream:
+            return _write(stream, rows, compress, batch_size, buffer_size, encoding)
+    if isinstance(target, io.TextIOBase) or not hasattr(target, "write"):
+        msg = f"expected a path or binary file, got {type(target).__name__}"
+        raise TypeError(msg)
+    return _write(target, rows, bool(compress), batch_size, buffer_size, encoding)
+
+
+def _columns_to_rows(
+    columns: Mapping[str, Sequence[object]],
+) -> Iterable[Sequence[object]]:
+    """Return a header row followed by the rows of equal-length columns."""
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        msg = f"columns differ in length: {sorted(lengths)}"
+        raise ValueError(msg)
+    decoded = [_column_strings(column) for column in columns.values()]
+    if not decoded:
+        return []
+    return itertools.chain([list(columns)], zip(*decoded, strict=True))
+
+
+def _column_strings(column: Sequence[object]) -> Iterable[object]:
+    """Return ``column`` as strings where that matches ``csv.writer`` output."""
+    if isinstance(column, DictColumn):
+        return map(column.values.__getitem__, column.codes)
+    if isinstance(column, array):
+        # str() of an int or float is what the writer would produce
+        return map(str, column)
+    return column
+
+
+def _write(
+    stream: BinaryIO,
+    rows: Iterable[Sequence[object]],
+    compress: bool,
+    batch_size: int,
+    buffer_size: int,
+    encoding: str,
+) -> WriteStats:
+    """Write ``rows`` to ``stream`` in batches and return the stats."""
+    start = time.perf_counter()
+    out: BinaryIO = (
+        gzip.GzipFile(fileobj=stream, mode="wb", compresslevel=DEFAULT_COMPRESSLEVEL)
+        if compress
+        else stream
+    )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    written = 0
+    count = 0
+    rows = iter(rows)
+    try:
+        while batch := list(itertools.islice(rows, batch_size)):
+            _write_batch(batch, buffer, writer)
+            count += len(batch)
+            if buffer.tell() >= buffer_size:
+                written += _flush(buffer, out, encoding)
+                # A fresh buffer is cheaper than truncating the old one
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+        written += _flush(buffer, out, encoding)
+    finally:
+        if compress:
+            out.close()
+    return WriteStats(count, written, time.perf_counter() - start)
+
+
+def _write_batch(
+    batch: list[Sequence[object]], buffer: io.StringIO, writer: csv.Writer
+) -> None:
+    """Write a batch of rows to ``buffer`` exactly as ``writer`` would.
+
+    Rows of string fields with no delimiter, quote or line break are
+    joined directly, several times faster than ``csv.writer``; the others
+    (and any batch with a non-string field, or a row that is not a
+    sequence, such as an iterator) go through ``writer``.
+    """
+    try:
+        # Rows are read twice below, so one without a length (an iterator,
+        # which joining would use up) goes through the writer
+        sizes = list(map(len, batch))
+        lines = list(map(",".join, batch))
+    except TypeError:
+        writer.writerows(batch)
+        return
+    text = "\r\n".join(lines)
+    if (
+        '"' not in text
+        and text.count("\n") == len(lines) - 1
+        and text.count("\r") == len(lines) - 1
+        and all(lines)
+    ):
+        # Only delimiters can need quoting: rows holding more commas than
+        # separators (or no fields at all)
+        commas = map(str.count, lines, itertools.repeat(","))
+        extra = map(operator.ge, commas, sizes)
+        special = list(itertools.compress(range(len(lines)), extra))
+        if special:
+            # Without quotes or line breaks, quoting is just wrapping the
+            # fields that hold a comma
+            for i in special:
+                lines[i] = ",".join([f'"{f}"' if "," in f else f for f in batch[i]])
+            text = "\r\n".join(lines)
+        buffer.write(text)
+        buffer.write("\r\n")
+        return
+    # An empty line is ambiguous: [] and [""] are written apart
+    special = [
+        i
+        for i, (size, line) in enumerate(zip(sizes, lines, strict=True))
+        if not line
+        or line.count(",") >= size
+        or '"' in line
+        or "\n" in line
+        or "\r" in line
+    ]
+    start = 0
+    for i in special:
+        if i > start:
+            buffer.write("\r\n".join(lines[start:i]) + "\r\n")
+        writer.writerow(batch[i])
+        start = i + 1
+    if start < len(lines):
+        buffer.write("\r\n".join(lines[start:]) + "\r\n")
+
+
+def _flush(buffer: io.StringIO, out: BinaryIO, encoding: str) -> int:
+    """Encode the buffered text into ``out`` and return the bytes written."""
+    data = buffer.getvalue().encode(encoding)
+    out.write(data)
+    return len(data)
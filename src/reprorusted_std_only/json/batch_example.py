@@ -0,0 +1,323 @@
+r"""Parallel canonicalization of JSON Lines files.
+
+Demonstrates splitting a JSONL stream into blocks of whole lines, handing
+the blocks to a process pool and writing the results back in input order.
+Each line becomes ``json_roundtrip``'s sorted-key form; lines that do not
+parse are counted and reported rather than stopping the run. At most two
+blocks per worker are in flight, so memory stays bounded however long the
+input is.
+
+Rust equivalent:
+    use rayon::prelude::*;
+    use std::io::{BufRead, Write};
+
+    fn canonicalize<R: BufRead, W: Write>(input: R, mut out: W) -> usize {
+        let lines: Vec<String> = input.lines().map(Result::unwrap).collect();
+        let results: Vec<Option<String>> = lines
+            .par_iter()
+            .map(|line| serde_json::from_str::<serde_json::Value>(line)
+                .ok()
+                .map(|v| v.to_string()))
+            .collect();
+        let mut malformed = 0;
+        for result in results {
+            match result {
+                Some(text) => writeln!(out, "{text}").unwrap(),
+                None => malformed += 1,
+            }
+        }
+        malformed
+    }
+
+Examples:
+    >>> import io
+    >>> from reprorusted_std_only.json.batch_example import canonicalize_jsonl
+    >>> out = io.BytesIO()
+    >>> stats = canonicalize_jsonl(io.BytesIO(b'{"b": 1, "a": 2}\n{oops\n'), out)
+    >>> out.getvalue()
+    b'{"a": 2, "b": 1}\n'
+    >>> stats.malformed_lines
+    (2,)
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import contextlib
+import dataclasses
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+# Malformed line numbers kept for the report; the count is always exact
+MAX_REPORTED = 20
+# json.dumps(..., sort_keys=True) without building an encoder per call
+_ENCODE = json.JSONEncoder(sort_keys=True).encode
+
+
+@dataclasses.dataclass(frozen=True)
+class JsonlStats:
+    """Summary of one ``canonicalize_jsonl`` call.
+
+    Attributes:
+        lines: Input lines read, including blank and malformed ones.
+        written: Canonical lines written.
+        malformed: Lines that are not valid JSON.
+        malformed_lines: 1-based numbers of the first ``MAX_REPORTED``
+            malformed lines.
+        seconds: Wall-clock time spent.
+    """
+
+    lines: int
+    written: int
+    malformed: int
+    malformed_lines: tuple[int, ...]
+    seconds: float
+
+    @property
+    def lines_per_second(self) -> float:
+        """Throughput in input lines per second."""
+        return self.lines / self.seconds if self.seconds > 0 else float("inf")
+
+
+def canonicalize_jsonl(
+    source: str | os.PathLike[str] | BinaryIO,
+    target: str | os.PathLike[str] | BinaryIO,
+    jobs: int = 0,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> JsonlStats:
+    r"""Rewrite every line of a JSONL file in ``json_roundtrip`` form.
+
+    The input is read in blocks of about ``block_size`` bytes, cut after
+    the last newline, and each block is canonicalized in a worker process.
+    Output lines keep the input order. Blank lines are skipped; malformed
+    lines are skipped and counted.
+
+    Args:
+        source: Path of a JSONL file, or a binary file object (left open).
+        target: Path to create or replace, or a binary file object (left
+            open).
+        jobs: Worker processes; ``1`` runs in-process, ``0`` uses all
+            cores.
+        block_size: Bytes of input per block handed to a worker.
+
+    Returns:
+        Line counts, malformed lines and elapsed time; see ``JsonlStats``.
+
+    Raises:
+        TypeError: When ``source`` or ``target`` is neither a path nor a
+            binary file.
+        ValueError: When ``jobs`` is negative, ``block_size`` is not
+            positive, or ``source`` and ``target`` name the same file.
+
+    Examples:
+        >>> import io
+        >>> out = io.BytesIO()
+        >>> data = b'[1, {"y": 0, "x": null}]\n\n"\\u00e9"\n'
+        >>> canonicalize_jsonl(io.BytesIO(data), out, jobs=1).written
+        2
+        >>> out.getvalue()
+        b'[1, {"x": null, "y": 0}]\n"\\u00e9"\n'
+
+        >>> canonicalize_jsonl(io.BytesIO(b""), io.BytesIO()).lines
+        0
+
+        >>> canonicalize_jsonl(io.BytesIO(b""), io.BytesIO(), jobs=-1)
+        Traceback (most recent call last):
+        ValueError: jobs must be non-negative
+    """
+    if jobs < 0:
+        msg = "jobs must be non-negative"
+        raise ValueError(msg)
+    if block_size < 1:
+        msg = "block_size must be positive"
+        raise ValueError(msg)
+    if _same_file(source, target):
+        # Opening the target truncates it before a byte of input is read
+        msg = "source and target are the same file"
+        raise ValueError(msg)
+    with contextlib.ExitStack() as stack:
+        reader = _open(source, "rb", stack)
+        writer = _open(target, "wb", stack)
+        return _run(reader, writer, jobs or os.cpu_count() or 1, block_size)
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    """Parse command-line arguments.
+
+    Args:
+        argv: Arguments, excluding the program name.
+
+    Returns:
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Canonicalize a JSON Lines file with sorted keys."
+    )
+    parser.add_argument("source", help="input JSONL file, or - for stdin")
+    parser.add_argument("target", help="output JSONL file, or - for stdout")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="worker processes (0 = all cores, 1 = in-process)",
+    )
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=DEFAULT_BLOCK_SIZE,
+        help="input bytes per block handed to a worker",
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be >= 0")
+    if args.block_size < 1:
+        parser.error("--block-size must be >= 1")
+    if "-" not in (args.source, args.target) and _same_file(args.source, args.target):
+        parser.error("source and target must be different files")
+    return args
+
+
+def main(argv: Sequence[str] = ()) -> int:
+    """Canonicalize a JSONL file and report malformed lines on stderr."""
+    args = parse_args(argv)
+    source = sys.stdin.buffer if args.source == "-" else args.source
+    target = sys.stdout.buffer if args.target == "-" else args.target
+    stats = canonicalize_jsonl(source, target, args.jobs, args.block_size)
+    print(
+        f"{stats.lines:,} lines, {stats.written:,} written, "
+        f"{stats.malformed:,} malformed ({stats.lines_per_second:,.0f} lines/s)",
+        file=sys.stderr,
+    )
+    if stats.malformed:
+        shown = ", ".join(map(str, stats.malformed_lines))
+        more = ", ..." if stats.malformed > len(stats.malformed_lines) else ""
+        print(f"malformed lines: {shown}{more}", file=sys.stderr)
+    return 0
+
+
+def _open(
+    file: str | os.PathLike[str] | BinaryIO, mode: str, stack: contextlib.ExitStack
+) -> BinaryIO:
+    """Return ``file`` as a binary file, opening paths on ``stack``."""
+    if isinstance(file, (str, os.PathLike)):
+        return stack.enter_context(open(file, mode))
+    attr = "read" if mode == "rb" else "write"
+    if isinstance(file, io.TextIOBase) or not hasattr(file, attr):
+        msg = f"expected a path or binary file, got {type(file).__name__}"
+        raise TypeError(msg)
+    return file
+
+
+def _same_file(
+    source: str | os.PathLike[str] | BinaryIO, target: str | os.PathLike[str] | BinaryIO
+) -> bool:
+    """Return whether ``source`` and ``target`` are paths of one existing file."""
+    paths = (str, os.PathLike)
+    if not isinstance(source, paths) or not isinstance(target, paths):
+        return False
+    # samefile also sees through symlinks and hard links
+    return os.path.exists(target) and os.path.samefile(source, target)
+
+
+def _run(reader: BinaryIO, writer: BinaryIO, jobs: int, block_size: int) -> JsonlStats:
+    """Canonicalize ``reader`` into ``writer`` and return the stats."""
+    start = time.perf_counter()
+    blocks = _iter_blocks(reader, block_size)
+    # Input that fits in one block is not worth starting a pool for
+    head = list(itertools.islice(blocks, 2))
+    blocks = itertools.chain(head, blocks)
+    results = (
+        map(_canonicalize_block, blocks)
+        if jobs == 1 or len(head) < 2
+        else _ordered_map(blocks, jobs)
+    )
+    lines = written = malformed = 0
+    reported: list[int] = []
+    for data, count, bad in results:
+        writer.write(data)
+        # Canonical text escapes line breaks: one newline per written line
+        written += data.count(b"\n")
+        malformed += len(bad)
+        room = MAX_REPORTED - len(reported)
+        reported += [lines + i + 1 for i in bad[:room]]
+        lines += count
+    return JsonlStats(
+        lines, written, malformed, tuple(reported), time.perf_counter() - start
+    )
+
+
+def _iter_blocks(stream: BinaryIO, block_size: int) -> Iterator[bytes]:
+    """Yield the contents of ``stream`` in blocks that end after a newline."""
+    pending: list[bytes] = []
+    while chunk := stream.read(block_size):
+        cut = chunk.rfind(b"\n") + 1
+        if not cut:
+            # A line longer than a block: keep reading until it ends
+            pending.append(chunk)
+            continue
+        pending.append(chunk[:cut])
+        yield b"".join(pending)
+        pending = [chunk[cut:]]
+    tail = b"".join(pending)
+    if tail:
+        yield tail
+
+
+def _ordered_map(
+    blocks: Iterable[bytes], jobs: int
+) -> Iterator[tuple[bytes, int, list[int]]]:
+    """Canonicalize ``blocks`` in a process pool, yielding in input order.
+
+    At most ``2 * jobs`` blocks are in flight at once, so input is only
+    read as fast as output is written.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: collections.deque = collections.deque()
+        for block in blocks:
+            pending.append(executor.submit(_canonicalize_block, block))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _canonicalize_block(block: bytes) -> tuple[bytes, int, list[int]]:
+    """Canonicalize the lines of ``block``.
+
+    Returns the output bytes, the number of input lines and the 0-based
+    indexes of malformed lines within the block.
+    """
+    try:
+        # One decode per block is much cheaper than one per line
+        lines: list[str] | list[bytes] = block.decode().split("\n")
+    except UnicodeDecodeError:
+        # Leave it to json.loads to reject only the undecodable lines
+        lines = block.split(b"\n")
+    if not lines[-1]:
+        lines.pop()
+    out: list[str] = []
+    bad: list[int] = []
+    for i, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            out.append(_ENCODE(json.loads(line)))
+        except (ValueError, RecursionError):
+            bad.append(i)
+    out.append("")
+    return "\n".join(out).encode(), len(lines), bad
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
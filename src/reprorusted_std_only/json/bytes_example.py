@@ -0,0 +1,178 @@
+r"""Canonical JSON from bytes into a reusable output buffer.
+
+Demonstrates a bytes-in, bytes-out variant of ``json_roundtrip`` that
+writes its result into a caller-owned ``bytearray`` or ``memoryview``, so a
+server can keep one output buffer per connection. The stdlib ``json``
+module only parses and writes ``str``, so re-serializing still decodes the
+input, builds the output ``str`` and encodes it before copying it into the
+buffer: it costs the same as the str API plus that copy. The saving comes
+from the optional check for input that is already in canonical form,
+which is copied through without being decoded, parsed into objects or
+re-serialized.
+
+Rust equivalent:
+    fn canonicalize_into(data: &[u8], out: &mut Vec<u8>) -> serde_json::Result<usize> {
+        // serde_json's default map is a BTreeMap, so keys come out sorted
+        let value: serde_json::Value = serde_json::from_slice(data)?;
+        out.clear();
+        serde_json::to_writer(&mut *out, &value)?;
+        Ok(out.len())
+    }
+
+Examples:
+    >>> from reprorusted_std_only.json.bytes_example import canonicalize_into
+    >>> out = bytearray()
+    >>> canonicalize_into(b'{"b": 1, "a": "\xc3\xa9"}', out)
+    23
+    >>> bytes(out)
+    b'{"a": "\\u00e9", "b": 1}'
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import operator
+import re
+
+# json.dumps(..., sort_keys=True) without building an encoder per call
+_ENCODE = json.JSONEncoder(sort_keys=True).encode
+# Escapes json.dumps never writes: "\/", printable ASCII or a control
+# character with a short form as "\uXXXX", or upper-case hex digits
+_NON_CANONICAL_ESCAPE = re.compile(
+    rb"\\(?:/|u(?:00[2-6][0-9a-fA-F]|007[0-9a-eA-E]|000[89acdACD]|[0-9a-f]{0,3}[A-F]))"
+)
+# An integer minus zero, which json.dumps writes as "0"
+_MINUS_ZERO = re.compile(rb"-0(?![.0-9eE])")
+_KEY = operator.itemgetter(0)
+
+
+def is_canonical(data: bytes | bytearray) -> bool:
+    """Return whether ``data`` is exactly ``json_roundtrip`` output.
+
+    Byte-level checks run first and reject most other input without
+    parsing: non-ASCII bytes, whitespace other than after ``,`` and ``:``,
+    and escapes ``json.dumps`` would not write. The rest is parsed once,
+    without building objects, to check that keys are sorted and unique
+    and that floats are in ``repr`` form. Input with escaped quotes is
+    never reported as canonical, since the byte checks cannot see where
+    its strings end.
+
+    Args:
+        data: UTF-8 encoded JSON.
+
+    Returns:
+        ``True`` only for canonical JSON; ``False`` for anything else,
+        including invalid JSON.
+
+    Examples:
+        >>> is_canonical(b'{"a": [1, 2.5, null], "b": "x y"}')
+        True
+
+        >>> is_canonical(b'{"b": 1, "a": 2}'), is_canonical(b'{"a":1}')
+        (False, False)
+
+        >>> is_canonical(b"[1, 2")
+        False
+    """
+    if not data.isascii() or b"\x7f" in data or b'\\"' in data:
+        return False
+    # Without escaped quotes, every other piece lies outside a string; an
+    # empty string stands in for each one, so a space after a string is
+    # not mistaken for the one after a "," or ":" before it
+    skeleton = b'""'.join(data.split(b'"')[::2])
+    commas = skeleton.count(b", ")
+    colons = skeleton.count(b": ")
+    if (
+        skeleton.count(b" ") != commas + colons
+        or skeleton.count(b",") != commas
+        or skeleton.count(b":") != colons
+        or b"\n" in skeleton
+        or b"\t" in skeleton
+        or b"\r" in skeleton
+        or (b"\\" in data and _NON_CANONICAL_ESCAPE.search(data))
+        or (b"-0" in skeleton and _MINUS_ZERO.search(skeleton))
+    ):
+        return False
+    objects: list[list[tuple[str, object]]] = []
+    floats: list[str] = []
+    try:
+        # The hooks collect members and float literals instead of building
+        json.loads(
+            data.decode(), object_pairs_hook=objects.append, parse_float=floats.append
+        )
+    except (ValueError, RecursionError):
+        return False
+    if list(map(repr, map(float, floats))) != floats:
+        return False
+    # Keys must increase within each object; a drop is only allowed where
+    # one object's members end and the next one's begin
+    keys = list(map(_KEY, itertools.chain.from_iterable(objects)))
+    ends = set(itertools.accumulate(map(len, objects), initial=-1))
+    drops = itertools.compress(itertools.count(), map(operator.ge, keys, keys[1:]))
+    return set(drops) <= ends
+
+
+def canonicalize_into(
+    data: bytes | bytearray | memoryview,
+    out: bytearray | memoryview,
+    detect_canonical: bool = False,
+) -> int:
+    r"""Write ``json_roundtrip`` of UTF-8 JSON bytes into ``out``.
+
+    The output is ASCII, so it is also valid UTF-8 and equals
+    ``json_roundtrip(data.decode()).encode()``, which is also how it is
+    computed unless ``detect_canonical`` copies the input through. A
+    ``bytearray`` is resized to the output; a ``memoryview`` is filled
+    from the start and must be large enough.
+
+    Args:
+        data: UTF-8 encoded JSON.
+        out: Reusable output buffer.
+        detect_canonical: Copy input that ``is_canonical`` accepts
+            straight to ``out``. The check costs about as much as the
+            parse, so this pays off for canonical documents made mostly of
+            strings and integers; documents full of floats or small objects
+            are as cheap to re-serialize.
+
+    Returns:
+        Number of bytes written to ``out``.
+
+    Raises:
+        json.JSONDecodeError: When ``data`` is not valid JSON.
+        UnicodeDecodeError: When ``data`` is not valid UTF-8.
+        TypeError: When ``out`` is not a writable byte buffer.
+        ValueError: When a ``memoryview`` is too small for the output.
+
+    Examples:
+        >>> buf = memoryview(bytearray(32))
+        >>> n = canonicalize_into(b'[1, {"b": [], "a": 2.50}]', buf, True)
+        >>> bytes(buf[:n])
+        b'[1, {"a": 2.5, "b": []}]'
+
+        >>> out = bytearray(b"stale contents")
+        >>> canonicalize_into(bytearray(b'"x"'), out), out
+        (3, bytearray(b'"x"'))
+
+        >>> canonicalize_into(b"[1, 2, 3]", memoryview(bytearray(4)))
+        Traceback (most recent call last):
+        ValueError: output buffer too small: need 9 bytes, have 4
+    """
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    if detect_canonical and is_canonical(data):
+        result: bytes | bytearray = data
+    else:
+        result = _ENCODE(json.loads(data.decode())).encode()
+    if isinstance(out, bytearray):
+        out[:] = result
+        return len(out)
+    if not isinstance(out, memoryview) or out.readonly:
+        msg = f"expected a bytearray or writable memoryview, got {type(out).__name__}"
+        raise TypeError(msg)
+    view = out.cast("B")
+    if len(result) > len(view):
+        msg = f"output buffer too small: need {len(result)} bytes, have {len(view)}"
+        raise ValueError(msg)
+    view[: len(result)] = result
+    return len(result)
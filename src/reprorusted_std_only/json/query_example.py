@@ -0,0 +1,392 @@
+r"""Lazy path queries over raw JSON text.
+
+Demonstrates pulling a few values out of a large document without parsing
+all of it. Paths such as ``a.b[3].c`` are walked through the text itself:
+only the objects and arrays on a requested path are stepped through key by
+key, every other value is skipped by matching brackets and strings, and
+only the selected values are decoded. A repeated key replaces its earlier
+occurrences, as with ``json.loads``, so an object on a path is read to its
+end; an array is left as soon as every requested index has been found.
+
+Rust equivalent:
+    use serde_json::value::RawValue;
+    use std::collections::HashMap;
+
+    fn query_version(data: &str) -> serde_json::Result<u64> {
+        // RawValue keeps unrequested members as borrowed, unparsed text
+        let doc: HashMap<&str, &RawValue> = serde_json::from_str(data)?;
+        let meta: HashMap<&str, u64> = serde_json::from_str(doc["meta"].get())?;
+        Ok(meta["version"])
+    }
+
+Examples:
+    >>> from reprorusted_std_only.json.query_example import query_many
+    >>> doc = '{"meta": {"version": 3}, "rows": [[1, 2], [3, 4]], "huge": []}'
+    >>> query_many(doc, ["meta.version", "rows[1][0]", "missing"])
+    {'meta.version': 3, 'rows[1][0]': 3}
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import json
+import re
+from json.decoder import JSONDecodeError, scanstring
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*+")
+_PLAIN = r'[^"\[\]{}]*+'
+_STRING_PATTERN = r'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+_STRING = re.compile(_STRING_PATTERN, re.DOTALL)
+# Extent of a number or literal: everything up to the next delimiter
+_BARE = re.compile(r'[^ \t\n\r,:\[\]{}"]*+')
+# Text and strings up to the next bracket, in one C-level match
+_FLAT = re.compile(rf"{_PLAIN}(?:{_STRING_PATTERN}{_PLAIN})*+", re.DOTALL)
+_SCAN = json.scanner.make_scanner(json.JSONDecoder())  # type: ignore[attr-defined]
+
+# Nesting depth down to which a container is skipped in one regex match
+_SKIP_DEPTH = 8
+
+
+def _rest_pattern(depth: int) -> str:
+    """Return a pattern for the rest of a container nested ``depth`` deep."""
+    inner = ""
+    if depth > 1:
+        inner = rf"|[\[{{]{_rest_pattern(depth - 1)}"
+    # Possessive quantifiers: a failed match gives up at once, no backtracking
+    return rf"{_PLAIN}(?:(?:{_STRING_PATTERN}{inner}){_PLAIN})*+[\]}}]"
+
+
+_REST = re.compile(_rest_pattern(_SKIP_DEPTH), re.DOTALL)
+_VALUE = (
+    rf'(?:{_STRING_PATTERN}|[\[{{]{_rest_pattern(_SKIP_DEPTH)}|[^ \t\n\r,:\[\]{{}}"]++)'
+)
+_SEPARATOR = r"[ \t\n\r]*+,[ \t\n\r]*+"
+
+# Unwanted array items or object members skipped per match in long containers
+_SKIP_RUN = 32
+_ITEMS = re.compile(rf"(?:{_VALUE}{_SEPARATOR}){{{_SKIP_RUN}}}+", re.DOTALL)
+_KEY_STEP = re.compile(r"[^.\[\]]+")
+_INDEX_STEP = re.compile(r"\[(\d+)\]")
+
+
+def parse_path(path: str) -> tuple[str | int, ...]:
+    """Split a query path into object keys and array indexes.
+
+    Keys are separated by ``.`` and indexes are written ``[n]``; a key may
+    hold any character except ``.``, ``[`` and ``]``.
+
+    Args:
+        path: Path such as ``a.b[3].c``.
+
+    Returns:
+        One ``str`` per key and one ``int`` per index, in order.
+
+    Raises:
+        ValueError: When ``path`` is empty or malformed.
+
+    Examples:
+        >>> parse_path("a.b[3].c")
+        ('a', 'b', 3, 'c')
+
+        >>> parse_path("[0][1].x-y")
+        (0, 1, 'x-y')
+
+        >>> parse_path("a..b")
+        Traceback (most recent call last):
+        ValueError: invalid path: 'a..b'
+    """
+    steps: list[str | int] = []
+    pos = 0
+    while True:
+        if path.startswith("[", pos):
+            match = _INDEX_STEP.match(path, pos)
+        elif pos == 0 or path.startswith(".", pos):
+            # Every key but a leading one follows a dot
+            match = _KEY_STEP.match(path, pos + (pos > 0))
+        else:
+            match = None
+        if match is None:
+            msg = f"invalid path: {path!r}"
+            raise ValueError(msg)
+        steps.append(int(match[1]) if match.re is _INDEX_STEP else match[0])
+        pos = match.end()
+        if pos == len(path):
+            return tuple(steps)
+
+
+def query(data: str | bytes, path: str) -> Any:
+    """Return the value at ``path`` in a JSON document.
+
+    Args:
+        data: JSON text, or UTF-8 encoded JSON.
+        path: Path such as ``a.b[3].c``; see ``parse_path``.
+
+    Returns:
+        The decoded value at ``path``.
+
+    Raises:
+        KeyError: When the document has no value at ``path``.
+        ValueError: When ``path`` is malformed.
+        json.JSONDecodeError: When the text scanned on the way is not
+            valid JSON.
+
+    Examples:
+        >>> query('{"a": {"b": [10, 20, {"c": null}]}}', "a.b[2]")
+        {'c': None}
+
+        >>> query(b'[{"id": 7, "tags": ["x"]}]', "[0].tags[0]")
+        'x'
+
+        >>> query('{"a": [1, 2]}', "a[2]")
+        Traceback (most recent call last):
+        KeyError: 'a[2]'
+    """
+    found = query_many(data, [path])
+    if path not in found:
+        raise KeyError(path)
+    return found[path]
+
+
+def query_many(data: str | bytes, paths: Iterable[str]) -> dict[str, Any]:
+    """Return the values at several paths, found in one scan of ``data``.
+
+    Only the containers on the requested paths are stepped through; any
+    other value is skipped by matching brackets and strings and is neither
+    decoded nor validated. If a key occurs twice in an object, the last
+    occurrence is used, as ``json.loads`` does. The text after the last
+    value found is read only to find the end of the objects around it.
+
+    Args:
+        data: JSON text, or UTF-8 encoded JSON.
+        paths: Paths such as ``a.b[3].c``; see ``parse_path``.
+
+    Returns:
+        Each path that exists in the document, in the order given, mapped
+        to its decoded value. Paths that do not exist are left out.
+
+    Raises:
+        ValueError: When a path is malformed.
+        json.JSONDecodeError: When the text scanned on the way is not
+            valid JSON.
+
+    Examples:
+        >>> doc = '{"a": 1, "b": {"c": [true, {"d": "x"}]}, "a": 2}'
+        >>> query_many(doc, ["b.c[1].d", "a", "b.c"])
+        {'b.c[1].d': 'x', 'a': 2, 'b.c': [True, {'d': 'x'}]}
+
+        >>> query_many("[1, 2, 3]", ["[5]", "x"])
+        {}
+
+        >>> query_many('{"a": [1, 2', ["a[1]", "b"])
+        Traceback (most recent call last):
+        json.decoder.JSONDecodeError: Unexpected end of data: line 1 column 12 (char 11)
+    """
+    text = data.decode() if isinstance(data, (bytes, bytearray)) else data
+    paths = list(paths)
+    root = _Node()
+    for path in paths:
+        node = root
+        for step in parse_path(path):
+            children = node.keys if isinstance(step, str) else node.indexes
+            node = children.setdefault(step, _Node())  # type: ignore[arg-type]
+        node.paths.append(path)
+    found: dict[str, Any] = {}
+    if paths:
+        _select(text, 0, root, found, need_end=False)
+    return {path: found[path] for path in paths if path in found}
+
+
+@dataclasses.dataclass
+class _Node:
+    """One step of the requested paths, with the steps below it."""
+
+    keys: dict[str, _Node] = dataclasses.field(default_factory=dict)
+    indexes: dict[int, _Node] = dataclasses.field(default_factory=dict)
+    paths: list[str] = dataclasses.field(default_factory=list)
+
+
+def _select(
+    text: str, pos: int, node: _Node, found: dict[str, Any], need_end: bool
+) -> int:
+    """Record the paths below ``node`` in the value at ``pos``.
+
+    Returns the end of the value, or ``-1`` once every path below ``node``
+    is found if the caller does not need the end.
+    """
+    pos = _WHITESPACE.match(text, pos).end()  # type: ignore[union-attr]
+    if node.paths:
+        # A requested value: decode it, and look up any deeper paths in it
+        try:
+            value, end = _SCAN(text, pos)
+        except StopIteration:
+            raise JSONDecodeError("Expecting value", text, pos) from None
+        _record(value, node, found)
+        return end
+    char = text[pos : pos + 1]
+    if char == "{" and node.keys:
+        return _select_object(text, pos + 1, node, found)
+    if char == "[" and node.indexes:
+        return _select_array(text, pos + 1, node, found, need_end)
+    # Not the kind of container the paths expect: nothing to find here
+    return _skip(text, pos) if need_end or not char else -1
+
+
+def _select_object(text: str, pos: int, node: _Node, found: dict[str, Any]) -> int:
+    """Walk the members of the object whose contents start at ``pos``.
+
+    The object is always read to its end, since a later occurrence of a key
+    replaces everything found under an earlier one.
+    """
+    # What each wanted key's latest occurrence holds, recorded at the end
+    latest: dict[str, dict[str, Any]] = {}
+    members = None
+    skipped = 0  # members skipped one by one since the last run was tried
+    pos = _WHITESPACE.match(text, pos).end()  # type: ignore[union-attr]
+    if text.startswith("}", pos):
+        return pos + 1
+    while True:
+        if skipped >= _SKIP_RUN:
+            # A long object: skip unwanted members a run at a time
+            members = members or _members(frozenset(node.keys))
+            match = members.match(text, pos)
+            skipped = _SKIP_RUN if match else 0
+            if match:
+                pos = match.end()
+                continue
+        if not text.startswith('"', pos):
+            msg = "Expecting property name enclosed in double quotes"
+            raise JSONDecodeError(msg, text, pos)
+        key, pos = scanstring(text, pos + 1)
+        pos = _WHITESPACE.match(text, pos).end()  # type: ignore[union-attr]
+        if not text.startswith(":", pos):
+            raise JSONDecodeError("Expecting ':' delimiter", text, pos)
+        child = node.keys.get(key)
+        if child is None:
+            pos = _skip(text, pos + 1)
+            skipped += 1
+        else:
+            latest[key] = {}
+            pos = _select(text, pos + 1, child, latest[key], need_end=True)
+        pos = _WHITESPACE.match(text, pos).end()  # type: ignore[union-attr]
+        if text.startswith("}", pos):
+            break
+        if not text.startswith(",", pos):
+            raise JSONDecodeError("Expecting ',' delimiter", text, pos)
+        pos = _WHITESPACE.match(text, pos + 1).end()  # type: ignore[union-attr]
+    for values in latest.values():
+        found.update(values)
+    return pos + 1
+
+
+def _select_array(
+    text: str, pos: int, node: _Node, found: dict[str, Any], need_end: bool
+) -> int:
+    """Walk the items of the array whose contents start at ``pos``."""
+    targets = sorted(node.indexes, reverse=True)
+    skipped = _SKIP_RUN  # items skipped one by one since the last run was tried
+    pos = _WHITESPACE.match(text, pos).end()  # type: ignore[union-attr]
+    if text.startswith("]", pos):
+        return pos + 1
+    index = 0
+    while True:
+        if skipped >= _SKIP_RUN and targets[-1] - index >= _SKIP_RUN:
+            match = _ITEMS.match(text, pos)
+            skipped = _SKIP_RUN if match else 0
+            if match:
+                pos = match.end()
+                index += _SKIP_RUN
+                continue
+        if index != targets[-1]:
+            pos = _skip(text, pos)
+            skipped += 1
+        else:
+            done = len(targets) == 1
+            pos = _select(
+                text, pos, node.indexes[targets.pop()], found, need_end or not done
+            )
+            if done:
+                return _skip_rest(text, pos) if need_end else -1
+        pos = _WHITESPACE.match(text, pos).end()  # type: ignore[union-attr]
+        if text.startswith("]", pos):
+            return pos + 1
+        if not text.startswith(",", pos):
+            raise JSONDecodeError("Expecting ',' delimiter", text, pos)
+        pos += 1
+        index += 1
+
+
+def _record(value: Any, node: _Node, found: dict[str, Any]) -> None:
+    """Record ``value`` for the paths ending at ``node`` and below it."""
+    for path in node.paths:
+        found[path] = value
+    if isinstance(value, dict):
+        for key, child in node.keys.items():
+            if key in value:
+                _record(value[key], child, found)
+    elif isinstance(value, list):
+        for index, child in node.indexes.items():
+            if index < len(value):
+                _record(value[index], child, found)
+
+
+@functools.lru_cache(maxsize=256)
+def _members(keys: frozenset[str]) -> re.Pattern[str]:
+    """Return a pattern for a run of object members whose keys are not in ``keys``."""
+    wanted = "|".join(re.escape(json.dumps(key, ensure_ascii=False)) for key in keys)
+    # A key with escapes may decode to a wanted one, so it ends the run too
+    member = (
+        rf'(?!{wanted}|"[^"\\]*+\\){_STRING_PATTERN}'
+        rf"[ \t\n\r]*+:[ \t\n\r]*+{_VALUE}{_SEPARATOR}"
+    )
+    return re.compile(rf"(?:{member}){{{_SKIP_RUN}}}+", re.DOTALL)
+
+
+def _skip(text: str, pos: int) -> int:
+    """Return the end of the value at ``pos`` without decoding it."""
+    pos = _WHITESPACE.match(text, pos).end()  # type: ignore[union-attr]
+    char = text[pos : pos + 1]
+    if char in ("{", "["):
+        return _skip_rest(text, pos + 1)
+    if char == '"':
+        match = _STRING.match(text, pos)
+        if match is None:
+            raise JSONDecodeError("Unterminated string starting at", text, pos)
+        return match.end()
+    end = _BARE.match(text, pos).end()  # type: ignore[union-attr]
+    if end == pos:
+        raise JSONDecodeError("Expecting value", text, pos)
+    return end
+
+
+def _skip_rest(text: str, pos: int) -> int:
+    """Return the end of the container whose remaining contents start at ``pos``."""
+    match = _REST.match(text, pos)
+    if match:
+        return match.end()
+    # Nested deeper than _REST reaches, or malformed: count brackets,
+    # still skipping each shallow enough inner container in one match
+    depth = 1
+    while True:
+        pos = _FLAT.match(text, pos).end()  # type: ignore[union-attr]
+        char = text[pos : pos + 1]
+        if char in ("]", "}"):
+            depth -= 1
+            pos += 1
+            if not depth:
+                return pos
+        elif char in ("[", "{"):
+            match = _REST.match(text, pos + 1)
+            if match:
+                pos = match.end()
+            else:
+                depth += 1
+                pos += 1
+        elif char == '"':
+            raise JSONDecodeError("Unterminated string starting at", text, pos)
+        else:
+            raise JSONDecodeError("Unexpected end of data", text, pos)
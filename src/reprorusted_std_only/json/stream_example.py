@@ -0,0 +1,448 @@
+r"""Incremental JSON parsing and canonicalization in bounded memory.
+
+Demonstrates an event-based JSON parser that reads a binary stream in
+fixed-size chunks and reports ``start_object``/``end_object``,
+``start_array``/``end_array``, ``key`` and ``value`` events, so a document
+far larger than memory can be processed piece by piece. Scalars are
+decoded by the ``json`` module's own scanner, giving exactly the values
+``json.loads`` would.
+
+Rust equivalent:
+    use std::io::Read;
+
+    enum Event { StartObject, EndObject, StartArray, EndArray,
+                 Key(String), Value(serde_json::Value) }
+
+    // Sketch: a byte-level state machine over a BufReader, with each
+    // scalar token handed to serde_json once its end is in the buffer.
+    fn next_event<R: Read>(lexer: &mut Lexer<R>) -> Option<Event> {
+        lexer.skip_whitespace();
+        match lexer.peek()? {
+            b'{' => { lexer.bump(); Some(Event::StartObject) }
+            b'}' => { lexer.bump(); Some(Event::EndObject) }
+            b'[' => { lexer.bump(); Some(Event::StartArray) }
+            b']' => { lexer.bump(); Some(Event::EndArray) }
+            _ => lexer.scalar_or_key(),
+        }
+    }
+
+Examples:
+    >>> import io
+    >>> from reprorusted_std_only.json.stream_example import iter_events
+    >>> for event in iter_events(io.BytesIO(b'{"a": [1, true]}')):
+    ...     print(event)
+    ('start_object', None)
+    ('key', 'a')
+    ('start_array', None)
+    ('value', 1)
+    ('value', True)
+    ('end_array', None)
+    ('end_object', None)
+"""
+
+from __future__ import annotations
+
+import codecs
+import io
+import json
+import json.scanner
+import os
+import re
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+# Output characters collected before ``iter_canonical`` yields them
+DEFAULT_FLUSH_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Extent of a number or literal: everything up to the next delimiter
+_BARE = re.compile(r'[^ \t\n\r,:\[\]{}"]*')
+_SCAN = json.scanner.make_scanner(json.JSONDecoder())
+# json.dumps(..., sort_keys=True) without building an encoder per call
+_ENCODE = json.JSONEncoder(sort_keys=True).encode
+
+# Parser states: what may come next
+_VALUE = 0  # any value
+_VALUE_OR_END = 1  # a value or "]", just after "["
+_KEY = 2  # a key, after "," in an object
+_KEY_OR_END = 3  # a key or "}", just after "{"
+_COLON = 4  # ":" after a key
+_NEXT = 5  # "," or the closing bracket
+_DONE = 6  # only trailing whitespace
+
+# Nesting depth down to which whole containers are scanned in one call
+_SUBTREE_DEPTH = 4
+
+_CLOSE = {"{": "}", "[": "]"}
+_END_EVENT = {"{": "end_object", "[": "end_array"}
+
+
+def iter_events(
+    source: str | os.PathLike[str] | BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[tuple[str, object]]:
+    r"""Parse a UTF-8 JSON document incrementally into events.
+
+    Events are ``(name, value)`` pairs: ``("start_object", None)``,
+    ``("end_object", None)``, ``("start_array", None)``,
+    ``("end_array", None)``, ``("key", str)`` and ``("value", scalar)``.
+    Memory holds one chunk plus the nesting stack; only a single string or
+    number longer than a chunk makes the buffer grow, doubling each time
+    so that parsing it stays linear in its length.
+
+    Args:
+        source: Path of a JSON file, or a binary file object (left open).
+        chunk_size: Bytes read from the file at a time.
+
+    Returns:
+        Iterator over events, in document order.
+
+    Raises:
+        TypeError: When ``source`` is neither a path nor a binary file.
+        ValueError: When ``chunk_size`` is not positive.
+        json.JSONDecodeError: While iterating, on malformed input; ``doc``
+            and ``pos`` refer to the buffered window of the document.
+
+    Examples:
+        >>> import io
+        >>> list(iter_events(io.BytesIO(b'["x", null]'), chunk_size=2))
+        [('start_array', None), ('value', 'x'), ('value', None), ('end_array', None)]
+
+        >>> list(iter_events(io.BytesIO(b" 1.5e3 ")))
+        [('value', 1500.0)]
+
+        >>> list(iter_events(io.BytesIO(b"[1,]")))  # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+        json.decoder.JSONDecodeError: Expecting value: ...
+    """
+    return _open_events(source, chunk_size, subtrees=False)
+
+
+def iter_items(
+    source: str | os.PathLike[str] | BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[object]:
+    r"""Yield the items of a top-level JSON array one at a time.
+
+    Each item is built as ``json.loads`` would build it, but only one item
+    is in memory at once, however long the array is.
+
+    Args:
+        source: Path of a JSON file, or a binary file object (left open).
+        chunk_size: Bytes read from the file at a time.
+
+    Returns:
+        Iterator over the array's items.
+
+    Raises:
+        TypeError: When ``source`` is neither a path nor a binary file.
+        ValueError: While iterating, when the document is not an array.
+        json.JSONDecodeError: While iterating, on malformed input.
+
+    Examples:
+        >>> import io
+        >>> list(iter_items(io.BytesIO(b'[{"a": [1]}, 2, "three"]'), chunk_size=3))
+        [{'a': [1]}, 2, 'three']
+
+        >>> list(iter_items(io.BytesIO(b"[]")))
+        []
+
+        >>> list(iter_items(io.BytesIO(b'{"a": 1}')))
+        Traceback (most recent call last):
+        ValueError: top-level JSON value is not an array
+    """
+    events = _open_events(source, chunk_size, subtrees=True)
+    return _items(events)
+
+
+def iter_canonical(
+    source: str | os.PathLike[str] | BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    flush_size: int = DEFAULT_FLUSH_SIZE,
+) -> Iterator[str]:
+    r"""Stream ``json_roundtrip``'s sorted-key output for a JSON document.
+
+    The pieces joined together equal ``json_roundtrip`` of the whole
+    document, but no object tree is built: arrays are written out as they
+    are parsed, and each object only holds its own serialized members
+    until it closes, since they must be reordered by key. A huge array of
+    records therefore streams in constant memory; a huge single object
+    needs memory for its serialized members.
+
+    Args:
+        source: Path of a JSON file, or a binary file object (left open).
+        chunk_size: Bytes read from the file at a time.
+        flush_size: Output characters collected before each yield.
+
+    Returns:
+        Iterator over pieces of the canonical text.
+
+    Raises:
+        TypeError: When ``source`` is neither a path nor a binary file.
+        ValueError: When ``chunk_size`` or ``flush_size`` is not positive.
+        json.JSONDecodeError: While iterating, on malformed input.
+
+    Examples:
+        >>> import io
+        >>> doc = io.BytesIO(b'[{"b": 1, "a": [true, {}]}, "\\u00e9"]')
+        >>> "".join(iter_canonical(doc))
+        '[{"a": [true, {}], "b": 1}, "\\u00e9"]'
+
+        >>> "".join(iter_canonical(io.BytesIO(b'{"k": 1, "k": 2}')))
+        '{"k": 2}'
+
+        >>> list(iter_canonical(io.BytesIO(b"[1, 2]"), flush_size=1))
+        ['[', '1', ', 2', ']']
+    """
+    if flush_size < 1:
+        msg = "flush_size must be positive"
+        raise ValueError(msg)
+    events = _open_events(source, chunk_size, subtrees=True)
+    return _canonical(events, flush_size)
+
+
+def _iter_path(
+    path: str, chunk_size: int, subtrees: bool = False
+) -> Iterator[tuple[str, object]]:
+    """Yield events from the file at ``path``, closing it when done."""
+    with open(path, "rb", buffering=0) as stream:
+        yield from _events(stream, chunk_size, subtrees)
+
+
+def _open_events(
+    source: str | os.PathLike[str] | BinaryIO, chunk_size: int, subtrees: bool
+) -> Iterator[tuple[str, object]]:
+    """Validate ``source`` and ``chunk_size`` and return its event iterator."""
+    if chunk_size < 1:
+        msg = "chunk_size must be positive"
+        raise ValueError(msg)
+    if isinstance(source, (str, os.PathLike)):
+        return _iter_path(os.fspath(source), chunk_size, subtrees)
+    if isinstance(source, io.TextIOBase) or not hasattr(source, "read"):
+        msg = f"expected a path or binary file, got {type(source).__name__}"
+        raise TypeError(msg)
+    return _events(source, chunk_size, subtrees)
+
+
+def _events(
+    stream: BinaryIO, chunk_size: int, subtrees: bool = False
+) -> Iterator[tuple[str, object]]:
+    """Yield events parsed from ``stream``; see ``iter_events``.
+
+    With ``subtrees``, a nested container that lies wholly in the buffer
+    (at a shallow depth) is decoded in one ``json`` scanner call and reported as
+    a single ``value`` event, which is many times faster than one event
+    per token.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    final = False
+    refill = False
+    stack: list[str] = []
+    state = _VALUE
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()  # type: ignore[union-attr]
+        if refill or pos == len(buf):
+            if final:
+                if state != _DONE:
+                    msg = "Expecting value" if state == _VALUE else "Unterminated JSON"
+                    raise json.JSONDecodeError(msg, buf, pos)
+                return
+            # While a token is incomplete, read as much as is already
+            # buffered, so a long token is rescanned a logarithmic number
+            # of times rather than once per chunk
+            size = max(chunk_size, len(buf) - pos) if refill else chunk_size
+            chunk = stream.read(size)
+            final = not chunk
+            buf = buf[pos:] + decoder.decode(chunk, final=final)
+            pos = 0
+            refill = False
+            continue
+        char = buf[pos]
+        if state == _NEXT:
+            if char == ",":
+                state = _KEY if stack[-1] == "{" else _VALUE
+                pos += 1
+                continue
+            if char != _CLOSE[stack[-1]]:
+                delimiter = "," if stack[-1] == "[" else "',' or '}'"
+                raise json.JSONDecodeError(f"Expecting {delimiter} delimiter", buf, pos)
+        elif state == _COLON:
+            if char != ":":
+                raise json.JSONDecodeError("Expecting ':' delimiter", buf, pos)
+            state = _VALUE
+            pos += 1
+            continue
+        elif state in (_KEY, _KEY_OR_END):
+            if char == '"':
+                try:
+                    key, pos = json.decoder.scanstring(buf, pos + 1)
+                except json.JSONDecodeError:
+                    if not _needs_more(buf, pos, final):
+                        raise
+                    refill = True
+                    continue
+                yield "key", key
+                state = _COLON
+                continue
+            if char != "}" or state == _KEY:
+                msg = "Expecting property name enclosed in double quotes"
+                raise json.JSONDecodeError(msg, buf, pos)
+        elif state == _DONE:
+            raise json.JSONDecodeError("Extra data", buf, pos)
+        elif char in "{[":
+            if subtrees and 0 < len(stack) < _SUBTREE_DEPTH:
+                try:
+                    value, pos = _SCAN(buf, pos)
+                except (StopIteration, ValueError, RecursionError):
+                    # Runs past the buffer, or is malformed: go token by token
+                    pass
+                else:
+                    yield "value", value
+                    state = _NEXT if stack else _DONE
+                    continue
+            stack.append(char)
+            yield ("start_object" if char == "{" else "start_array"), None
+            state = _KEY_OR_END if char == "{" else _VALUE_OR_END
+            pos += 1
+            continue
+        elif char != "]" or state != _VALUE_OR_END:
+            try:
+                value, end = _SCAN(buf, pos)
+            except (StopIteration, json.JSONDecodeError) as exc:
+                if _needs_more(buf, pos, final):
+                    refill = True
+                    continue
+                if isinstance(exc, json.JSONDecodeError):
+                    raise
+                raise json.JSONDecodeError("Expecting value", buf, pos) from None
+            # A number may go on in the next chunk: "1" + "2", "1." + "5"
+            if end >= len(buf) - 2 and char != '"' and _needs_more(buf, pos, final):
+                refill = True
+                continue
+            yield "value", value
+            pos = end
+            state = _NEXT if stack else _DONE
+            continue
+        # A closing bracket that matches the innermost container
+        yield _END_EVENT[stack.pop()], None
+        state = _NEXT if stack else _DONE
+        pos += 1
+
+
+def _needs_more(buf: str, pos: int, final: bool) -> bool:
+    """Return whether the token at ``pos`` may continue past the buffer."""
+    if final:
+        return False
+    if buf[pos] == '"':
+        # The string is complete once a quote follows an even run of
+        # backslashes; str.find keeps this fast on very long strings
+        end = buf.find('"', pos + 1)
+        while end >= 0:
+            start = end
+            while buf[start - 1] == "\\":
+                start -= 1
+            if (end - start) % 2 == 0:
+                return False
+            end = buf.find('"', end + 1)
+        return True
+    return _BARE.match(buf, pos).end() == len(buf)  # type: ignore[union-attr]
+
+
+def _items(events: Iterator[tuple[str, object]]) -> Iterator[object]:
+    """Yield each item of the top-level array described by ``events``."""
+    first = next(events, None)
+    if first is None or first[0] != "start_array":
+        msg = "top-level JSON value is not an array"
+        raise ValueError(msg)
+    # The parser raises before the events can end inside the array
+    while (event := next(events))[0] != "end_array":
+        yield _build(*event, events)
+    # Only whitespace may follow; the parser raises on anything else
+    next(events, None)
+
+
+def _build(event: str, value: object, events: Iterator[tuple[str, object]]) -> object:
+    """Build the value that starts with ``event`` from the following events."""
+    if event == "value":
+        return value
+    root: dict | list = {} if event == "start_object" else []
+    stack: list[dict | list] = [root]
+    key: str | None = None
+    keys: list[str | None] = []
+    # iter_events raises before a container can be left open
+    while stack:
+        event, value = next(events)
+        if event == "key":
+            key = value  # type: ignore[assignment]
+            continue
+        if event in ("end_object", "end_array"):
+            stack.pop()
+            if stack:
+                key = keys.pop()
+            continue
+        item = value if event == "value" else {} if event == "start_object" else []
+        container = stack[-1]
+        if isinstance(container, dict):
+            container[key] = item
+        else:
+            container.append(item)
+        if event != "value":
+            stack.append(item)  # type: ignore[arg-type]
+            keys.append(key)
+    return root
+
+
+def _canonical(events: Iterator[tuple[str, object]], flush_size: int) -> Iterator[str]:
+    """Yield ``json.dumps(..., sort_keys=True)`` output driven by ``events``."""
+    out: list[str] = []
+    pending = 0
+    # Where text goes: the output, or the member of an open object
+    sinks: list[list[str]] = [out]
+    # Per open container: a member dict for objects, an item count for arrays
+    frames: list[dict[str, list[str]] | list[int]] = []
+    for event, value in events:
+        if event == "key":
+            member: list[str] = []
+            frames[-1][value] = member  # type: ignore[index]
+            sinks.append(member)
+            continue
+        sink = sinks[-1]
+        mark = len(out)
+        if event == "end_object":
+            frame = frames.pop()
+            members = ", ".join(
+                f"{json.dumps(k)}: {''.join(v)}"
+                for k, v in sorted(frame.items())  # type: ignore[union-attr]
+            )
+            sink.append(f"{{{members}}}")
+        elif event == "end_array":
+            frames.pop()
+            sink.append("]")
+        else:
+            frame = frames[-1] if frames else None
+            if isinstance(frame, list):
+                if frame[0]:
+                    sink.append(", ")
+                frame[0] += 1
+            if event == "start_object":
+                frames.append({})
+            elif event == "start_array":
+                sink.append("[")
+                frames.append([0])
+            else:
+                sink.append(_ENCODE(value))
+        # A value is complete: close the object member it belonged to
+        complete = event == "value" or event.startswith("end_")
+        if complete and frames and isinstance(frames[-1], dict):
+            sinks.pop()
+        if sink is out:
+            pending += sum(map(len, out[mark:]))
+            if pending >= flush_size:
+                yield "".join(out)
+                out.clear()
+                pending = 0
+    if out:
+        yield "".join(out)
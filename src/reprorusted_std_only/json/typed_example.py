@@ -0,0 +1,337 @@
+r"""Schema-compiled JSON decoding into dataclasses.
+
+Demonstrates turning a dataclass's fields into a decoder once, ahead of
+any data: field types are resolved, a converter is chosen for each one and
+the result is cached per class. Arrays of records whose fields are all
+plain scalars get a bulk path: each field's types are checked across the
+whole array in one C-level pass, then the instances are filled without
+going through ``__init__``.
+
+Rust equivalent:
+    use serde::Deserialize;
+
+    #[derive(Deserialize)]
+    struct Point {
+        x: f64,
+        y: f64,
+    }
+
+    fn decode_points(data: &str) -> serde_json::Result<Vec<Point>> {
+        // serde derives the per-field decoder at compile time
+        serde_json::from_str(data)
+    }
+
+Examples:
+    >>> from reprorusted_std_only.dataclasses.basic_example import Point
+    >>> from reprorusted_std_only.json.typed_example import decode_json_list
+    >>> decode_json_list(Point, '[{"x": 1.5, "y": 2}, {"y": 0.0, "x": -1.0}]')
+    [Point(x=1.5, y=2.0), Point(x=-1.0, y=0.0)]
+"""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import functools
+import itertools
+import json
+import operator
+import types
+import typing
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+T = TypeVar("T")
+
+# Field types whose JSON values need no conversion beyond a type check
+_SCALARS = (int, float, str, bool)
+
+
+def compile_decoder(cls: type[T]) -> Callable[[object], T]:
+    """Return a cached converter from a decoded JSON object to ``cls``.
+
+    Each field's type is resolved once. Fields may be ``int``, ``float``,
+    ``str``, ``bool``, ``None``, ``Any``, other dataclasses, ``list[X]``,
+    ``dict[str, X]`` or ``X | None``. JSON integers are accepted for
+    ``float`` fields; missing fields take their defaults and unknown keys
+    are ignored.
+
+    Args:
+        cls: A dataclass type.
+
+    Returns:
+        Function that converts one ``json.loads`` value into a ``cls``.
+
+    Raises:
+        TypeError: When ``cls`` is not a dataclass or has a field type the
+            decoder does not support.
+
+    Examples:
+        >>> from reprorusted_std_only.dataclasses.basic_example import Point
+        >>> decode = compile_decoder(Point)
+        >>> decode({"x": 3, "y": 4.0}).distance(decode({"x": 0, "y": 0}))
+        5.0
+
+        >>> compile_decoder(Point) is decode
+        True
+
+        >>> decode({"x": "3", "y": 4.0})
+        Traceback (most recent call last):
+        ValueError: Point.x: expected float, got str
+    """
+    if not (isinstance(cls, type) and dataclasses.is_dataclass(cls)):
+        msg = f"expected a dataclass type, got {cls!r}"
+        raise TypeError(msg)
+    return _compile(cls)
+
+
+def decode_json(cls: type[T], data: str | bytes) -> T:
+    """Decode a JSON object into an instance of ``cls``.
+
+    Args:
+        cls: A dataclass type.
+        data: JSON text holding one object.
+
+    Returns:
+        The decoded instance.
+
+    Raises:
+        json.JSONDecodeError: When ``data`` is not valid JSON.
+        TypeError: When ``cls`` is not a supported dataclass.
+        ValueError: When the JSON does not match the fields of ``cls``.
+
+    Examples:
+        >>> from reprorusted_std_only.dataclasses.basic_example import Point
+        >>> decode_json(Point, b'{"x": 0.5, "y": 1.0, "label": "ignored"}')
+        Point(x=0.5, y=1.0)
+
+        >>> decode_json(Point, '{"x": 0.5}')
+        Traceback (most recent call last):
+        ValueError: Point: missing field 'y'
+
+        >>> decode_json(Point, "[]")
+        Traceback (most recent call last):
+        ValueError: Point: expected a JSON object, got list
+    """
+    return compile_decoder(cls)(json.loads(data))
+
+
+def decode_json_list(cls: type[T], data: str | bytes) -> list[T]:
+    """Decode a JSON array of objects into a list of ``cls`` instances.
+
+    When the class has only scalar fields, the whole array is checked
+    field by field in bulk and, if every record has exactly the fields
+    with exactly their types, the instances are filled without calling
+    ``__init__``. Classes with slots, a ``__post_init__`` or an
+    ``__init__`` of their own always go through the constructor, as does
+    anything else that is converted record by record.
+
+    Args:
+        cls: A dataclass type.
+        data: JSON text holding an array of objects.
+
+    Returns:
+        One instance per array item, in order.
+
+    Raises:
+        json.JSONDecodeError: When ``data`` is not valid JSON.
+        TypeError: When ``cls`` is not a supported dataclass.
+        ValueError: When ``data`` is not an array or an item does not
+            match the fields of ``cls``.
+
+    Examples:
+        >>> from reprorusted_std_only.dataclasses.basic_example import Point
+        >>> decode_json_list(Point, "[]")
+        []
+
+        >>> decode_json_list(Point, '[{"x": 1, "y": 1}, {"x": 1, "y": null}]')
+        Traceback (most recent call last):
+        ValueError: item 1: Point.y: expected float, got NoneType
+
+        >>> decode_json_list(Point, '{"x": 1, "y": 1}')
+        Traceback (most recent call last):
+        ValueError: expected a JSON array, got dict
+    """
+    compile_decoder(cls)
+    items = json.loads(data)
+    if not isinstance(items, list):
+        msg = f"expected a JSON array, got {type(items).__name__}"
+        raise ValueError(msg)
+    return _compile_list(cls)(items)
+
+
+@functools.cache
+def _compile(cls: type[T]) -> Callable[[object], T]:
+    """Build the converter for ``cls``; cached, so each class compiles once."""
+    name = cls.__name__
+    hints = typing.get_type_hints(cls)
+    fields = [f for f in dataclasses.fields(cls) if f.init]
+    converters = [_converter(hints[f.name], f"{name}.{f.name}") for f in fields]
+    required = {f.name for f in fields if _is_required(f)}
+
+    def decode(obj: object) -> T:
+        if not isinstance(obj, dict):
+            msg = f"{name}: expected a JSON object, got {type(obj).__name__}"
+            raise ValueError(msg)
+        kwargs = {}
+        for field, convert in zip(fields, converters, strict=True):
+            if field.name in obj:
+                kwargs[field.name] = convert(obj[field.name])
+            elif field.name in required:
+                msg = f"{name}: missing field {field.name!r}"
+                raise ValueError(msg)
+        return cls(**kwargs)
+
+    return decode
+
+
+@functools.cache
+def _compile_list(cls: type[T]) -> Callable[[list[Any]], list[T]]:
+    """Build the list converter for ``cls``; cached like ``_compile``."""
+    decode = _compile(cls)
+    fields = dataclasses.fields(cls)  # type: ignore[arg-type]
+    hints = typing.get_type_hints(cls)
+
+    def decode_each(items: list[Any]) -> list[T]:
+        decoded: list[T] = []
+        try:
+            decoded.extend(map(decode, items))
+        except ValueError as exc:
+            # extend keeps what it appended, so the failing item is the next
+            msg = f"item {len(decoded)}: {exc}"
+            raise ValueError(msg) from None
+        return decoded
+
+    if not _can_fill(cls, fields, hints):
+        return decode_each
+    count = len(fields)
+    checks = [(operator.itemgetter(f.name), {hints[f.name]}) for f in fields]
+    new = object.__new__
+    setattr_ = object.__setattr__
+
+    def decode_all(items: list[Any]) -> list[T]:
+        # Every check is one C-level pass over the whole list, with no
+        # Python call per item; any mismatch falls back to the item path
+        try:
+            filled = (
+                {*map(type, items)} == {dict}
+                and {*map(len, items)} == {count}
+                and all({*map(type, map(get, items))} == exact for get, exact in checks)
+            )
+        except KeyError:
+            filled = False
+        if not filled:
+            return decode_each(items)
+        # Exactly the fields, with exactly their types: what __init__
+        # would store. The dicts were just parsed and nothing else refers
+        # to them, so each instance takes its dict over as is
+        instances = list(map(new, itertools.repeat(cls, len(items))))
+        collections.deque(
+            map(setattr_, instances, itertools.repeat("__dict__"), items), maxlen=0
+        )
+        return instances
+
+    return decode_all
+
+
+def _is_required(field: dataclasses.Field[Any]) -> bool:
+    """Return whether ``field`` has neither a default nor a factory."""
+    return (
+        field.default is dataclasses.MISSING
+        and field.default_factory is dataclasses.MISSING
+    )
+
+
+def _can_fill(
+    cls: type, fields: tuple[dataclasses.Field[Any], ...], hints: dict[str, Any]
+) -> bool:
+    """Return whether ``cls`` instances can be filled without ``__init__``.
+
+    That needs an ``__init__`` that only stores its arguments, which is
+    the one ``dataclasses`` generates for ``cls`` when there is no
+    ``__post_init__``, and instances whose fields live in their
+    ``__dict__``, which slots anywhere in the MRO would shadow.
+    """
+    # dataclasses compiles the methods it generates from source strings
+    init = getattr(cls.__dict__.get("__init__"), "__code__", None)
+    return (
+        bool(fields)
+        and init is not None
+        and init.co_filename == "<string>"
+        and not any(klass.__dict__.get("__slots__") for klass in cls.__mro__)
+        and not hasattr(cls, "__post_init__")
+        and all(f.init and hints[f.name] in _SCALARS for f in fields)
+    )
+
+
+def _converter(tp: object, where: str) -> Callable[[object], object]:
+    """Return a function that checks and converts one JSON value to ``tp``."""
+    if tp is Any or tp is object:
+        return _identity
+    if tp is float:
+        return functools.partial(_to_float, where=where)
+    if tp in _SCALARS or tp is type(None):
+        return functools.partial(_check, tp=tp, where=where)
+    if isinstance(tp, type) and dataclasses.is_dataclass(tp):
+        # Resolved on first use, so a dataclass may refer to itself
+        return lambda value: _compile(tp)(value)
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+    if origin is list:
+        item = _converter(args[0], f"{where}[]")
+        return functools.partial(_to_list, item=item, where=where)
+    if origin is dict and args[0] is str:
+        item = _converter(args[1], f"{where}[]")
+        return functools.partial(_to_dict, item=item, where=where)
+    if origin in (typing.Union, types.UnionType) and type(None) in args:
+        rest = [a for a in args if a is not type(None)]
+        if len(rest) == 1:
+            inner = _converter(rest[0], where)
+            return lambda value: None if value is None else inner(value)
+    msg = f"unsupported field type {tp!r} for {where}"
+    raise TypeError(msg)
+
+
+def _identity(value: object) -> object:
+    """Return ``value`` unchanged."""
+    return value
+
+
+def _check(value: object, tp: type, where: str) -> object:
+    """Return ``value`` if it has exactly type ``tp`` (``bool`` is not ``int``)."""
+    if type(value) is not tp:
+        msg = f"{where}: expected {tp.__name__}, got {type(value).__name__}"
+        raise ValueError(msg)
+    return value
+
+
+def _to_float(value: Any, where: str) -> float:
+    """Return ``value`` as a float, accepting JSON integers."""
+    if type(value) is float:
+        return value
+    if type(value) is int:
+        return float(value)
+    msg = f"{where}: expected float, got {type(value).__name__}"
+    raise ValueError(msg)
+
+
+def _to_list(
+    value: object, item: Callable[[object], object], where: str
+) -> list[object]:
+    """Convert a JSON array item by item."""
+    if not isinstance(value, list):
+        msg = f"{where}: expected list, got {type(value).__name__}"
+        raise ValueError(msg)
+    return list(map(item, value))
+
+
+def _to_dict(
+    value: object, item: Callable[[object], object], where: str
+) -> dict[str, object]:
+    """Convert the values of a JSON object."""
+    if not isinstance(value, dict):
+        msg = f"{where}: expected dict, got {type(value).__name__}"
+        raise ValueError(msg)
+    return dict(zip(value, map(item, value.values()), strict=True))
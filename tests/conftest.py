@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import sys
+from pathlib import Path
 
 import pytest
 
-if TYPE_CHECKING:
-    from pathlib import Path
+# scripts/ and benchmarks/ are not packages; let their modules import their
+# shared helpers (e.g. parse_cache) the same way they do when run directly
+for _tool_dir in ("scripts", "benchmarks"):
+    sys.path.insert(0, str(Path(__file__).parent.parent / _tool_dir))
 
 
 @pytest.fixture
@@ -0,0 +1,358 @@
+"""Tests for the benchmarks/ suite."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+# Load the benchmark modules directly since benchmarks/ is not a package
+_BENCH_DIR = Path(__file__).parent.parent.parent / "benchmarks"
+
+
+def _load(name: str) -> types.ModuleType:
+    spec = importlib.util.spec_from_file_location(name, _BENCH_DIR / f"{name}.py")
+    assert spec is not None and spec.loader is not None
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+harness = _load("harness")
+cases = _load("cases")
+bench = _load("bench")
+extract_scaling = _load("extract_scaling")
+csv_roundtrip = _load("csv_roundtrip")
+json_bytes = _load("json_bytes")
+dataclass_decode = _load("dataclass_decode")
+json_query = _load("json_query")
+
+Measurement = harness.Measurement
+
+
+class TestWelchTTest:
+    """Test suite for welch_t_test."""
+
+    def test_known_p_value(self) -> None:
+        """p-value matches a reference implementation."""
+        t, p = harness.welch_t_test([1.0, 2.0, 3.0, 4.0, 5.0], [2, 3, 4, 5, 6.5])
+        assert t == pytest.approx(1.04407, rel=1e-4)
+        assert p == pytest.approx(0.32726, rel=1e-4)
+
+    def test_identical_constant_samples(self) -> None:
+        """Zero variance and equal means is not significant."""
+        assert harness.welch_t_test([1.0, 1.0], [1.0, 1.0]) == (0.0, 1.0)
+
+    def test_different_constant_samples(self) -> None:
+        """Zero variance and different means is maximally significant."""
+        t, p = harness.welch_t_test([1.0, 1.0], [2.0, 2.0])
+        assert t > 0
+        assert p == 0.0
+
+    def test_large_t_small_p(self) -> None:
+        """Clearly separated samples give a tiny p-value."""
+        _, p = harness.welch_t_test([10, 11, 10, 11, 10], [20, 21, 20, 21, 20])
+        assert p < 1e-6
+
+
+class TestMeasure:
+    """Test suite for calibrate and measure."""
+
+    def test_calibrate_reaches_min_time(self) -> None:
+        """Calibration doubles the call count until the loop is long enough."""
+        number = harness.calibrate(lambda: sum(range(100)), 1_000_000)
+        assert number >= 1
+        assert number & (number - 1) == 0
+
+    def test_measure_records_samples(self) -> None:
+        """One per-call sample is recorded per repeat."""
+        m = harness.measure("noop", 1, lambda: None, min_time_ns=10_000, repeat=3)
+        assert m.key == "noop[1]"
+        assert len(m.samples_ns) == 3
+        assert m.median_ns > 0
+
+
+class TestResults:
+    """Test suite for result storage and comparison."""
+
+    def test_fingerprint_is_stable(self) -> None:
+        """The machine id does not change between calls."""
+        assert harness.machine_fingerprint() == harness.machine_fingerprint()
+
+    def test_fingerprint_ignores_host(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Hostname and kernel release are recorded but do not change the id."""
+        before = harness.machine_fingerprint()
+        monkeypatch.setattr(harness.platform, "node", lambda: "ci-runner-42")
+        monkeypatch.setattr(harness.platform, "release", lambda: "9.9.9-other")
+        after = harness.machine_fingerprint()
+        assert after["id"] == before["id"]
+        assert after["node"] == "ci-runner-42"
+        monkeypatch.setattr(harness.os, "cpu_count", lambda: 1024)
+        assert harness.machine_fingerprint()["id"] != before["id"]
+
+    def test_save_load_roundtrip(self, tmp_path: Path) -> None:
+        """Saved measurements load back unchanged."""
+        path = tmp_path / "out" / "results.json"
+        ms = [Measurement("a", 1, 4, [1.0, 2.0]), Measurement("a", 2, 2, [3.0, 4.0])]
+        harness.save_results(path, ms)
+        machine, loaded = harness.load_results(path)
+        assert loaded == ms
+        assert machine["id"] == harness.machine_fingerprint()["id"]
+
+    def test_load_rejects_unknown_version(self, tmp_path: Path) -> None:
+        """Results with another layout version are refused."""
+        path = tmp_path / "results.json"
+        path.write_text(json.dumps({"version": 999}))
+        with pytest.raises(ValueError, match="unsupported"):
+            harness.load_results(path)
+
+    def test_compare_flags_regression(self) -> None:
+        """A large, significant slowdown is a regression."""
+        base = [Measurement("f", 1, 1, [100.0, 101.0, 99.0, 100.0, 100.5])]
+        new = [Measurement("f", 1, 1, [150.0, 151.0, 149.0, 150.0, 150.5])]
+        (result,) = harness.compare(base, new)
+        assert result.regression
+        assert result.change == pytest.approx(0.5, rel=0.01)
+
+    def test_compare_ignores_small_or_noisy_changes(self) -> None:
+        """Speedups, tiny slowdowns and noise are not regressions."""
+        base = [
+            Measurement("fast", 1, 1, [100.0, 101.0, 99.0]),
+            Measurement("tiny", 1, 1, [100.0, 100.1, 99.9]),
+            Measurement("noisy", 1, 1, [100.0, 50.0, 150.0]),
+        ]
+        new = [
+            Measurement("fast", 1, 1, [50.0, 51.0, 49.0]),
+            Measurement("tiny", 1, 1, [102.0, 102.1, 101.9]),
+            Measurement("noisy", 1, 1, [130.0, 60.0, 200.0]),
+            Measurement("added", 1, 1, [1.0, 1.0]),
+        ]
+        results = harness.compare(base, new)
+        assert [r.key for r in results] == ["fast[1]", "tiny[1]", "noisy[1]"]
+        assert not any(r.regression for r in results)
+
+    def test_format_ns_units(self) -> None:
+        """Durations pick a readable unit."""
+        assert harness.format_ns(812) == "812 ns"
+        assert harness.format_ns(12_300) == "12.3 us"
+        assert harness.format_ns(4_560_000) == "4.56 ms"
+        assert harness.format_ns(2e9) == "2 s"
+
+
+class TestCases:
+    """Test suite for the benchmark case registry."""
+
+    def test_one_case_per_example_function(self) -> None:
+        """Case names are unique and cover the requested examples."""
+        names = [c.name for c in cases.CASES]
+        assert len(names) == len(set(names))
+        for required in (
+            "sha256_hex",
+            "parse_csv",
+            "json_roundtrip",
+            "count_words",
+            "threaded_sum",
+        ):
+            assert required in names
+
+    def test_every_case_runs_at_smallest_size(self) -> None:
+        """Each case builds and runs a callable for its smallest size."""
+        for case in cases.CASES:
+            assert len(case.sizes) >= 2
+            case.make(min(case.sizes))()
+
+
+class TestBenchCli:
+    """Test suite for the bench.py command line."""
+
+    def test_run_and_compare(self, tmp_path: Path) -> None:
+        """A run compared with itself reports no regression."""
+        out = tmp_path / "latest.json"
+        args = ["run", "--filter", "absolute_value", "--min-time-ms", "1"]
+        assert bench.main([*args, "--repeat", "2", "--output", str(out)]) == 0
+        assert bench.main(["compare", str(out), "--baseline", str(out)]) == 0
+
+    def test_compare_reports_regression(self, tmp_path: Path) -> None:
+        """Compare exits non-zero on a significant slowdown."""
+        base, new = tmp_path / "base.json", tmp_path / "new.json"
+        harness.save_results(base, [Measurement("f", 1, 1, [100.0, 101.0, 99.0])])
+        harness.save_results(new, [Measurement("f", 1, 1, [200.0, 201.0, 199.0])])
+        assert bench.main(["compare", str(new), "--baseline", str(base)]) == 1
+
+    def test_save_baseline(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """--save-baseline stores results under the machine id."""
+        monkeypatch.setattr(bench, "BASELINE_DIR", tmp_path / "baselines")
+        out = tmp_path / "latest.json"
+        args = ["run", "--filter", "first_or_default", "--min-time-ms", "1"]
+        assert bench.main([*args, "--output", str(out), "--save-baseline"]) == 0
+        assert bench.main(["compare", str(out)]) == 0
+        machine_id = harness.machine_fingerprint()["id"]
+        assert (tmp_path / "baselines" / f"{machine_id}.json").exists()
+
+    def test_compare_without_baseline(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A missing stored baseline is reported as an error."""
+        monkeypatch.setattr(bench, "BASELINE_DIR", tmp_path / "none")
+        out = tmp_path / "latest.json"
+        harness.save_results(out, [Measurement("f", 1, 1, [1.0, 1.0])])
+        assert bench.main(["compare", str(out)]) == 1
+
+    def test_unknown_filter(self) -> None:
+        """Filtering out every case is an error."""
+        assert bench.main(["run", "--filter", "no_such_case"]) == 1
+
+    def test_repeat_must_allow_variance(self) -> None:
+        """A single repeat cannot feed the t-test."""
+        with pytest.raises(SystemExit):
+            bench.main(["run", "--repeat", "1"])
+
+
+class TestExtractScaling:
+    """Test suite for extract_scaling.py."""
+
+    def test_synthetic_module_size(self) -> None:
+        """The synthetic module defines whole blocks of functions."""
+        source = extract_scaling.synthetic_module(12)
+        assert len(extract_scaling.extract_functions(source)) == 15
+
+    def test_small_run_passes(self) -> None:
+        """A quick run at small sizes stays under a loose growth limit."""
+        args = ["--sizes", "5", "50", "--min-time-ms", "1", "--repeat", "2"]
+        assert extract_scaling.main([*args, "--max-growth", "100"]) == 0
+
+    def test_growth_limit_enforced(self) -> None:
+        """An impossible growth limit fails the check."""
+        args = ["--sizes", "5", "50", "--min-time-ms", "1", "--repeat", "2"]
+        assert extract_scaling.main([*args, "--max-growth", "0"]) == 1
+
+    def test_sizes_must_be_positive(self) -> None:
+        """A zero size is rejected."""
+        with pytest.raises(SystemExit):
+            extract_scaling.main(["--sizes", "0"])
+
+
+class TestCsvRoundtrip:
+    """Test suite for csv_roundtrip.py."""
+
+    def test_synthetic_rows(self) -> None:
+        """A header plus the requested rows, some needing quotes."""
+        rows = csv_roundtrip.synthetic_rows(14)
+        assert len(rows) == 15
+        assert sum("," in row[3] for row in rows) == 2
+
+    def test_small_run_passes(self) -> None:
+        """A quick run passes without a throughput requirement."""
+        args = ["--sizes", "10", "100", "--min-time-ms", "1", "--repeat", "2"]
+        assert csv_roundtrip.main([*args, "--min-ratio", "0"]) == 0
+
+    def test_ratio_enforced(self) -> None:
+        """An impossible throughput ratio fails the check."""
+        args = ["--sizes", "10", "--min-time-ms", "1", "--repeat", "2"]
+        assert csv_roundtrip.main([*args, "--min-ratio", "1000"]) == 1
+
+    def test_lossy_round_trip_fails(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A writer that changes the data fails before timing."""
+        monkeypatch.setattr(csv_roundtrip, "parse_csv", lambda text: [])
+        assert csv_roundtrip.main(["--sizes", "5"]) == 1
+
+    def test_sizes_must_be_positive(self) -> None:
+        """A zero size is rejected."""
+        with pytest.raises(SystemExit):
+            csv_roundtrip.main(["--sizes", "0"])
+
+
+class TestJsonBytes:
+    """Test suite for json_bytes.py."""
+
+    def test_synthetic_payload(self) -> None:
+        """Records with shuffled keys and non-ASCII text."""
+        data = json_bytes.synthetic_payload(10)
+        records = json.loads(data)
+        assert len(records) == 10
+        assert "Zürich".encode() in data
+        assert any(list(r) != sorted(r) for r in records)
+
+    def test_small_run_passes(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """A quick run checks the outputs and prints one row per payload."""
+        args = ["--sizes", "1", "20", "--min-time-ms", "1", "--repeat", "2"]
+        assert json_bytes.main(args) == 0
+        assert capsys.readouterr().out.count("canonical ") == 2
+
+    def test_mismatch_fails(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """An output that differs from json_roundtrip fails before timing."""
+        monkeypatch.setattr(json_bytes, "json_roundtrip", lambda text: "[]")
+        assert json_bytes.main(["--sizes", "3"]) == 1
+
+    def test_sizes_must_be_positive(self) -> None:
+        """A zero size is rejected."""
+        with pytest.raises(SystemExit):
+            json_bytes.main(["--sizes", "0"])
+
+
+class TestDataclassDecode:
+    """Test suite for dataclass_decode.py."""
+
+    def test_synthetic_points(self) -> None:
+        """Point-shaped objects with float coordinates."""
+        points = json.loads(dataclass_decode.synthetic_points(5))
+        assert len(points) == 5
+        assert all(list(p) == ["x", "y"] for p in points)
+
+    def test_small_run_passes(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """A quick run checks the decoders agree and prints one row per size."""
+        args = ["--sizes", "1", "20", "--min-time-ms", "1", "--repeat", "2"]
+        assert dataclass_decode.main(args) == 0
+        out = capsys.readouterr().out
+        assert out.count("x)") == 2
+        assert "OK:" in out
+
+    def test_mismatch_fails(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Decoders that disagree fail before timing."""
+        monkeypatch.setattr(dataclass_decode, "decode_json_list", lambda cls, t: [])
+        assert dataclass_decode.main(["--sizes", "3"]) == 1
+
+    def test_sizes_must_be_positive(self) -> None:
+        """A zero size is rejected."""
+        with pytest.raises(SystemExit):
+            dataclass_decode.main(["--sizes", "0"])
+
+
+class TestJsonQuery:
+    """Test suite for json_query.py."""
+
+    def test_paths_exist(self) -> None:
+        """Head and tail paths all resolve in the synthetic document."""
+        text = json_query.synthetic_document(5)
+        head, tail = json_query.paths_for(5)
+        assert json_query.full_parse(text, head + tail) == {
+            "meta.version": 3,
+            "records[0].name": json.loads(text)["records"][0]["name"],
+            "records[4].address.city": "Oslo",
+            "trailer.count": 5,
+        }
+
+    def test_small_run_passes(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """A quick run checks the queried values and prints one row per size."""
+        args = ["--sizes", "1", "20", "--min-time-ms", "1", "--repeat", "2"]
+        assert json_query.main(args) == 0
+        out = capsys.readouterr().out
+        assert out.count("x)") == 4
+        assert "OK:" in out
+
+    def test_mismatch_fails(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A query that disagrees with the full parse fails before timing."""
+        monkeypatch.setattr(json_query, "query_many", lambda text, paths: {})
+        assert json_query.main(["--sizes", "3"]) == 1
+
+    def test_sizes_must_be_positive(self) -> None:
+        """A zero size is rejected."""
+        with pytest.raises(SystemExit):
+            json_query.main(["--sizes", "0"])
@@ -1,10 +1,36 @@
-"""Tests for collections.counter_example module."""
+"""Tests for the collections example modules."""
 
 from __future__ import annotations
 
+import collections
+import io
+import itertools
+import random
+import sys
+from array import array
+from typing import TYPE_CHECKING
+
 import pytest
 
 from reprorusted_std_only.collections.counter_example import count_words
+from reprorusted_std_only.collections.ngram_example import NgramCounter
+from reprorusted_std_only.collections.sketch_example import MAX_COUNT, CountMinSketch
+from reprorusted_std_only.collections.topk_example import TopKCounter
+from reprorusted_std_only.collections.vocabulary_example import Vocabulary
+from reprorusted_std_only.collections.wordcount_example import (
+    count_words_in_files,
+    count_words_stream,
+    merge_counters,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Multi-byte characters, Unicode and control whitespace, and runs of spaces
+_TEXT = "  zoë\tnaïve  café\n\nzoë x\u3000y\x85z\x1cq 日本語 café  a"
+# Word i appears about 2000 / (i + 1) times, in a fixed shuffled order
+_ZIPF = [f"w{i}" for i in range(300) for _ in range(2000 // (i + 1))]
+random.Random(0).shuffle(_ZIPF)
 
 
 class TestCountWords:
@@ -45,3 +71,459 @@ class TestCountWords:
     def test_whitespace_only(self) -> None:
         """Whitespace-only string returns empty dict."""
         assert count_words("   ") == {}
+
+
+class TestCountWordsStream:
+    """Test suite for count_words_stream."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 64])
+    def test_matches_split(self, chunk_size: int) -> None:
+        """Words and characters cut at any chunk boundary are rejoined."""
+        data = io.BytesIO(_TEXT.encode())
+        counts = count_words_stream(data, chunk_size)
+        assert counts == collections.Counter(_TEXT.split())
+
+    def test_other_encoding(self) -> None:
+        """Text in another encoding is decoded before splitting."""
+        data = io.BytesIO("été été".encode("latin-1"))
+        assert count_words_stream(data, 1, "latin-1") == {"été": 2}
+
+    @pytest.mark.parametrize("data", [b"ok \xff", "ok é".encode()[:-1]])
+    def test_invalid_bytes(self, data: bytes) -> None:
+        """Invalid or truncated characters raise UnicodeDecodeError."""
+        with pytest.raises(UnicodeDecodeError):
+            count_words_stream(io.BytesIO(data), 2)
+
+    def test_chunk_size_must_be_positive(self) -> None:
+        """A zero chunk size is rejected."""
+        with pytest.raises(ValueError, match="chunk_size must be positive"):
+            count_words_stream(io.BytesIO(b"x"), 0)
+
+
+class TestCountWordsInFiles:
+    """Test suite for count_words_in_files."""
+
+    @pytest.mark.parametrize("min_range_bytes", [1, 2, 7, 1 << 20])
+    def test_ranges_split_at_whitespace(
+        self, tmp_path: Path, min_range_bytes: int
+    ) -> None:
+        """However small the ranges, no word is split between two of them."""
+        path = tmp_path / "corpus.txt"
+        text = _TEXT + " " + "w" * 200 + " end"
+        path.write_bytes(text.encode())
+        counts = count_words_in_files([path], 1, 3, min_range_bytes)
+        assert counts == collections.Counter(text.split())
+
+    def test_single_word_file(self, tmp_path: Path) -> None:
+        """A file without whitespace stays one range."""
+        path = tmp_path / "word.txt"
+        path.write_bytes(b"x" * 100)
+        assert count_words_in_files([path], 1, 7, 10) == {"x" * 100: 1}
+
+    def test_process_pool(self, tmp_path: Path) -> None:
+        """Workers count files of different sizes and the counts add up."""
+        texts = ["a", "b c d e a", "c c", "", _TEXT * 20]
+        paths = []
+        for i, text in enumerate(texts):
+            paths.append(tmp_path / f"{i}.txt")
+            paths[-1].write_text(text, encoding="utf-8")
+        counts = count_words_in_files(map(str, paths), jobs=2, min_range_bytes=64)
+        assert counts == collections.Counter(" ".join(texts).split())
+
+    def test_no_files(self) -> None:
+        """No files give an empty Counter."""
+        assert count_words_in_files([], jobs=2) == collections.Counter()
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """A missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            count_words_in_files([tmp_path / "missing.txt"])
+
+    @pytest.mark.parametrize(
+        ("kwargs", "message"),
+        [
+            ({"jobs": -1}, "jobs must be non-negative"),
+            ({"chunk_size": 0}, "chunk_size must be positive"),
+            ({"min_range_bytes": 0}, "min_range_bytes must be positive"),
+        ],
+    )
+    def test_invalid_arguments(self, kwargs: dict[str, int], message: str) -> None:
+        """Negative jobs and non-positive sizes raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            count_words_in_files([], **kwargs)
+
+
+class TestMergeCounters:
+    """Test suite for merge_counters."""
+
+    @pytest.mark.parametrize("n", [1, 2, 3, 4, 7])
+    def test_sums_any_number(self, n: int) -> None:
+        """Odd and even numbers of counters add up to the same total."""
+        texts = ["ab" * i + "c" for i in range(n)]
+        expected = collections.Counter("".join(texts))
+        assert merge_counters(map(collections.Counter, texts)) == expected
+
+    def test_folds_into_largest_part(self) -> None:
+        """An iterator of parts is folded into the largest one in place."""
+        small = collections.Counter("ab")
+        large = collections.Counter("bcdef")
+        merged = merge_counters(iter([small, large]))
+        assert merged is large
+        assert merged == collections.Counter("abbcdef")
+
+
+class TestTopKCounter:
+    """Test suite for TopKCounter."""
+
+    def test_exact_within_capacity(self) -> None:
+        """With room for every word the counts are exact."""
+        top = TopKCounter(len(set(_ZIPF)))
+        top.update(_ZIPF)
+        assert top.most_common() == collections.Counter(_ZIPF).most_common()
+        assert top.error == 0
+
+    @pytest.mark.parametrize("capacity", [1, 5, 40])
+    def test_error_bounds(self, capacity: int) -> None:
+        """True counts lie within bounds and the error stays below total / (k + 1)."""
+        top = TopKCounter(capacity)
+        top.update(_ZIPF)
+        assert top.total == len(_ZIPF)
+        assert top.error <= top.total / (capacity + 1)
+        assert len(top) <= 2 * capacity
+        for word, n in collections.Counter(_ZIPF).items():
+            low, high = top.bounds(word)
+            assert low <= n <= high
+
+    def test_top_words(self) -> None:
+        """The most frequent words of a skewed stream come out in order."""
+        top = TopKCounter(40)
+        top.update(iter(_ZIPF))
+        expected = [w for w, _ in collections.Counter(_ZIPF).most_common(5)]
+        assert [w for w, _ in top.most_common(5)] == expected
+
+    def test_merge_shards(self) -> None:
+        """Merging summaries of shards keeps the bounds of the whole stream."""
+        shards = [TopKCounter(20) for _ in range(3)]
+        for i, shard in enumerate(shards):
+            shard.update(_ZIPF[i::3])
+        merged = shards[0]
+        for shard in shards[1:]:
+            merged.merge(shard)
+        assert merged.total == len(_ZIPF)
+        assert merged.error <= merged.total / 21
+        assert len(merged) <= 20
+        for word, n in collections.Counter(_ZIPF).items():
+            low, high = merged.bounds(word)
+            assert low <= n <= high
+
+    def test_merge_rejects_other_types(self) -> None:
+        """Merging anything but a TopKCounter raises TypeError."""
+        with pytest.raises(TypeError, match="expected TopKCounter, got Counter"):
+            TopKCounter(1).merge(collections.Counter())  # type: ignore[arg-type]
+
+    def test_merge_rejects_other_capacities(self) -> None:
+        """Summaries of different capacities do not merge, either way round."""
+        small, large = TopKCounter(1), TopKCounter(3)
+        small.update(_ZIPF)
+        with pytest.raises(ValueError, match="capacity-1 summary into a capacity-3"):
+            large.merge(small)
+        with pytest.raises(ValueError, match="capacity-3 summary into a capacity-1"):
+            small.merge(large)
+        assert large.total == 0
+
+    def test_invalid_capacity(self) -> None:
+        """A capacity below 1 raises ValueError."""
+        with pytest.raises(ValueError, match="capacity must be positive"):
+            TopKCounter(0)
+
+
+class TestCountMinSketch:
+    """Test suite for CountMinSketch."""
+
+    def test_never_undercounts(self) -> None:
+        """Estimates are upper bounds, mostly within 2 * total / width."""
+        sketch = CountMinSketch(256, depth=4)
+        sketch.update(_ZIPF)
+        counts = collections.Counter(_ZIPF)
+        over = [sketch.estimate(w) - n for w, n in counts.items()]
+        assert min(over) >= 0
+        assert sum(o > 2 * len(_ZIPF) / 256 for o in over) <= len(over) / 16
+        assert sketch.total == len(_ZIPF)
+
+    def test_add_and_update(self) -> None:
+        """Single adds and batched updates both bound every count."""
+        one, batch = CountMinSketch(64, depth=2), CountMinSketch(64, depth=2)
+        for word in _ZIPF[:2000]:
+            one.add(word)
+        batch.update(_ZIPF[:2000])
+        counts = collections.Counter(_ZIPF[:2000])
+        for word, n in counts.items():
+            assert n <= one.estimate(word)
+            assert n <= batch.estimate(word)
+
+    def test_saturates(self) -> None:
+        """Counters stop at MAX_COUNT instead of overflowing."""
+        sketch = CountMinSketch(4, depth=1)
+        sketch.add("x", MAX_COUNT)
+        sketch.add("x")
+        assert sketch.estimate("x") == MAX_COUNT
+        sketch.merge(CountMinSketch.from_bytes(sketch.to_bytes()))
+        assert sketch.estimate("x") == MAX_COUNT
+
+    def test_merge_workers(self) -> None:
+        """Merged shard sketches still bound the counts of the whole stream."""
+        shards = [CountMinSketch(128) for _ in range(3)]
+        for i, shard in enumerate(shards):
+            shard.update(_ZIPF[i::3])
+        merged = shards[0]
+        for shard in shards[1:]:
+            merged.merge(shard)
+        assert merged.total == len(_ZIPF)
+        for word, n in collections.Counter(_ZIPF).items():
+            assert merged.estimate(word) >= n
+
+    def test_round_trip(self) -> None:
+        """Serialized sketches load back with the same shape and counts."""
+        sketch = CountMinSketch(100, depth=8)
+        sketch.update(_ZIPF[:500])
+        copy = CountMinSketch.from_bytes(sketch.to_bytes())
+        assert (copy.width, copy.depth, copy.total) == (100, 8, 500)
+        assert copy.to_bytes() == sketch.to_bytes()
+
+    def test_foreign_byte_order(self) -> None:
+        """Counters written on a machine of the other byte order load correctly."""
+        sketch = CountMinSketch(16, depth=2)
+        sketch.update(["a"] * 3)
+        data = sketch.to_bytes()
+        cells = array("I")
+        cells.frombytes(data[20:])
+        cells.byteswap()
+        magic = b"CMSB" if sys.byteorder == "little" else b"CMSL"
+        copy = CountMinSketch.from_bytes(magic + data[4:20] + cells.tobytes())
+        assert copy.estimate("a") == 3
+
+    @pytest.mark.parametrize(
+        ("data", "message"),
+        [
+            (b"", "not a serialized"),
+            (b"JUNK" + bytes(16), "not a serialized"),
+            (CountMinSketch(2, 1).to_bytes() + b"\0", "expected 8 bytes of counters"),
+        ],
+    )
+    def test_from_bytes_rejects(self, data: bytes, message: str) -> None:
+        """Foreign or truncated data raises ValueError."""
+        with pytest.raises(ValueError, match=message):
+            CountMinSketch.from_bytes(data)
+
+    def test_merge_rejects(self) -> None:
+        """Other types and other shapes cannot be merged."""
+        with pytest.raises(TypeError, match="expected CountMinSketch, got list"):
+            CountMinSketch(4).merge([])  # type: ignore[arg-type]
+        with pytest.raises(ValueError, match="cannot merge a 4x2 sketch into a 4x4"):
+            CountMinSketch(4).merge(CountMinSketch(4, depth=2))
+
+    def test_add_rejects_non_positive(self) -> None:
+        """Conservative update cannot take counts below 1."""
+        with pytest.raises(ValueError, match="count must be positive"):
+            CountMinSketch(4).add("x", -1)
+
+    @pytest.mark.parametrize(
+        ("width", "depth", "message"),
+        [(0, 4, "width must be positive"), (8, 0, "depth"), (8, 9, "depth")],
+    )
+    def test_invalid_shape(self, width: int, depth: int, message: str) -> None:
+        """Empty or too deep sketches raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            CountMinSketch(width, depth)
+
+
+class TestVocabulary:
+    """Test suite for Vocabulary."""
+
+    def test_matches_counter(self) -> None:
+        """Counts and their order agree with Counter."""
+        vocab = Vocabulary()
+        vocab.add_tokens(iter(_ZIPF))
+        assert vocab.most_common() == collections.Counter(_ZIPF).most_common()
+        assert vocab.most_common(3) == collections.Counter(_ZIPF).most_common(3)
+        assert sum(vocab.counts) == len(_ZIPF)
+
+    def test_ids_are_stable(self) -> None:
+        """Ids follow first appearance and map back to their words."""
+        vocab = Vocabulary()
+        vocab.add_tokens(["b", "a"])
+        assert vocab.word_of(1) == "a"
+        vocab.add_tokens(["c", "b"])
+        assert [vocab.word_of(i) for i in range(len(vocab))] == ["b", "a", "c"]
+        assert vocab.id_of("c") == 2
+        assert "c" in vocab
+        assert "d" not in vocab
+        assert vocab.encode(iter(["c", "b", "c"])) == [2, 0, 2]
+
+    def test_intern_matches_add_and_encode(self) -> None:
+        """Interning counts and encodes like add_tokens followed by encode."""
+        interned, added = Vocabulary(), Vocabulary()
+        ids = interned.intern(iter(_ZIPF[:500])) + interned.intern(_ZIPF[500:])
+        added.add_tokens(_ZIPF)
+        assert ids == added.encode(_ZIPF)
+        assert interned.counts == added.counts
+        assert interned.most_common() == added.most_common()
+
+    def test_lookups_add_nothing(self) -> None:
+        """Failed lookups raise KeyError and leave the vocabulary unchanged."""
+        vocab = Vocabulary()
+        vocab.add_tokens(["a"])
+        with pytest.raises(KeyError, match="'b'"):
+            vocab.encode(["a", "b", "c"])
+        with pytest.raises(KeyError):
+            vocab.id_of("b")
+        assert len(vocab) == 1
+        assert "b" not in vocab
+
+    def test_word_of_out_of_range(self) -> None:
+        """Ids outside the vocabulary, negative ones included, raise IndexError."""
+        vocab = Vocabulary()
+        vocab.add_tokens(["a"])
+        for i in (1, -1):
+            with pytest.raises(IndexError, match=f"no word with id {i}"):
+                vocab.word_of(i)
+
+    def test_by_count(self) -> None:
+        """Ids come back as an array('Q'), ties in order of first appearance."""
+        vocab = Vocabulary()
+        vocab.add_tokens(["x", "y", "z", "y", "z", "w"])
+        order = vocab.by_count()
+        assert order.typecode == "Q"
+        assert order.tolist() == [1, 2, 0, 3]
+
+    def test_save_load(self, tmp_path: Path) -> None:
+        """Saved vocabularies load with the same ids, including odd words."""
+        vocab = Vocabulary()
+        vocab.add_tokens([*_ZIPF[:1000], "a\nb", "", "日本語", "\udc80"])
+        vocab.save(tmp_path / "vocab.bin")
+        loaded = Vocabulary.load(tmp_path / "vocab.bin")
+        assert loaded.counts == vocab.counts
+        assert [loaded.word_of(i) for i in range(len(loaded))] == [
+            vocab.word_of(i) for i in range(len(vocab))
+        ]
+        assert loaded.id_of("\udc80") == len(vocab) - 1
+        loaded.add_tokens(["a\nb", "new"])
+        assert loaded.counts[loaded.id_of("a\nb")] == 2
+        assert loaded.word_of(len(loaded) - 1) == "new"
+
+    def test_foreign_byte_order(self, tmp_path: Path) -> None:
+        """Files written on a machine of the other byte order load correctly."""
+        vocab = Vocabulary()
+        vocab.add_tokens(["a", "b", "a"])
+        vocab.save(tmp_path / "vocab.bin")
+        data = (tmp_path / "vocab.bin").read_bytes()
+        counts, lengths = array("Q"), array("I")
+        counts.frombytes(data[20:36])
+        lengths.frombytes(data[36:44])
+        counts.byteswap()
+        lengths.byteswap()
+        magic = b"VOCB" if sys.byteorder == "little" else b"VOCL"
+        swapped = magic + data[4:20] + counts.tobytes() + lengths.tobytes() + b"ab"
+        (tmp_path / "vocab.bin").write_bytes(swapped)
+        assert Vocabulary.load(tmp_path / "vocab.bin").most_common() == [
+            ("a", 2),
+            ("b", 1),
+        ]
+
+    @pytest.mark.parametrize(
+        ("data", "message"),
+        [
+            (b"", "not a saved Vocabulary"),
+            (b"JUNK" + bytes(16), "not a saved Vocabulary"),
+            (b"VOCL" + bytes(8) + bytes([1]) + bytes(7), "expected 21 bytes, got 20"),
+        ],
+    )
+    def test_load_rejects(self, tmp_path: Path, data: bytes, message: str) -> None:
+        """Foreign or truncated files raise ValueError."""
+        (tmp_path / "vocab.bin").write_bytes(data)
+        with pytest.raises(ValueError, match=message):
+            Vocabulary.load(tmp_path / "vocab.bin")
+
+
+class TestNgramCounter:
+    """Test suite for NgramCounter."""
+
+    @pytest.mark.parametrize("n", [1, 2, 3])
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+    def test_exact_counts(self, n: int, chunk_size: int) -> None:
+        """Without a budget, counts match zipped tuples whatever the chunking."""
+        counter = NgramCounter(n, chunk_size=chunk_size)
+        counter.update(_ZIPF[:500])
+        counter.update(iter(_ZIPF[500:1000]))
+        tokens = _ZIPF[:1000]
+        expected = collections.Counter(
+            zip(*(tokens[k:] for k in range(n)), strict=False)
+        )
+        got = {counter.words(g): c for g, c in counter.most_common()}
+        assert got == expected
+        assert counter.error == 0
+
+    def test_short_stream(self) -> None:
+        """Fewer than n tokens make no n-gram."""
+        counter = NgramCounter(3)
+        counter.update(["a", "b"])
+        assert len(counter) == 0
+        assert counter.vocabulary.most_common() == [("a", 1), ("b", 1)]
+
+    @pytest.mark.parametrize(("min_count", "max_ngrams"), [(1, 50), (3, 200), (2, 1)])
+    def test_pruning_bounds(self, min_count: int, max_ngrams: int) -> None:
+        """Pruned counts stay within error of the truth and under the budget."""
+        counter = NgramCounter(2, min_count, max_ngrams, chunk_size=100)
+        counter.update(_ZIPF)
+        assert len(counter) <= max_ngrams
+        assert counter.error > 0
+        expected = collections.Counter(itertools.pairwise(_ZIPF))
+        for ngram, n in expected.items():
+            assert n - counter.error <= counter.count_of(ngram) <= n
+
+    def test_min_count_without_budget(self) -> None:
+        """A min_count prunes after every chunk even when no budget is set."""
+        counter = NgramCounter(2, min_count=2, chunk_size=100)
+        counter.update(_ZIPF)
+        expected = collections.Counter(itertools.pairwise(_ZIPF))
+        assert 0 < len(counter) < len(expected)
+        assert counter.error > 0
+        for ngram, n in expected.items():
+            assert n - counter.error <= counter.count_of(ngram) <= n
+        counter = NgramCounter(1, min_count=2)
+        counter.update("aab")
+        assert counter.most_common() == [((0,), 2)]
+        assert counter.error == 1
+        counter = NgramCounter(1, min_count=2)
+        counter.update("aa")
+        assert counter.error == 0
+
+    def test_pruning_keeps_frequent(self) -> None:
+        """The most frequent n-gram survives pruning with its exact count."""
+        counter = NgramCounter(2, min_count=2, max_ngrams=500, chunk_size=1000)
+        counter.update(_ZIPF)
+        (top, n), *_ = collections.Counter(itertools.pairwise(_ZIPF)).most_common(1)
+        assert counter.words(counter.most_common(1)[0][0]) == top
+        assert counter.count_of(top) == n
+
+    def test_count_of_unknown(self) -> None:
+        """N-grams with unseen tokens count zero."""
+        counter = NgramCounter(2)
+        counter.update(["a", "b"])
+        assert counter.ngrams() == [(0, 1)]
+        assert counter.count_of(("a", "b")) == 1
+        assert counter.count_of(("b", "c")) == 0
+
+    @pytest.mark.parametrize(
+        ("kwargs", "message"),
+        [
+            ({"n": 0}, "n must be positive"),
+            ({"n": 2, "min_count": 0}, "min_count must be positive"),
+            ({"n": 2, "max_ngrams": 0}, "max_ngrams must be positive"),
+            ({"n": 2, "chunk_size": 0}, "chunk_size must be positive"),
+        ],
+    )
+    def test_invalid_arguments(self, kwargs: dict[str, int], message: str) -> None:
+        """Non-positive sizes raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            NgramCounter(**kwargs)
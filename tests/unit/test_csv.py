@@ -2,9 +2,33 @@
 
 from __future__ import annotations
 
+import csv
+import functools
+import gzip
+import io
+import itertools
+import math
+import random
+import tracemalloc
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
 import pytest
 
+from reprorusted_std_only.csv.columnar_example import DictColumn, read_columns
+from reprorusted_std_only.csv.groupby_example import GroupBy, group_csv
+from reprorusted_std_only.csv.parallel_example import (
+    parse_csv_parallel,
+    read_columns_parallel,
+    split_ranges,
+)
 from reprorusted_std_only.csv.reader_example import parse_csv
+from reprorusted_std_only.csv.stream_example import iter_csv, iter_lines
+from reprorusted_std_only.csv.writer_example import WriteStats, write_csv
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 
 class TestParseCsv:
@@ -46,3 +70,635 @@ class TestParseCsv:
         """Quoted fields parsed correctly."""
         result = parse_csv('"hello, world",foo')
         assert result == [["hello, world", "foo"]]
+
+
+_TRICKY = (
+    'id,note\r\n1,"quoted, comma"\r\n2,"multi\nline\r\nfield"\n'
+    '3,"say ""hi"""\r\n4,é ünïcode\n5,\n"",last'
+)
+
+
+class TestIterLines:
+    """Test suite for iter_lines function."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 20])
+    def test_matches_text_io(self, chunk_size: int) -> None:
+        """Lines match a text file opened with newline=''."""
+        data = _TRICKY.encode()
+        expected = list(io.TextIOWrapper(io.BytesIO(data), newline=""))
+        assert list(iter_lines(io.BytesIO(data), chunk_size)) == expected
+
+    def test_crlf_split_across_chunks(self) -> None:
+        """A CRLF pair split between two reads stays one terminator."""
+        assert list(iter_lines(io.BytesIO(b"a\r\nb"), chunk_size=2)) == [
+            "a\r\n",
+            "b",
+        ]
+
+    def test_lone_cr(self) -> None:
+        """A lone CR is a terminator, also at the end of input."""
+        lines = iter_lines(io.BytesIO(b"a\rb\r\nc\r"), chunk_size=1)
+        assert list(lines) == ["a\r", "b\r\n", "c\r"]
+
+    def test_long_line(self) -> None:
+        """A line longer than many chunks is assembled whole."""
+        data = b"x" * 10_000 + b"\ny"
+        assert list(iter_lines(io.BytesIO(data), chunk_size=64)) == [
+            "x" * 10_000 + "\n",
+            "y",
+        ]
+
+    def test_other_encoding(self) -> None:
+        """The stream encoding is honoured."""
+        data = "ä,ö\n".encode("utf-16")
+        assert list(iter_lines(io.BytesIO(data), 3, "utf-16")) == ["ä,ö\n"]
+
+
+class TestIterCsv:
+    """Test suite for iter_csv function."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 1 << 20])
+    def test_matches_parse_csv(self, chunk_size: int) -> None:
+        """Rows equal parse_csv on the same document."""
+        batches = iter_csv(io.BytesIO(_TRICKY.encode()), 2, chunk_size)
+        rows = [row for batch in batches for row in batch]
+        assert rows == parse_csv(_TRICKY)
+
+    def test_batch_sizes(self) -> None:
+        """Batches hold at most batch_size rows."""
+        batches = list(iter_csv(io.BytesIO(b"1\n2\n3\n4\n5\n"), batch_size=2))
+        assert [len(b) for b in batches] == [2, 2, 1]
+
+    def test_empty_input(self) -> None:
+        """An empty file yields no batches."""
+        assert list(iter_csv(io.BytesIO(b""))) == []
+
+    def test_path_input_closes_file(self, tmp_path: Path) -> None:
+        """Paths (str or PathLike) are opened and read."""
+        path = tmp_path / "data.csv"
+        path.write_bytes(b"a,b\n1,2\n")
+        assert list(iter_csv(path)) == [[["a", "b"], ["1", "2"]]]
+        assert list(iter_csv(str(path))) == [[["a", "b"], ["1", "2"]]]
+
+    def test_file_object_left_open(self) -> None:
+        """A caller's file object is not closed."""
+        stream = io.BytesIO(b"a\n")
+        list(iter_csv(stream))
+        assert not stream.closed
+
+    def test_constant_memory(self, tmp_path: Path) -> None:
+        """Peak memory does not grow with the file size."""
+        peaks = []
+        for rows in (5_000, 40_000):
+            path = tmp_path / f"{rows}.csv"
+            with path.open("w", newline="") as f:
+                for i in range(rows):
+                    f.write(f'{i},name{i},"note, {i}",{i * 0.5}\r\n')
+            tracemalloc.start()
+            parsed = sum(len(b) for b in iter_csv(path, 64, 1 << 14))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            assert parsed == rows
+        assert peaks[1] < peaks[0] * 1.5
+        assert peaks[1] < path.stat().st_size // 10
+
+    def test_iterator_rows(self) -> None:
+        """Rows that are themselves iterators are written like csv.writer does."""
+        rows = [["a", "b"], iter(["1", "2"]), iter([1, 2]), map(str, "xy"), ["c"]]
+        out = io.BytesIO()
+        write_csv(out, rows)  # type: ignore[arg-type]
+        assert out.getvalue() == b"a,b\r\n1,2\r\n1,2\r\nx,y\r\nc\r\n"
+
+    def test_type_error_text_stream(self) -> None:
+        """Text streams are rejected."""
+        with pytest.raises(TypeError, match="binary file"):
+            iter_csv(io.StringIO("a"))  # type: ignore[arg-type]
+
+    def test_type_error_int(self) -> None:
+        """Non-file input raises TypeError."""
+        with pytest.raises(TypeError, match="expected a path"):
+            iter_csv(42)  # type: ignore[arg-type]
+
+    @pytest.mark.parametrize(("batch", "chunk"), [(0, 1), (1, 0)])
+    def test_value_error_sizes(self, batch: int, chunk: int) -> None:
+        """Non-positive sizes raise ValueError."""
+        with pytest.raises(ValueError, match="must be positive"):
+            iter_csv(io.BytesIO(b""), batch, chunk)
+
+
+class TestReadColumns:
+    """Test suite for read_columns function."""
+
+    def test_inferred_types(self) -> None:
+        """Columns get the narrowest type that fits every value."""
+        data = b"id,score,name\n1,0.5,ann\n2,1,bob\n3,2.5,ann\n"
+        columns = read_columns(io.BytesIO(data))
+        assert list(columns) == ["id", "score", "name"]
+        assert columns["id"] == array("q", [1, 2, 3])
+        assert columns["score"] == array("d", [0.5, 1.0, 2.5])
+        name = columns["name"]
+        assert isinstance(name, DictColumn)
+        assert name.codes == array("I", [0, 1, 0])
+        assert name.values == ["ann", "bob"]
+        assert name.decode() == ["ann", "bob", "ann"]
+        assert (len(name), name[1]) == (3, "bob")
+
+    def test_matches_parse_csv(self) -> None:
+        """String columns decode back to the parse_csv fields."""
+        data = io.BytesIO(_TRICKY.encode())
+        columns = read_columns(data, {"id": "str"}, batch_size=2)
+        header, *rows = parse_csv(_TRICKY)
+        assert columns["id"].decode() == [row[0] for row in rows]  # type: ignore[union-attr]
+        assert columns["note"].decode() == [row[1] for row in rows]  # type: ignore[union-attr]
+        assert list(columns) == header
+
+    def test_int_promoted_to_float_in_later_batch(self) -> None:
+        """An inferred int column widens when a later batch holds floats."""
+        data = b"x\n1\n2\n3.5\n"
+        assert read_columns(io.BytesIO(data), batch_size=2)["x"] == array(
+            "d", [1.0, 2.0, 3.5]
+        )
+
+    def test_empty_cells_are_nan(self) -> None:
+        """Empty cells in numeric columns become NaN floats."""
+        column = read_columns(io.BytesIO(b'x\n1\n""\n\n'), batch_size=1)["x"]
+        assert column.typecode == "d"  # type: ignore[union-attr]
+        assert column[0] == 1.0
+        assert math.isnan(column[1])  # type: ignore[arg-type]
+
+    def test_schema_overrides_inference(self) -> None:
+        """Schema columns keep their declared type."""
+        columns = read_columns(
+            io.BytesIO(b"zip,n\n01234,1\n"), schema={"zip": "str", "n": "float"}
+        )
+        assert columns["zip"].values == ["01234"]  # type: ignore[union-attr]
+        assert columns["n"] == array("d", [1.0])
+
+    def test_header_only(self) -> None:
+        """A header without rows gives empty columns."""
+        columns = read_columns(io.BytesIO(b"a,b\n"), schema={"b": "str"})
+        assert len(columns["a"]) == 0
+        assert len(columns["b"]) == 0
+
+    def test_empty_input(self) -> None:
+        """An empty file gives no columns."""
+        assert read_columns(io.BytesIO(b"")) == {}
+
+    def test_path_input(self, tmp_path: Path) -> None:
+        """A path is read like a file object."""
+        path = tmp_path / "data.csv"
+        path.write_bytes(b"a\n1\n")
+        assert read_columns(path)["a"] == array("q", [1])
+
+    def test_compact_memory(self) -> None:
+        """Columns take a fraction of the memory of string rows."""
+        lines = ["id,score,city"]
+        lines += [f"{i},{i * 0.25},city{i % 10}" for i in range(20_000)]
+        text = "\n".join(lines)
+        sizes = []
+        for parse in (parse_csv, lambda t: read_columns(io.BytesIO(t.encode()))):
+            tracemalloc.start()
+            result = parse(text)
+            sizes.append(tracemalloc.get_traced_memory()[0])
+            tracemalloc.stop()
+            del result
+        assert sizes[1] < sizes[0] / 5
+
+    def test_batch_size_one(self) -> None:
+        """A batch holding only the header does not decide any type."""
+        columns = read_columns(io.BytesIO(b"name,n\nalice,1.5\n"), batch_size=1)
+        assert columns["name"].values == ["alice"]  # type: ignore[union-attr]
+        assert columns["n"] == array("d", [1.5])
+
+    @pytest.mark.parametrize(
+        ("data", "message"),
+        [
+            (b"x\n007\n2\nbob\n", "rows 3-3: expected int values; give it"),
+            (b'x\n1\n2.5\n""\n1e3\nn/a\n', "rows 5-5: expected float values; give"),
+        ],
+    )
+    def test_value_error_string_in_later_batch(self, data: bytes, message: str) -> None:
+        """An inferred numeric column never rewrites the numbers it read as text."""
+        with pytest.raises(ValueError, match=f"column 'x' {message}"):
+            read_columns(io.BytesIO(data), batch_size=1)
+        column = read_columns(io.BytesIO(data), {"x": "str"}, batch_size=1)["x"]
+        assert column.decode() == [row[0] for row in parse_csv(data.decode())[1:]]  # type: ignore[union-attr]
+
+    def test_value_error_late_string(self) -> None:
+        """A later non-numeric value in a schema int column is an error."""
+        with pytest.raises(ValueError, match="column 'x' rows 2-2: expected int"):
+            read_columns(io.BytesIO(b"x\n1\nabc\n"), {"x": "int"}, batch_size=1)
+
+    def test_value_error_int_overflow(self) -> None:
+        """Integers beyond 64 bits do not fit a declared int column."""
+        with pytest.raises(ValueError, match="expected int"):
+            read_columns(io.BytesIO(b"x\n99999999999999999999\n"), {"x": "int"})
+
+    def test_value_error_ragged_row(self) -> None:
+        """Rows must have as many fields as the header."""
+        with pytest.raises(ValueError, match="row 2: expected 2 fields, got 1"):
+            read_columns(io.BytesIO(b"a,b\n1,2\n3\n"))
+
+    def test_value_error_unknown_type(self) -> None:
+        """Unknown schema types are rejected."""
+        with pytest.raises(ValueError, match="unknown column type"):
+            read_columns(io.BytesIO(b"a\n"), {"a": "date"})
+
+    def test_value_error_unknown_column(self) -> None:
+        """Schema columns must appear in the header."""
+        with pytest.raises(ValueError, match=r"not in the header: \['b'\]"):
+            read_columns(io.BytesIO(b"a\n1\n"), {"b": "int"})
+
+
+def _quoted_document(rows: int, seed: int) -> bytes:
+    """Return CSV bytes whose quoted fields hold commas, quotes and newlines."""
+    rng = random.Random(seed)
+    pieces = ["plain", '"a, b"', '"multi\nline"', '"say ""hi"""', '"x\r\ny\n"', ""]
+    lines = ["id,note,tail"]
+    for i in range(rows):
+        lines.append(f"{i},{rng.choice(pieces)},{rng.choice(pieces)}")
+    return ("\r\n" if seed % 2 else "\n").join(lines).encode() + b"\n"
+
+
+class TestSplitRanges:
+    """Test suite for split_ranges function."""
+
+    @pytest.mark.parametrize("seed", range(6))
+    @pytest.mark.parametrize("ranges", [2, 7, 50])
+    def test_ranges_parse_like_whole_file(self, seed: int, ranges: int) -> None:
+        """Parsing each range and concatenating equals parsing the whole file."""
+        data = _quoted_document(200, seed)
+        spans = split_ranges(data, ranges)
+        assert spans[0][0] == 0
+        assert spans[-1][1] == len(data)
+        assert all(a[1] == b[0] for a, b in itertools.pairwise(spans))
+        rows = [row for a, b in spans for row in parse_csv(data[a:b].decode())]
+        assert rows == parse_csv(data.decode())
+
+    def test_split_only_after_newline(self) -> None:
+        """Every split point follows a newline outside quotes."""
+        data = b'a\n"b\nb\nb"\nc\nd\n'
+        assert split_ranges(data, 16) == [(0, 2), (2, 10), (10, 12), (12, 14)]
+
+    def test_min_range_bytes(self) -> None:
+        """Ranges are not made smaller than min_range_bytes."""
+        data = b"x\n" * 100
+        assert len(split_ranges(data, 100, min_range_bytes=50)) == 4
+
+    def test_no_newline_is_one_range(self) -> None:
+        """Data without a usable newline stays whole."""
+        assert split_ranges(b'"a\nb', 4) == [(0, 4)]
+
+    @pytest.mark.parametrize(("ranges", "minimum"), [(0, 1), (1, 0)])
+    def test_value_error(self, ranges: int, minimum: int) -> None:
+        """Non-positive sizes raise ValueError."""
+        with pytest.raises(ValueError, match="must be positive"):
+            split_ranges(b"a\n", ranges, minimum)
+
+
+class TestParseCsvParallel:
+    """Test suite for parse_csv_parallel and read_columns_parallel."""
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_matches_parse_csv(self, tmp_path: Path, jobs: int) -> None:
+        """Rows equal parse_csv, in the original order."""
+        data = _quoted_document(2_000, seed=3)
+        path = tmp_path / "data.csv"
+        path.write_bytes(data)
+        rows = parse_csv_parallel(path, jobs=jobs, min_range_bytes=1024)
+        assert rows == parse_csv(data.decode())
+
+    def test_small_file_in_process(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A file below two ranges is parsed without a pool."""
+        monkeypatch.setattr(
+            "reprorusted_std_only.csv.parallel_example.ProcessPoolExecutor", None
+        )
+        path = tmp_path / "data.csv"
+        path.write_bytes(b"a,b\n1,2")
+        assert parse_csv_parallel(path, jobs=4) == [["a", "b"], ["1", "2"]]
+        # One and a half ranges split in two, but still stay in-process
+        path.write_bytes(b"a\n1\n2\n")
+        rows = parse_csv_parallel(path, jobs=2, min_range_bytes=4)
+        assert rows == [["a"], ["1"], ["2"]]
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        """An empty file gives no rows and no columns."""
+        path = tmp_path / "empty.csv"
+        path.write_bytes(b"")
+        assert parse_csv_parallel(path) == []
+        assert read_columns_parallel(path) == {}
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_columns_match_read_columns(self, tmp_path: Path, jobs: int) -> None:
+        """Typed columns equal the streaming read_columns result."""
+        path = tmp_path / "data.csv"
+        with path.open("w", newline="") as f:
+            f.write("id,score,city\n")
+            for i in range(5_000):
+                f.write(f'{i},{i / 4},"city, {i % 7}"\n')
+        columns = read_columns_parallel(path, jobs=jobs, min_range_bytes=4096)
+        assert columns == read_columns(path)
+        assert columns["score"].typecode == "d"  # type: ignore[union-attr]
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_columns_from_small_ranges(self, tmp_path: Path, jobs: int) -> None:
+        """A first range holding only the header decides no types."""
+        path = tmp_path / "data.csv"
+        path.write_bytes(b"name\nbob\ncarl\n")
+        column = read_columns_parallel(path, jobs=jobs, min_range_bytes=2)["name"]
+        assert column.decode() == ["bob", "carl"]  # type: ignore[union-attr]
+        path.write_bytes(b"n,x\n1,2\n2.5,a\n")
+        with pytest.raises(ValueError, match="column 'x' rows 2-2: expected int"):
+            read_columns_parallel(path, jobs=jobs, min_range_bytes=2)
+        columns = read_columns_parallel(path, {"x": "str"}, jobs, min_range_bytes=2)
+        assert columns["n"] == array("d", [1.0, 2.5])
+        assert columns["x"].decode() == ["2", "a"]  # type: ignore[union-attr]
+
+    def test_many_ranges_in_flight(self, tmp_path: Path) -> None:
+        """More ranges than the in-flight window still come back in order."""
+        path = tmp_path / "data.csv"
+        path.write_bytes(b"".join(b"%d\n" % i for i in range(200)))
+        rows = parse_csv_parallel(path, jobs=2, min_range_bytes=16)
+        assert rows == [[str(i)] for i in range(200)]
+
+    def test_value_error_jobs(self, tmp_path: Path) -> None:
+        """Negative jobs raise ValueError."""
+        with pytest.raises(ValueError, match="jobs must be non-negative"):
+            parse_csv_parallel(tmp_path / "x.csv", jobs=-1)
+
+    def test_value_error_min_range(self, tmp_path: Path) -> None:
+        """Non-positive range sizes raise ValueError."""
+        with pytest.raises(ValueError, match="min_range_bytes must be positive"):
+            read_columns_parallel(tmp_path / "x.csv", min_range_bytes=0)
+
+
+_SALES = (
+    "region,store,amount,qty\n"
+    "north,a,10.5,1\n"
+    "south,b,3,2\n"
+    "north,a,,4\n"
+    "north,c,-2,1\n"
+    "\n"
+    "south,b,7,\n"
+)
+
+
+def _group_range(path: Path, header: list[str], start: int, end: int) -> GroupBy:
+    """Aggregate one byte range of ``path`` (a process-pool worker)."""
+    rows = parse_csv(path.read_bytes()[start:end].decode())
+    if start == 0:
+        rows = rows[1:]
+    groups = GroupBy(header, ["region"], [("sum", "amount"), ("count", "*")])
+    groups.update(rows)
+    return groups
+
+
+class TestGroupBy:
+    """Test suite for GroupBy and group_csv."""
+
+    def test_all_aggregates(self) -> None:
+        """Every aggregate function over a small table."""
+        specs = [
+            ("count", "*"),
+            ("sum", "amount"),
+            ("min", "amount"),
+            ("max", "amount"),
+            ("mean", "qty"),
+        ]
+        groups = group_csv(io.BytesIO(_SALES.encode()), ["region"], specs)
+        assert groups.result() == {
+            ("north",): (3, 8.5, -2.0, 10.5, 2.0),
+            ("south",): (2, 10.0, 3.0, 7.0, 2.0),
+        }
+
+    def test_composite_key(self) -> None:
+        """Several key columns form one tuple key."""
+        groups = group_csv(
+            io.BytesIO(_SALES.encode()), ["region", "store"], [("sum", "qty")]
+        )
+        assert groups.result() == {
+            ("north", "a"): (5.0,),
+            ("south", "b"): (2.0,),
+            ("north", "c"): (1.0,),
+        }
+        assert len(groups) == 3
+
+    @pytest.mark.parametrize("parts", [2, 3, 6])
+    def test_merge_partials_equals_single_pass(self, parts: int) -> None:
+        """Merging partial aggregates gives the single-pass result."""
+        header, *rows = parse_csv(_SALES)
+        specs = [("sum", "amount"), ("min", "qty"), ("max", "qty"), ("mean", "qty")]
+        whole = GroupBy(header, ["store"], specs)
+        whole.update(rows)
+        merged = GroupBy(header, ["store"], specs)
+        for part in range(parts):
+            partial = GroupBy(header, ["store"], specs)
+            partial.update(rows[part::parts])
+            merged.merge(partial)
+        assert merged.result().keys() == whole.result().keys()
+        for key, values in whole.result().items():
+            assert merged.result()[key] == pytest.approx(values)
+
+    def test_parallel_workers_merge(self, tmp_path: Path) -> None:
+        """Partials built in worker processes pickle back and merge."""
+        path = tmp_path / "sales.csv"
+        with path.open("w", newline="") as f:
+            f.write("region,amount\n")
+            for i in range(3_000):
+                f.write(f'"r, {i % 5}",{i}\n')
+        data = path.read_bytes()
+        header = parse_csv(data[: data.index(b"\n")].decode())[0]
+        starts, ends = zip(*split_ranges(data, 4), strict=True)
+        worker = functools.partial(_group_range, path, header)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            parts = executor.map(worker, starts, ends)
+            merged = next(parts)
+            for part in parts:
+                merged.merge(part)
+        expected = group_csv(path, ["region"], [("sum", "amount"), ("count", "*")])
+        assert merged.result() == expected.result()
+
+    def test_memory_tracks_groups_not_rows(self, tmp_path: Path) -> None:
+        """Peak memory stays flat as rows grow with a fixed set of groups."""
+        peaks = []
+        for rows in (5_000, 40_000):
+            path = tmp_path / f"{rows}.csv"
+            with path.open("w", newline="") as f:
+                f.write("key,value\n")
+                for i in range(rows):
+                    f.write(f"k{i % 50},{i}\n")
+            tracemalloc.start()
+            groups = group_csv(path, ["key"], [("sum", "value")], 256, 1 << 14)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            assert len(groups) == 50
+        assert peaks[1] < peaks[0] * 1.5
+
+    def test_value_error_unknown_column(self) -> None:
+        """Specs must name header columns."""
+        with pytest.raises(ValueError, match="unknown column 'nope'"):
+            GroupBy(["a"], ["nope"], [])
+        with pytest.raises(ValueError, match="unknown column 'nope'"):
+            GroupBy(["a"], ["a"], [("sum", "nope")])
+
+    def test_value_error_unknown_aggregate(self) -> None:
+        """Aggregate functions come from AGGREGATES."""
+        with pytest.raises(ValueError, match="unknown aggregate 'median'"):
+            GroupBy(["a"], ["a"], [("median", "a")])
+
+    def test_value_error_no_keys(self) -> None:
+        """At least one key column is required."""
+        with pytest.raises(ValueError, match="at least one key"):
+            GroupBy(["a"], [], [])
+
+    def test_value_error_short_row(self) -> None:
+        """Rows missing a key or value field are rejected."""
+        groups = GroupBy(["k", "v"], ["k"], [("sum", "v")])
+        with pytest.raises(ValueError, match="fewer fields than the header"):
+            groups.update([["a"]])
+
+    def test_value_error_empty_file(self) -> None:
+        """An empty file has no header to aggregate by."""
+        with pytest.raises(ValueError, match="no header row"):
+            group_csv(io.BytesIO(b""), ["k"], [])
+
+    def test_value_error_not_a_number(self) -> None:
+        """Non-numeric value cells are rejected."""
+        with pytest.raises(ValueError, match="could not convert"):
+            GroupBy(["k", "v"], ["k"], [("sum", "v")]).update([["a", "x"]])
+
+    def test_merge_errors(self) -> None:
+        """Only a GroupBy with the same specs can be merged."""
+        groups = GroupBy(["k", "v"], ["k"], [("sum", "v")])
+        with pytest.raises(ValueError, match="different specs"):
+            groups.merge(GroupBy(["k", "v"], ["k"], [("max", "v")]))
+        with pytest.raises(TypeError, match="expected GroupBy"):
+            groups.merge({})  # type: ignore[arg-type]
+
+    def test_merge_keeps_missing_extremes(self) -> None:
+        """Merging groups without values keeps min and max as None."""
+        spec = (["k", "v"], ["k"], [("min", "v"), ("max", "v"), ("mean", "v")])
+        a, b = GroupBy(*spec), GroupBy(*spec)
+        a.update([["x", ""]])
+        b.update([["x", ""], ["x", "4"]])
+        a.merge(b)
+        b.merge(GroupBy(*spec))
+        assert a.result() == {("x",): (4.0, 4.0, 4.0)}
+        a.merge(a)
+        assert a.result() == {("x",): (4.0, 4.0, 4.0)}
+
+
+class TestWriteCsv:
+    """Test suite for write_csv function."""
+
+    @pytest.mark.parametrize("batch_size", [1, 2, 1024])
+    @pytest.mark.parametrize("buffer_size", [1, 1 << 20])
+    def test_matches_csv_writer(self, batch_size: int, buffer_size: int) -> None:
+        """Output bytes equal csv.writer's, quoting included."""
+        rows = [
+            ["plain", "a, b", 'say "hi"', "x\r\ny"],
+            [],
+            [""],
+            ["", ""],
+            ["é", "multi\nline"],
+            [1, 2.5, None],
+            ["one,", "two"],
+            ["last"],
+        ]
+        expected = io.StringIO()
+        csv.writer(expected).writerows(rows)
+        out = io.BytesIO()
+        stats = write_csv(out, rows, False, batch_size, buffer_size)
+        assert out.getvalue() == expected.getvalue().encode()
+        assert stats.rows == len(rows)
+        assert stats.bytes == len(out.getvalue())
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_random_rows_match_csv_writer(self, seed: int) -> None:
+        """Batches mixing plain and quoted rows keep csv.writer's bytes."""
+        rng = random.Random(seed)
+        alphabet = ["a", "b", ",", '"', "\r", "\n", " ", "é", ""]
+        rows = [
+            ["".join(rng.choices(alphabet, k=rng.randrange(4))) for _ in range(3)]
+            for _ in range(500)
+        ]
+        expected = io.StringIO()
+        csv.writer(expected).writerows(rows)
+        out = io.BytesIO()
+        write_csv(out, rows, batch_size=7)
+        assert out.getvalue() == expected.getvalue().encode()
+
+    def test_round_trip(self) -> None:
+        """parse_csv reads back what write_csv wrote."""
+        rows = parse_csv(_TRICKY)
+        out = io.BytesIO()
+        write_csv(out, rows, batch_size=2)
+        assert parse_csv(out.getvalue().decode()) == rows
+
+    def test_columns(self) -> None:
+        """Typed columns are written under a header and read back."""
+        data = b"id,score,city\n1,0.5,Oslo\n2,-1e-07,Rome\n3,,Oslo\n"
+        columns = read_columns(io.BytesIO(data))
+        out = io.BytesIO()
+        assert write_csv(out, columns).rows == 4
+        assert parse_csv(out.getvalue().decode()) == [
+            ["id", "score", "city"],
+            ["1", "0.5", "Oslo"],
+            ["2", "-1e-07", "Rome"],
+            ["3", "nan", "Oslo"],
+        ]
+        again = read_columns(io.BytesIO(out.getvalue()))
+        assert again["id"] == columns["id"]
+        assert again["city"] == columns["city"]
+
+    def test_plain_columns(self) -> None:
+        """Lists are accepted as columns; an empty mapping writes nothing."""
+        out = io.BytesIO()
+        write_csv(out, {"a": [1, None], "b": ["x", "y, z"]})
+        assert out.getvalue() == b'a,b\r\n1,x\r\n,"y, z"\r\n'
+        assert write_csv(io.BytesIO(), {}).rows == 0
+
+    def test_gzip_path(self, tmp_path: Path) -> None:
+        """A .gz path is compressed unless compress says otherwise."""
+        rows = [["a", "b"], ["1", "2"]]
+        write_csv(tmp_path / "out.csv.gz", rows)
+        assert gzip.decompress((tmp_path / "out.csv.gz").read_bytes()) == (
+            b"a,b\r\n1,2\r\n"
+        )
+        write_csv(str(tmp_path / "plain.gz"), rows, compress=False)
+        assert (tmp_path / "plain.gz").read_bytes() == b"a,b\r\n1,2\r\n"
+        write_csv(tmp_path / "forced.csv", rows, compress=True)
+        with gzip.open(tmp_path / "forced.csv") as f:
+            assert list(iter_csv(f)) == [rows]
+
+    def test_stats(self) -> None:
+        """Stats report rows, bytes and a throughput."""
+        rows = [[str(i)] for i in range(1000)]
+        stats = write_csv(io.BytesIO(), rows, buffer_size=64)
+        assert (stats.rows, stats.bytes) == (1000, sum(len(r[0]) + 2 for r in rows))
+        assert stats.seconds >= 0
+        assert stats.rows_per_second > 0
+        assert WriteStats(1, 1, 0.0).rows_per_second == float("inf")
+
+    def test_generator_input(self) -> None:
+        """Rows may come from a one-shot iterator."""
+        out = io.BytesIO()
+        write_csv(out, ([str(i), "x"] for i in range(3)))
+        assert out.getvalue() == b"0,x\r\n1,x\r\n2,x\r\n"
+
+    def test_type_error_text_stream(self) -> None:
+        """Text streams are rejected."""
+        with pytest.raises(TypeError, match="binary file"):
+            write_csv(io.StringIO(), [])  # type: ignore[arg-type]
+
+    def test_value_error_sizes(self) -> None:
+        """Non-positive sizes raise ValueError."""
+        with pytest.raises(ValueError, match="must be positive"):
+            write_csv(io.BytesIO(), [], batch_size=0)
+
+    def test_value_error_ragged_columns(self) -> None:
+        """Columns must have the same length."""
+        with pytest.raises(ValueError, match=r"differ in length: \[1, 2\]"):
+            write_csv(io.BytesIO(), {"a": [1], "b": [1, 2]})
@@ -2,9 +2,20 @@
 
 from __future__ import annotations
 
+import argparse
 import importlib.util
+import os
+import subprocess
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 # Load the script module directly since scripts/ is not a package
 _SCRIPT_PATH = Path(__file__).parent.parent.parent / "scripts" / "export_corpus.py"
@@ -14,48 +25,25 @@ _mod = importlib.util.module_from_spec(_spec)
 sys.modules["export_corpus"] = _mod
 _spec.loader.exec_module(_mod)
 
-extract_functions = _mod.extract_functions  # type: ignore[attr-defined]
 build_corpus = _mod.build_corpus  # type: ignore[attr-defined]
+iter_records = _mod.iter_records  # type: ignore[attr-defined]
+write_parquet = _mod.write_parquet  # type: ignore[attr-defined]
+main = _mod.main  # type: ignore[attr-defined]
+ParseCache = _mod.ParseCache  # type: ignore[attr-defined]
+export_incremental = _mod.export_incremental  # type: ignore[attr-defined]
+load_manifest = _mod.load_manifest  # type: ignore[attr-defined]
+export_options = _mod.export_options  # type: ignore[attr-defined]
+manifest_path_for = _mod.manifest_path_for  # type: ignore[attr-defined]
+discover_sources = _mod.discover_sources  # type: ignore[attr-defined]
+snapshot_tree = _mod.snapshot_tree  # type: ignore[attr-defined]
+watch_changes = _mod.watch_changes  # type: ignore[attr-defined]
+parse_size = _mod.parse_size  # type: ignore[attr-defined]
+write_shards = _mod.write_shards  # type: ignore[attr-defined]
+shard_summary = _mod.shard_summary  # type: ignore[attr-defined]
+write_records = _mod.write_records  # type: ignore[attr-defined]
+read_rows = _mod.read_rows  # type: ignore[attr-defined]
 
-
-class TestExtractFunctions:
-    """Test suite for extract_functions."""
-
-    def test_single_function(self) -> None:
-        """Extracts a single function definition."""
-        source = 'def hello():\n    """Say hello."""\n    return "hi"\n'
-        funcs = extract_functions(source)
-        assert len(funcs) == 1
-        assert funcs[0]["name"] == "hello"
-
-    def test_multiple_functions(self) -> None:
-        """Extracts multiple function definitions."""
-        source = "def a():\n    pass\n\ndef b():\n    pass\n"
-        funcs = extract_functions(source)
-        assert len(funcs) == 2
-        names = [f["name"] for f in funcs]
-        assert "a" in names
-        assert "b" in names
-
-    def test_no_functions(self) -> None:
-        """Empty source returns empty list."""
-        assert extract_functions("x = 1\n") == []
-
-    def test_function_with_docstring(self) -> None:
-        """Docstring is extracted."""
-        source = 'def greet():\n    """Greet someone."""\n    pass\n'
-        funcs = extract_functions(source)
-        assert funcs[0]["docstring"] == "Greet someone."
-
-    def test_function_line_number(self) -> None:
-        """Line number is captured."""
-        source = "# comment\ndef foo():\n    pass\n"
-        funcs = extract_functions(source)
-        assert funcs[0]["line_number"] == 2
-
-    def test_empty_source(self) -> None:
-        """Empty string returns empty list."""
-        assert extract_functions("") == []
+SRC_DIR = Path(__file__).parent.parent.parent / "src" / "reprorusted_std_only"
 
 
 class TestBuildCorpus:
@@ -85,6 +73,14 @@ class TestBuildCorpus:
         """Empty directory returns empty list."""
         assert build_corpus(tmp_path) == []
 
+    def test_cache_shared_across_runs(self, tmp_path: Path) -> None:
+        """A second build with the same cache does not parse again."""
+        first = ParseCache(tmp_path)
+        records = build_corpus(SRC_DIR, cache=first)
+        second = ParseCache(tmp_path)
+        assert build_corpus(SRC_DIR, cache=second) == records
+        assert (second.hits, second.misses) == (len(records), 0)
+
     def test_categories_extracted(self) -> None:
         """Categories are extracted from directory structure."""
         src_dir = Path(__file__).parent.parent.parent / "src" / "reprorusted_std_only"
@@ -92,3 +88,589 @@ class TestBuildCorpus:
         categories = {r["category"] for r in records}
         assert "builtins" in categories
         assert "collections" in categories
+
+
+class TestParallelExport:
+    """Test suite for the process-pool streaming export."""
+
+    def test_parallel_matches_serial_order(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Pool mode yields the same records in the same order."""
+        monkeypatch.setattr(_mod, "CHUNK_SIZE", 3)
+        serial = build_corpus(SRC_DIR)
+        parallel = build_corpus(SRC_DIR, jobs=2)
+        assert parallel == serial
+
+    def test_parallel_output_byte_identical(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Parquet bytes do not depend on the number of workers."""
+        monkeypatch.setattr(_mod, "CHUNK_SIZE", 2)
+        serial_path = tmp_path / "serial.parquet"
+        parallel_path = tmp_path / "parallel.parquet"
+        write_parquet(iter_records(SRC_DIR), serial_path, batch_size=4)
+        write_parquet(iter_records(SRC_DIR, jobs=3), parallel_path, batch_size=4)
+        assert serial_path.read_bytes() == parallel_path.read_bytes()
+
+    def test_batches_become_row_groups(self, tmp_path: Path) -> None:
+        """Each record batch is written as its own row group."""
+        out = tmp_path / "corpus.parquet"
+        rows, categories = write_parquet(iter_records(SRC_DIR), out, batch_size=8)
+        meta = pq.ParquetFile(out).metadata
+        assert meta.num_rows == rows
+        assert meta.num_row_groups == -(-rows // 8)
+        assert "collections" in categories
+
+    def test_main_writes_output(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Main exports to the requested path."""
+        out = tmp_path / "nested" / "corpus.parquet"
+        args = ["--output", str(out), "--batch-size", "5", "--no-cache"]
+        assert main(args) == 0
+        assert out.exists()
+        assert "Exported" in capsys.readouterr().out
+
+    def test_main_rejects_negative_jobs(self) -> None:
+        """Negative worker counts are a usage error."""
+        with pytest.raises(SystemExit):
+            main(["--jobs", "-1"])
+
+
+_TREE = {
+    "a/one.py": "def f():\n    pass\n",
+    "a/two.py": "x = 1\n",
+    "b/three.py": "def g():\n    pass\n\ndef h():\n    pass\n",
+}
+
+
+def _make_tree(root: Path, modules: dict[str, str]) -> Path:
+    """Write a small source tree of ``modules`` under ``root``."""
+    for name, body in modules.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body)
+    return root
+
+
+class TestIncrementalExport:
+    """Test suite for manifest-driven incremental export."""
+
+    def test_first_run_is_full_export(self, tmp_path: Path) -> None:
+        """Without a manifest every module is extracted."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.parquet"
+        assert export_incremental(src, out) == (3, 3, 0)
+        assert manifest_path_for(out).exists()
+
+    def test_no_change_is_noop(self, tmp_path: Path) -> None:
+        """An unchanged tree leaves the output untouched."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.parquet"
+        export_incremental(src, out)
+        mtime = out.stat().st_mtime_ns
+        assert export_incremental(src, out) is None
+        assert out.stat().st_mtime_ns == mtime
+
+    def test_touch_without_edit_is_noop(self, tmp_path: Path) -> None:
+        """A new mtime with identical content is not re-extracted."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.parquet"
+        export_incremental(src, out)
+        target = src / "a" / "two.py"
+        st = target.stat()
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert export_incremental(src, out) is None
+        entry = load_manifest(manifest_path_for(out))["a/two.py"]
+        assert entry["mtime_ns"] == st.st_mtime_ns + 10**9
+
+    def test_merge_matches_full_export(self, tmp_path: Path) -> None:
+        """Edits, additions and deletions merge to a full-export result."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.parquet"
+        export_incremental(src, out)
+
+        (src / "a" / "one.py").write_text("def f():\n    return 1\n\n\n")
+        (src / "b" / "three.py").unlink()
+        (src / "a" / "zero.py").write_text("def z():\n    pass\n")
+        assert export_incremental(src, out) == (3, 2, 1)
+
+        full = tmp_path / "full.parquet"
+        write_parquet(iter_records(src), full)
+        assert out.read_bytes() == full.read_bytes()
+
+    def test_formats_keep_separate_manifests(self, tmp_path: Path) -> None:
+        """Outputs sharing a stem do not share a manifest."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        parquet, arrow = tmp_path / "corpus.parquet", tmp_path / "corpus.arrow"
+        export_incremental(src, parquet)
+        assert manifest_path_for(parquet) != manifest_path_for(arrow)
+        assert export_incremental(src, arrow, fmt="arrow") == (3, 3, 0)
+        assert export_incremental(src, parquet) is None
+        assert export_incremental(src, arrow, fmt="arrow") is None
+
+    def test_format_change_triggers_full_export(self, tmp_path: Path) -> None:
+        """A manifest written for another format is not trusted."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.out"
+        export_incremental(src, out, fmt="jsonl")
+        manifest = manifest_path_for(out)
+        assert load_manifest(manifest, export_options("jsonl")) is not None
+        assert load_manifest(manifest, export_options("arrow")) is None
+        assert export_incremental(src, out, fmt="arrow") == (3, 3, 0)
+        assert [r["module"] for r in read_rows(out, "arrow")] == [
+            "a/one.py",
+            "a/two.py",
+            "b/three.py",
+        ]
+
+    def test_corrupt_manifest_triggers_full_export(self, tmp_path: Path) -> None:
+        """An unreadable manifest falls back to a full export."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.parquet"
+        export_incremental(src, out)
+        manifest_path_for(out).write_text("{not json")
+        assert export_incremental(src, out) == (3, 3, 0)
+
+    def test_main_incremental(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Second incremental run through main reports up to date."""
+        out = tmp_path / "corpus.parquet"
+        assert main(["--output", str(out), "--incremental"]) == 0
+        assert main(["--output", str(out), "--incremental"]) == 0
+        assert "Up to date" in capsys.readouterr().out
+
+    def test_full_export_drops_stale_manifest(self, tmp_path: Path) -> None:
+        """A non-incremental export removes the previous manifest."""
+        out = tmp_path / "corpus.parquet"
+        main(["--output", str(out), "--incremental"])
+        main(["--output", str(out)])
+        assert not manifest_path_for(out).exists()
+
+
+class TestShardedExport:
+    """Test suite for size-targeted shards and their _metadata summary."""
+
+    def test_parse_size(self) -> None:
+        """Sizes accept binary suffixes with or without B/iB."""
+        assert parse_size("1000") == 1000
+        assert parse_size("128MB") == 128 * 1024**2
+        assert parse_size("64KiB") == 64 * 1024
+        assert parse_size("2g") == 2 * 1024**3
+
+    @pytest.mark.parametrize("text", ["", "0", "12XB", "-5", "1.5MB"])
+    def test_parse_size_rejects(self, text: str) -> None:
+        """Malformed or zero sizes are usage errors."""
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_size(text)
+
+    def test_shards_concatenate_to_single_file(self, tmp_path: Path) -> None:
+        """Shards read back in order equal the unsharded export."""
+        shard_dir = tmp_path / "corpus"
+        rows, _, shards = write_shards(
+            iter_records(SRC_DIR), shard_dir, 4096, batch_size=2
+        )
+        assert shards > 1
+        parts = sorted(shard_dir.glob("part-*.parquet"))
+        assert len(parts) == shards
+        merged = pa.concat_tables(pq.read_table(p) for p in parts)
+        single = tmp_path / "single.parquet"
+        write_parquet(iter_records(SRC_DIR), single, batch_size=2)
+        assert merged.equals(pq.read_table(single))
+        assert merged.num_rows == rows
+
+    def test_shard_size_targeted(self, tmp_path: Path) -> None:
+        """Every shard but the last reaches the target size."""
+        shard_dir = tmp_path / "corpus"
+        write_shards(iter_records(SRC_DIR), shard_dir, 8192, batch_size=1)
+        sizes = [p.stat().st_size for p in sorted(shard_dir.glob("part-*.parquet"))]
+        assert all(size >= 8192 for size in sizes[:-1])
+
+    def test_summary_lists_rows_and_category_ranges(self, tmp_path: Path) -> None:
+        """_metadata alone gives each shard's rows and category range."""
+        shard_dir = tmp_path / "corpus"
+        records = build_corpus(SRC_DIR)
+        write_shards(records, shard_dir, 4096, batch_size=2)
+        summary = shard_summary(shard_dir)
+        assert sum(s["rows"] for s in summary) == len(records)
+        start = 0
+        for shard in summary:
+            chunk = records[start : start + shard["rows"]]
+            assert shard["min_category"] == chunk[0]["category"]
+            assert shard["max_category"] == chunk[-1]["category"]
+            start += shard["rows"]
+
+    def test_rewrite_replaces_old_shards(self, tmp_path: Path) -> None:
+        """A second export leaves no shards from the first behind."""
+        shard_dir = tmp_path / "corpus"
+        write_shards(iter_records(SRC_DIR), shard_dir, 1024, batch_size=1)
+        _, _, shards = write_shards(iter_records(SRC_DIR), shard_dir, 10**9)
+        assert shards == 1
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["corpus"]
+        assert len(list(shard_dir.glob("part-*.parquet"))) == 1
+
+    def test_failed_write_keeps_previous_shards(self, tmp_path: Path) -> None:
+        """An error mid-export leaves the previous directory untouched."""
+        shard_dir = tmp_path / "corpus"
+        write_shards(iter_records(SRC_DIR), shard_dir, 10**9)
+
+        def broken() -> Iterator[dict]:
+            yield from build_corpus(SRC_DIR)[:3]
+            raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            write_shards(broken(), shard_dir, 1024, batch_size=1)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["corpus"]
+        assert len(shard_summary(shard_dir)) == 1
+
+    def test_main_sharded(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Main writes shards into a directory named after --output."""
+        out = tmp_path / "corpus.parquet"
+        args = ["--output", str(out), "--shard-bytes", "4KB", "--no-cache"]
+        assert main([*args, "--batch-size", "2"]) == 0
+        assert (tmp_path / "corpus" / "_metadata").exists()
+        assert not out.exists()
+        assert "shards" in capsys.readouterr().out
+
+    def test_main_rejects_sharded_incremental(self) -> None:
+        """Sharding only applies to full exports."""
+        with pytest.raises(SystemExit):
+            main(["--shard-bytes", "1MB", "--incremental"])
+
+
+class TestExportFormats:
+    """Test suite for the Arrow IPC and stdlib JSON Lines formats."""
+
+    def test_schema_columns_match(self) -> None:
+        """The stdlib column lists mirror the Arrow schemas."""
+        assert _mod.CORPUS_SCHEMA.names == list(_mod.CORPUS_COLUMNS)
+        assert _mod.FUNCTION_SCHEMA.names == list(_mod.FUNCTION_COLUMNS)
+
+    @pytest.mark.parametrize("fmt", ["arrow", "jsonl"])
+    def test_rows_match_parquet(self, tmp_path: Path, fmt: str) -> None:
+        """Both tables hold the same rows as the Parquet export."""
+        suffix = _mod.FORMATS[fmt]
+        out, functions = tmp_path / f"c{suffix}", tmp_path / f"f{suffix}"
+        write_records(iter_records(SRC_DIR), out, 4, functions, fmt=fmt)
+        ref, ref_functions = tmp_path / "c.parquet", tmp_path / "f.parquet"
+        write_parquet(iter_records(SRC_DIR), ref, 4, ref_functions)
+        assert list(read_rows(out, fmt)) == list(read_rows(ref))
+        assert list(read_rows(functions, fmt)) == list(read_rows(ref_functions))
+
+    def test_arrow_memory_map_is_zero_copy(self, tmp_path: Path) -> None:
+        """Reading the uncompressed IPC file allocates no Arrow buffers."""
+        out = tmp_path / "corpus.arrow"
+        write_records(iter_records(SRC_DIR), out, fmt="arrow")
+        before = pa.total_allocated_bytes()
+        with pa.memory_map(str(out)) as source:
+            table = pa.ipc.open_file(source).read_all()
+            assert table.num_rows > 0
+            assert pa.total_allocated_bytes() == before
+
+    def test_jsonl_output_deterministic(self, tmp_path: Path) -> None:
+        """The gzip stream carries no timestamp or file name."""
+        first, second = tmp_path / "a.jsonl.gz", tmp_path / "b.jsonl.gz"
+        write_records(iter_records(SRC_DIR), first, fmt="jsonl")
+        write_records(iter_records(SRC_DIR), second, fmt="jsonl")
+        assert first.read_bytes() == second.read_bytes()
+
+    @pytest.mark.parametrize("fmt", ["arrow", "jsonl"])
+    def test_incremental_merge(self, tmp_path: Path, fmt: str) -> None:
+        """Incremental export reads back and merges every format."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / f"corpus{_mod.FORMATS[fmt]}"
+        export_incremental(src, out, fmt=fmt)
+        (src / "a" / "one.py").write_text("def f():\n    return 1\n")
+        assert export_incremental(src, out, fmt=fmt) == (3, 1, 0)
+
+        full = tmp_path / f"full{_mod.FORMATS[fmt]}"
+        write_records(iter_records(src), full, fmt=fmt)
+        assert list(read_rows(out, fmt)) == list(read_rows(full, fmt))
+
+    def test_failed_write_leaves_no_file(self, tmp_path: Path) -> None:
+        """An error mid-stream removes the temporary JSON Lines file."""
+
+        def broken() -> Iterator[dict]:
+            yield from build_corpus(SRC_DIR)[:2]
+            raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            write_records(broken(), tmp_path / "c.jsonl.gz", fmt="jsonl")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_default_paths_follow_format(self) -> None:
+        """Without --output both tables get the format's suffix."""
+        args = _mod.parse_args(["--format", "arrow"])
+        assert args.output == _mod.DEFAULT_OUTPUT.with_name("corpus.arrow")
+        assert args.functions_output.name == "functions.arrow"
+
+    def test_main_rejects_sharded_arrow(self) -> None:
+        """Sharding is Parquet-only."""
+        with pytest.raises(SystemExit):
+            main(["--format", "arrow", "--shard-bytes", "1MB"])
+
+    def test_export_without_pyarrow(self, tmp_path: Path) -> None:
+        """Without pyarrow the exporter falls back to stdlib JSON Lines."""
+        script = (
+            "import sys\n"
+            "sys.modules['pyarrow'] = None\n"
+            f"sys.path.insert(0, {str(_SCRIPT_PATH.parent)!r})\n"
+            "import export_corpus\n"
+            "assert export_corpus.DEFAULT_FORMAT == 'jsonl'\n"
+            "out = sys.argv[1]\n"
+            "sys.exit(export_corpus.main(['--output', out, '--no-cache']))\n"
+        )
+        out = tmp_path / "corpus.jsonl.gz"
+        run = subprocess.run(
+            [sys.executable, "-c", script, str(out)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert run.returncode == 0, run.stderr
+        assert len(list(read_rows(out, "jsonl"))) == len(build_corpus(SRC_DIR))
+        assert (tmp_path / "functions.jsonl.gz").exists()
+
+        rejected = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                script.replace("'--no-cache'", "'--format', 'parquet'"),
+                str(out),
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert rejected.returncode == 2
+        assert "requires pyarrow" in rejected.stderr
+
+
+class TestWatchMode:
+    """Test suite for --watch polling and re-export."""
+
+    def test_snapshot_matches_discovery(self, tmp_path: Path) -> None:
+        """The scandir snapshot covers the modules discover_sources finds."""
+        src = _make_tree(tmp_path / "src", {**_TREE, "a/__init__.py": ""})
+        snapshot = snapshot_tree(src)
+        assert sorted(snapshot) == sorted(discover_sources(src))
+        assert snapshot[src / "a" / "two.py"][0] == len("x = 1\n")
+
+    def test_yields_again_only_after_change(self, tmp_path: Path) -> None:
+        """Polls of an unchanged tree sleep; an edit yields the tree again."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        sleeps: list[float] = []
+
+        def fake_sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            if len(sleeps) == 2:
+                (src / "c.py").write_text("y = 2\n")
+
+        changes = watch_changes(src, 0.1, fake_sleep)
+        assert src / "c.py" not in next(changes)
+        assert next(changes) == discover_sources(src)
+        assert sleeps == [0.1, 0.1]
+
+    def test_main_watch_reexports_and_survives_errors(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Edits are re-exported, a syntax error keeps the last good output."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.parquet"
+        edits = iter(
+            [
+                lambda: (src / "a" / "two.py").write_text("def two():\n    pass\n"),
+                lambda: (src / "a" / "one.py").write_text("def (:\n"),
+            ]
+        )
+
+        def fake_sleep(_: float) -> None:
+            edit = next(edits, None)
+            if edit is None:
+                raise KeyboardInterrupt
+            edit()
+
+        real_watch = _mod.watch_changes  # type: ignore[attr-defined]
+        monkeypatch.setattr(_mod, "SRC_DIR", src)
+        monkeypatch.setattr(
+            _mod, "watch_changes", lambda d, i: real_watch(d, i, fake_sleep)
+        )
+        assert main(["--output", str(out), "--watch", "--no-cache"]) == 0
+
+        captured = capsys.readouterr()
+        assert "Re-extracted: 3, deleted: 0" in captured.out
+        assert "Re-extracted: 1, deleted: 0" in captured.out
+        assert "Export failed" in captured.err
+        table = pq.read_table(out)
+        assert table.column("function_count").to_pylist() == [1, 1, 2]
+
+    def test_interval_must_be_positive(self) -> None:
+        """A zero poll interval is rejected."""
+        with pytest.raises(SystemExit):
+            main(["--watch", "--interval", "0"])
+
+
+class TestFunctionTable:
+    """Test suite for the per-function Parquet table."""
+
+    def test_one_row_per_function(self, tmp_path: Path) -> None:
+        """Row count matches the per-module function counts."""
+        out = tmp_path / "corpus.parquet"
+        functions = tmp_path / "functions.parquet"
+        records = build_corpus(SRC_DIR)
+        write_parquet(records, out, functions_path=functions)
+        table = pq.read_table(functions)
+        assert table.num_rows == sum(r["function_count"] for r in records)
+        assert (
+            "def count_words"
+            in table.column("source").to_pylist()[
+                table.column("name").to_pylist().index("count_words")
+            ]
+        )
+
+    def test_qualified_method_names(self, tmp_path: Path) -> None:
+        """Methods are exported with their class-qualified name."""
+        out = tmp_path / "corpus.parquet"
+        functions = tmp_path / "functions.parquet"
+        write_parquet(iter_records(SRC_DIR), out, functions_path=functions)
+        table = pq.read_table(functions, filters=[("category", "==", "dataclasses")])
+        assert "Point.distance" in table.column("qualname").to_pylist()
+        assert table.column("is_async").to_pylist() == [False] * table.num_rows
+
+    def test_row_groups_hold_one_category(self, tmp_path: Path) -> None:
+        """Every row group has min == max category statistics."""
+        out = tmp_path / "corpus.parquet"
+        functions = tmp_path / "functions.parquet"
+        write_parquet(iter_records(SRC_DIR), out, functions_path=functions)
+        meta = pq.ParquetFile(functions).metadata
+        column = meta.schema.names.index("category")
+        seen = []
+        for i in range(meta.num_row_groups):
+            stats = meta.row_group(i).column(column).statistics
+            assert stats is not None
+            assert stats.min == stats.max
+            seen.append(stats.min)
+        assert len(seen) == len(set(seen))
+
+    def test_category_filter_pushdown(self, tmp_path: Path) -> None:
+        """Filtering by category returns only that category's functions."""
+        out = tmp_path / "corpus.parquet"
+        functions = tmp_path / "functions.parquet"
+        write_parquet(iter_records(SRC_DIR), out, functions_path=functions)
+        table = pq.read_table(
+            functions, filters=[("category", "==", "hashlib_secrets")]
+        )
+        assert table.column("name").to_pylist() == ["sha256_hex"]
+
+    def test_dictionary_encoded_columns(self, tmp_path: Path) -> None:
+        """Module and category are Arrow dictionary columns."""
+        out = tmp_path / "corpus.parquet"
+        functions = tmp_path / "functions.parquet"
+        write_parquet(iter_records(SRC_DIR), out, functions_path=functions)
+        schema = pq.read_schema(functions)
+        assert str(schema.field("category").type).startswith("dictionary")
+        assert str(schema.field("module").type).startswith("dictionary")
+
+    def test_large_category_split_by_batch_size(self, tmp_path: Path) -> None:
+        """A category larger than the batch size spans several row groups."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.parquet"
+        functions = tmp_path / "functions.parquet"
+        write_parquet(iter_records(src), out, batch_size=1, functions_path=functions)
+        assert pq.ParquetFile(functions).metadata.num_row_groups == 3
+
+    def test_failed_write_leaves_no_file(self, tmp_path: Path) -> None:
+        """An error mid-stream does not publish a partial table."""
+        functions = tmp_path / "functions.parquet"
+
+        def broken() -> Iterator[dict]:
+            yield from iter_records(SRC_DIR)
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            write_parquet(broken(), tmp_path / "c.parquet", functions_path=functions)
+        assert not functions.exists()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_incremental_rewrites_functions(self, tmp_path: Path) -> None:
+        """Incremental merge regenerates the table for kept modules too."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.parquet"
+        functions = tmp_path / "functions.parquet"
+        export_incremental(src, out, functions_path=functions)
+        (src / "a" / "two.py").write_text("def two():\n    pass\n")
+        assert export_incremental(src, out, functions_path=functions) == (3, 1, 0)
+        names = pq.read_table(functions).column("name").to_pylist()
+        assert names == ["f", "two", "g", "h"]
+
+    def test_kept_modules_not_reparsed(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Without a cache only changed modules are analyzed again."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.parquet"
+        functions = tmp_path / "functions.parquet"
+        export_incremental(src, out, functions_path=functions)
+        parsed: list[str] = []
+        analyze_source = _mod.analyze_source
+
+        def analyze(content: str) -> dict:
+            parsed.append(content)
+            return analyze_source(content)
+
+        monkeypatch.setattr(_mod, "analyze_source", analyze)
+        (src / "a" / "two.py").write_text("def two():\n    pass\n")
+        assert export_incremental(src, out, functions_path=functions) == (3, 1, 0)
+        assert parsed == ["def two():\n    pass\n"]
+        full = tmp_path / "full.parquet"
+        write_parquet(iter_records(src), tmp_path / "c.parquet", functions_path=full)
+        assert functions.read_bytes() == full.read_bytes()
+
+    def test_skipped_functions_run_invalidates_manifest(self, tmp_path: Path) -> None:
+        """A run without the table leaves it stale, so the next run redoes it."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.parquet"
+        functions = tmp_path / "functions.parquet"
+        export_incremental(src, out, functions_path=functions)
+        (src / "a" / "two.py").write_text("def two():\n    pass\n")
+        assert export_incremental(src, out) == (3, 3, 0)
+        assert export_incremental(src, out, functions_path=functions) == (3, 3, 0)
+        names = pq.read_table(functions).column("name").to_pylist()
+        assert names == ["f", "two", "g", "h"]
+
+    def test_batch_size_change_forces_export(self, tmp_path: Path) -> None:
+        """Row groups follow the batch size, so changing it rewrites the file."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.parquet"
+        export_incremental(src, out)
+        assert export_incremental(src, out, batch_size=1) == (3, 3, 0)
+        assert pq.ParquetFile(out).num_row_groups == 3
+
+    def test_missing_functions_output_forces_export(self, tmp_path: Path) -> None:
+        """A deleted functions table is not treated as up to date."""
+        src = _make_tree(tmp_path / "src", _TREE)
+        out = tmp_path / "corpus.parquet"
+        functions = tmp_path / "functions.parquet"
+        export_incremental(src, out, functions_path=functions)
+        functions.unlink()
+        assert export_incremental(src, out, functions_path=functions) == (3, 3, 0)
+        assert functions.exists()
+
+    def test_main_writes_functions_beside_output(self, tmp_path: Path) -> None:
+        """By default the functions table lands next to the corpus."""
+        out = tmp_path / "corpus.parquet"
+        assert main(["--output", str(out), "--no-cache"]) == 0
+        assert (tmp_path / "functions.parquet").exists()
+
+    def test_main_no_functions(self, tmp_path: Path) -> None:
+        """--no-functions skips the table."""
+        out = tmp_path / "corpus.parquet"
+        assert main(["--output", str(out), "--no-functions", "--no-cache"]) == 0
+        assert not (tmp_path / "functions.parquet").exists()
@@ -1,12 +1,116 @@
-"""Tests for json.loads_dumps_example module."""
+"""Tests for the json example modules."""
 
 from __future__ import annotations
 
+import contextlib
+import dataclasses
+import io
 import json
+import runpy
+import sys
+import tracemalloc
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
+from reprorusted_std_only.json.batch_example import (
+    MAX_REPORTED,
+    JsonlStats,
+    canonicalize_jsonl,
+    main,
+)
+from reprorusted_std_only.json.bytes_example import canonicalize_into, is_canonical
 from reprorusted_std_only.json.loads_dumps_example import json_roundtrip
+from reprorusted_std_only.json.query_example import parse_path, query, query_many
+from reprorusted_std_only.json.stream_example import (
+    iter_canonical,
+    iter_events,
+    iter_items,
+)
+from reprorusted_std_only.json.typed_example import (
+    compile_decoder,
+    decode_json,
+    decode_json_list,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Nesting, escapes, non-ASCII text, duplicate keys and every scalar type
+_DOC = (
+    '{"z": [1, -2.5e-3, 12345678901234567890, true, false, null],\n'
+    ' "a": {"q\\"uote": "line\\nbreak \\u00e9 \u00e9 \U0001f600", "n": {}},\n'
+    ' "m": [[], [{}], [[0.1]]], "a": {"dup": "last", "b": [NaN, -Infinity]}}'
+)
+
+
+@dataclasses.dataclass
+class _Tag:
+    name: str
+    weight: float = 1.0
+
+
+@dataclasses.dataclass
+class _Node:
+    id: int
+    label: str | None
+    tags: list[_Tag]
+    attrs: dict[str, Any] = dataclasses.field(default_factory=dict)
+    children: list[_Node] = dataclasses.field(default_factory=list)
+    active: bool = False
+    nothing: None = None
+
+
+@dataclasses.dataclass(slots=True)
+class _Slotted:
+    x: float
+
+
+@dataclasses.dataclass
+class _Checked:
+    x: int
+
+    def __post_init__(self) -> None:
+        if self.x < 0:
+            msg = "x must be non-negative"
+            raise ValueError(msg)
+
+
+@dataclasses.dataclass
+class _Derived:
+    x: float
+    double: float = dataclasses.field(init=False)
+
+    def __post_init__(self) -> None:
+        self.double = 2 * self.x
+
+
+@dataclasses.dataclass
+class _SlottedChild(_Slotted):
+    y: float = 0.0
+
+
+@dataclasses.dataclass
+class _CheckedChild(_Checked):
+    pass
+
+
+@dataclasses.dataclass(init=False)
+class _Scaled:
+    x: float
+
+    def __init__(self, x: float) -> None:
+        self.x = 10 * x
+
+
+@dataclasses.dataclass
+class _Single:
+    n: int
+
+
+@dataclasses.dataclass
+class _Empty:
+    pass
 
 
 class TestJsonRoundtrip:
@@ -50,3 +154,761 @@ class TestJsonRoundtrip:
         """Array of values roundtrips."""
         result = json_roundtrip("[1, 2, 3]")
         assert result == "[1, 2, 3]"
+
+
+class TestIterEvents:
+    """Test suite for iter_events function."""
+
+    def test_event_sequence(self) -> None:
+        """Containers, keys and scalars are reported in document order."""
+        events = list(iter_events(io.BytesIO(b'{"a": [1, {"b": null}], "c": ""}')))
+        assert events == [
+            ("start_object", None),
+            ("key", "a"),
+            ("start_array", None),
+            ("value", 1),
+            ("start_object", None),
+            ("key", "b"),
+            ("value", None),
+            ("end_object", None),
+            ("end_array", None),
+            ("key", "c"),
+            ("value", ""),
+            ("end_object", None),
+        ]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 16])
+    def test_tokens_split_across_chunks(self, chunk_size: int) -> None:
+        """Strings, numbers and literals cut by a chunk edge are rejoined."""
+        data = b'[123.25e+2, "\\u00e9\xc3\xa9", true, -Infinity, 0]'
+        values = [
+            v for e, v in iter_events(io.BytesIO(data), chunk_size) if e == "value"
+        ]
+        assert values == json.loads(data)
+
+    def test_long_token_reads_grow(self) -> None:
+        """A token far longer than a chunk takes a logarithmic number of reads."""
+        data = b'["' + b"x" * (1 << 20) + b'", 1]'
+        stream = io.BytesIO(data)
+        reads = []
+        read = stream.read
+        stream.read = lambda size: reads.append(size) or read(size)  # type: ignore[method-assign]
+        values = [v for e, v in iter_events(stream, 64) if e == "value"]
+        assert values == ["x" * (1 << 20), 1]
+        assert len(reads) < 40
+        assert max(reads) <= len(data)
+
+    def test_duplicate_keys_all_reported(self) -> None:
+        """Every key is an event, even when a later one repeats it."""
+        events = iter_events(io.BytesIO(b'{"k": 1, "k": 2}'))
+        assert [v for e, v in events if e == "key"] == ["k", "k"]
+
+    def test_deep_nesting(self) -> None:
+        """Nesting deeper than the recursion limit still parses."""
+        data = b"[" * 5000 + b"]" * 5000
+        assert sum(1 for _ in iter_events(io.BytesIO(data), 512)) == 10_000
+
+    def test_path_input(self, tmp_path: Path) -> None:
+        """Paths (str or PathLike) are opened and read."""
+        path = tmp_path / "doc.json"
+        path.write_bytes(b"[1]")
+        expected = [("start_array", None), ("value", 1), ("end_array", None)]
+        assert list(iter_events(path)) == expected
+        assert list(iter_events(str(path))) == expected
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"",
+            b"  ",
+            b"[",
+            b"[1,]",
+            b"[1 2]",
+            b"[1]]",
+            b"[}",
+            b"]",
+            b"{1: 2}",
+            b'{"a"}',
+            b'{"a\x01": 1}',
+            b'{"a": 1,}',
+            b'{"a": 1 "b": 2}',
+            b'"abc',
+            b'["\\x"]',
+            b"[tru]",
+            b"[-]",
+            b"[1.]",
+            b"01",
+        ],
+    )
+    @pytest.mark.parametrize("chunk_size", [1, 1 << 16])
+    def test_malformed_raises(self, data: bytes, chunk_size: int) -> None:
+        """Malformed documents raise JSONDecodeError, like json.loads."""
+        with pytest.raises(json.JSONDecodeError):
+            json.loads(data)
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_events(io.BytesIO(data), chunk_size))
+
+    def test_type_error_text_stream(self) -> None:
+        """Text streams are rejected."""
+        with pytest.raises(TypeError, match="binary file"):
+            iter_events(io.StringIO("[]"))  # type: ignore[arg-type]
+
+    def test_value_error_chunk_size(self) -> None:
+        """A non-positive chunk size raises ValueError."""
+        with pytest.raises(ValueError, match="chunk_size must be positive"):
+            iter_events(io.BytesIO(b"[]"), 0)
+
+
+class TestIterItems:
+    """Test suite for iter_items function."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+    def test_matches_json_loads(self, chunk_size: int) -> None:
+        """Items equal the elements json.loads returns."""
+        data = f"[{_DOC}, [{_DOC}], 3, {{}}]".encode()
+        items = list(iter_items(io.BytesIO(data), chunk_size))
+        assert repr(items) == repr(json.loads(data))
+
+    def test_trailing_data_raises(self) -> None:
+        """Anything after the array is rejected."""
+        with pytest.raises(json.JSONDecodeError, match="Extra data"):
+            list(iter_items(io.BytesIO(b"[1] 2")))
+
+    def test_not_an_array(self) -> None:
+        """A top-level scalar or object raises ValueError."""
+        with pytest.raises(ValueError, match="not an array"):
+            list(iter_items(io.BytesIO(b"1")))
+
+    def test_empty_document(self) -> None:
+        """An empty file raises JSONDecodeError, as json.loads does."""
+        with pytest.raises(json.JSONDecodeError, match="Expecting value"):
+            list(iter_items(io.BytesIO(b"")))
+
+
+class TestIterCanonical:
+    """Test suite for iter_canonical function."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 1 << 16])
+    @pytest.mark.parametrize("flush_size", [1, 64, 1 << 16])
+    def test_matches_json_roundtrip(self, chunk_size: int, flush_size: int) -> None:
+        """The joined output equals json_roundtrip of the whole document."""
+        for text in (_DOC, f"[{_DOC}, [[{_DOC}]], 1]", '"s"', "[]", "{}"):
+            pieces = iter_canonical(io.BytesIO(text.encode()), chunk_size, flush_size)
+            assert "".join(pieces) == json_roundtrip(text)
+
+    def test_pieces_bounded_by_flush_size(self) -> None:
+        """Output is yielded in pieces once flush_size is reached."""
+        data = json.dumps(list(range(1000))).encode()
+        pieces = list(iter_canonical(io.BytesIO(data), flush_size=100))
+        assert len(pieces) > 10
+        assert max(map(len, pieces)) < 200
+
+    def test_constant_memory(self, tmp_path: Path) -> None:
+        """Peak memory does not grow with the length of an array of records."""
+        peaks = []
+        for records in (4_000, 40_000):
+            path = tmp_path / f"{records}.json"
+            with path.open("w") as f:
+                f.write("[")
+                for i in range(records):
+                    f.write(f'{{"id": {i}, "tags": ["x", "y"], "name": "n{i}"}},\n')
+                f.write("null]")
+            tracemalloc.start()
+            written = sum(map(len, iter_canonical(path, 1 << 14, 1 << 14)))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            assert written > path.stat().st_size // 2
+        assert peaks[1] < peaks[0] * 1.5
+        assert peaks[1] < path.stat().st_size // 10
+
+    def test_value_error_flush_size(self) -> None:
+        """A non-positive flush size raises ValueError."""
+        with pytest.raises(ValueError, match="flush_size must be positive"):
+            iter_canonical(io.BytesIO(b"[]"), flush_size=0)
+
+    def test_type_error_int(self) -> None:
+        """Non-file input raises TypeError."""
+        with pytest.raises(TypeError, match="expected a path"):
+            iter_canonical(42)  # type: ignore[arg-type]
+
+
+def _jsonl(records: int) -> bytes:
+    """Return ``records`` JSONL lines with unsorted keys, every 7th malformed."""
+    lines = []
+    for i in range(records):
+        if i % 7 == 3:
+            lines.append(f'{{"id": {i}, broken')
+        else:
+            lines.append(json.dumps({"z": [i, {"b": None, "a": "\u00e9"}], "id": i}))
+    return ("\n".join(lines) + "\n").encode()
+
+
+class TestCanonicalizeJsonl:
+    """Test suite for canonicalize_jsonl function."""
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    @pytest.mark.parametrize("block_size", [1, 100, 1 << 20])
+    def test_matches_json_roundtrip_in_order(self, jobs: int, block_size: int) -> None:
+        """Valid lines come out as json_roundtrip, in input order."""
+        data = _jsonl(200)
+        out = io.BytesIO()
+        stats = canonicalize_jsonl(io.BytesIO(data), out, jobs, block_size)
+        expected = []
+        for line in data.decode().splitlines():
+            with contextlib.suppress(json.JSONDecodeError):
+                expected.append(json_roundtrip(line) + "\n")
+        assert out.getvalue().decode() == "".join(expected)
+        assert (stats.lines, stats.written, stats.malformed) == (200, 171, 29)
+
+    def test_malformed_lines_reported(self) -> None:
+        """Malformed lines are counted exactly and the first ones numbered."""
+        stats = canonicalize_jsonl(io.BytesIO(_jsonl(500)), io.BytesIO(), 1, 64)
+        assert stats.malformed == 71
+        assert stats.malformed_lines == tuple(range(4, 7 * MAX_REPORTED, 7))
+
+    def test_blank_and_undecodable_lines(self) -> None:
+        """Blank lines are skipped; invalid UTF-8 only spoils its own line."""
+        data = b'\n  \r\n"\xff"\n[1]\r\n{"a": 1}'
+        out = io.BytesIO()
+        stats = canonicalize_jsonl(io.BytesIO(data), out, jobs=1)
+        assert out.getvalue() == b'[1]\n{"a": 1}\n'
+        assert stats.malformed_lines == (3,)
+        assert stats.lines == 5
+
+    def test_path_input_and_output(self, tmp_path: Path) -> None:
+        """Paths (str or PathLike) are opened and closed."""
+        source = tmp_path / "in.jsonl"
+        source.write_bytes(b'{"b": 2, "a": 1}\n')
+        target = tmp_path / "out.jsonl"
+        stats = canonicalize_jsonl(source, str(target), jobs=1)
+        assert target.read_bytes() == b'{"a": 1, "b": 2}\n'
+        assert isinstance(stats, JsonlStats)
+        assert stats.lines_per_second > 0
+
+    def test_value_error_same_file(self, tmp_path: Path) -> None:
+        """A target naming the source, even through a link, is not truncated."""
+        source = tmp_path / "in.jsonl"
+        source.write_bytes(b'{"b": 2, "a": 1}\n')
+        link = tmp_path / "link.jsonl"
+        link.symlink_to(source)
+        for target in (source, str(source), link):
+            with pytest.raises(ValueError, match="same file"):
+                canonicalize_jsonl(source, target, jobs=1)
+        assert source.read_bytes() == b'{"b": 2, "a": 1}\n'
+
+    def test_zero_seconds_rate(self) -> None:
+        """A zero duration reports infinite throughput instead of failing."""
+        assert JsonlStats(1, 1, 0, (), 0.0).lines_per_second == float("inf")
+
+    def test_type_error_text_target(self) -> None:
+        """Text streams are rejected."""
+        with pytest.raises(TypeError, match="binary file"):
+            canonicalize_jsonl(io.BytesIO(b""), io.StringIO())  # type: ignore[arg-type]
+
+    def test_value_error_jobs(self) -> None:
+        """Negative jobs raise ValueError."""
+        with pytest.raises(ValueError, match="jobs must be non-negative"):
+            canonicalize_jsonl(io.BytesIO(b""), io.BytesIO(), jobs=-1)
+
+    def test_value_error_block_size(self) -> None:
+        """A non-positive block size raises ValueError."""
+        with pytest.raises(ValueError, match="block_size must be positive"):
+            canonicalize_jsonl(io.BytesIO(b""), io.BytesIO(), block_size=0)
+
+
+class TestCanonicalizeJsonlMain:
+    """Test suite for the JSONL canonicalizer command line."""
+
+    def test_files(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Files are rewritten and the summary goes to stderr."""
+        source = tmp_path / "in.jsonl"
+        source.write_bytes(_jsonl(50))
+        target = tmp_path / "out.jsonl"
+        assert (
+            main([str(source), str(target), "--jobs", "2", "--block-size", "99"]) == 0
+        )
+        assert len(target.read_bytes().splitlines()) == 43
+        err = capsys.readouterr().err
+        assert "50 lines, 43 written, 7 malformed" in err
+        assert "malformed lines: 4, 11, 18, 25, 32, 39, 46\n" in err
+
+    def test_report_truncated(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Only the first malformed line numbers are listed."""
+        source = tmp_path / "in.jsonl"
+        source.write_bytes(b"x\n" * (MAX_REPORTED + 1))
+        main([str(source), str(tmp_path / "out.jsonl"), "--jobs", "1"])
+        assert capsys.readouterr().err.endswith(", ...\n")
+
+    def test_stdin_stdout(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A dash reads stdin or writes stdout."""
+        stdin = io.TextIOWrapper(io.BytesIO(b'{"b": 1, "a": 0}\n'))
+        stdout = io.TextIOWrapper(io.BytesIO())
+        monkeypatch.setattr("sys.stdin", stdin)
+        monkeypatch.setattr("sys.stdout", stdout)
+        assert main(["-", "-", "--jobs", "1"]) == 0
+        assert stdout.buffer.getvalue() == b'{"a": 0, "b": 1}\n'  # type: ignore[attr-defined]
+
+    def test_run_as_module(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """``python -m`` runs main and exits with its status."""
+        source = tmp_path / "in.jsonl"
+        source.write_bytes(b"[]\n")
+        argv = ["batch_example", str(source), str(tmp_path / "out.jsonl")]
+        monkeypatch.setattr("sys.argv", [*argv, "--jobs", "1"])
+        # runpy warns when the module it runs as __main__ is already imported
+        name = "reprorusted_std_only.json.batch_example"
+        monkeypatch.delitem(sys.modules, name)
+        with pytest.raises(SystemExit) as exc:
+            runpy.run_module(name, run_name="__main__")
+        assert exc.value.code == 0
+
+    @pytest.mark.parametrize("flag", [["--jobs", "-1"], ["--block-size", "0"]])
+    def test_invalid_arguments(self, flag: list[str]) -> None:
+        """Out-of-range options exit with a usage error."""
+        with pytest.raises(SystemExit):
+            main(["a", "b", *flag])
+
+    def test_same_file_rejected(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Rewriting a file onto itself is a usage error that leaves it intact."""
+        source = tmp_path / "in.jsonl"
+        source.write_bytes(b"[1]\n")
+        with pytest.raises(SystemExit):
+            main([str(source), str(tmp_path / "." / "in.jsonl")])
+        assert "different files" in capsys.readouterr().err
+        assert source.read_bytes() == b"[1]\n"
+
+
+class TestIsCanonical:
+    """Test suite for is_canonical function."""
+
+    def test_roundtrip_output_is_canonical(self) -> None:
+        """json_roundtrip output without escaped quotes is recognised."""
+        text = json_roundtrip(_DOC.replace('"a": {"dup"', '"x": {"dup"'))
+        text = text.replace('\\"', "")
+        assert is_canonical(text.encode())
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b'{"b": 1, "a": 2}',
+            b'{"a": 1, "a": 2}',
+            b'{"a": {"c": 1, "b": 2}}',
+            b"[1,2]",
+            b'{"a":1}',
+            b" [1]",
+            b"[1 ]",
+            b"[1,  2]",
+            b"[1,\n2]",
+            b"[1.50]",
+            b"[1E5]",
+            b"[-0]",
+            b'["\\/"]',
+            b'["\\u0041"]',
+            b'["\\u000a"]',
+            b'["\\u00E9"]',
+            b'["\x7f"]',
+            b'["\xc3\xa9"]',
+            b"[1, 2",
+            b"",
+            b'["a","b" ]',
+            b'{"a":"b" }',
+        ],
+    )
+    def test_rejected(self, data: bytes) -> None:
+        """Other spellings of the same value, and invalid JSON, are rejected."""
+        assert not is_canonical(data)
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b'[{"a": 1}, {"a": 2}]',
+            b'{"a": {"z": 1}, "b": 0}',
+            b'["\\u007f \\u00e9 \\n, x: y"]',
+            b"[-0.0, 1e-05, 1e+16, NaN, -Infinity, -0.5]",
+        ],
+    )
+    def test_accepted(self, data: bytes) -> None:
+        """Canonical documents pass, including key drops between objects."""
+        assert is_canonical(data)
+        assert json_roundtrip(data.decode()) == data.decode()
+
+
+class TestCanonicalizeInto:
+    """Test suite for canonicalize_into function."""
+
+    @pytest.mark.parametrize("detect", [False, True])
+    def test_matches_json_roundtrip(self, detect: bool) -> None:
+        """Output equals json_roundtrip, encoded, with or without detection."""
+        expected = json_roundtrip(_DOC).encode()
+        for data in (_DOC.encode(), expected):
+            out = bytearray()
+            assert canonicalize_into(data, out, detect) == len(expected)
+            assert out == expected
+
+    def test_buffer_reused(self) -> None:
+        """A bytearray is resized to each output in turn."""
+        out = bytearray()
+        canonicalize_into(b'{"long": "' + b"x" * 100 + b'"}', out)
+        canonicalize_into(b"[]", out)
+        assert out == b"[]"
+
+    @pytest.mark.parametrize("detect", [False, True])
+    def test_memoryview_input_and_output(self, detect: bool) -> None:
+        """Memoryviews work on both sides; the rest of the output is untouched."""
+        backing = bytearray(b"#" * 20)
+        data = memoryview(b'{"b":1,"a":0}')
+        n = canonicalize_into(data, memoryview(backing), detect)
+        assert (n, bytes(backing)) == (16, b'{"a": 0, "b": 1}####')
+
+    @pytest.mark.parametrize("data", [b'["a","b" ]', b'{"a":"b" }'])
+    def test_detect_rewrites_misplaced_spaces(self, data: bytes) -> None:
+        """Spaces after a string are not taken for those after "," or ":"."""
+        out = bytearray()
+        canonicalize_into(data, out, detect_canonical=True)
+        assert out == json_roundtrip(data.decode()).encode()
+
+    def test_memoryview_too_small(self) -> None:
+        """An output view shorter than the result raises ValueError."""
+        with pytest.raises(ValueError, match="need 16 bytes, have 15"):
+            canonicalize_into(b'{"b":1,"a":0}', memoryview(bytearray(15)))
+
+    @pytest.mark.parametrize("out", [b"", memoryview(b"x" * 8), [0] * 8])
+    def test_type_error_output(self, out: object) -> None:
+        """Read-only or non-buffer outputs raise TypeError."""
+        with pytest.raises(TypeError, match="bytearray or writable memoryview"):
+            canonicalize_into(b"[]", out)  # type: ignore[arg-type]
+
+    def test_invalid_json_raises(self) -> None:
+        """Invalid JSON raises JSONDecodeError, even with detection on."""
+        with pytest.raises(json.JSONDecodeError):
+            canonicalize_into(b"[1,", bytearray(), detect_canonical=True)
+
+    def test_invalid_utf8_raises(self) -> None:
+        """Bytes that are not UTF-8 raise UnicodeDecodeError."""
+        with pytest.raises(UnicodeDecodeError):
+            canonicalize_into(b'"\xff"', bytearray())
+
+
+class TestCompileDecoder:
+    """Test suite for compile_decoder."""
+
+    def test_nested_decoding(self) -> None:
+        """Nested dataclasses, lists, dicts, optionals and defaults."""
+        data = {
+            "id": 1,
+            "label": None,
+            "tags": [{"name": "a"}, {"name": "b", "weight": 2}],
+            "children": [{"id": 2, "label": "leaf", "tags": [], "active": True}],
+            "attrs": {"k": [1, {"x": None}]},
+        }
+        node = compile_decoder(_Node)(data)
+        assert node == _Node(
+            1,
+            None,
+            [_Tag("a"), _Tag("b", 2.0)],
+            {"k": [1, {"x": None}]},
+            [_Node(2, "leaf", [], active=True)],
+        )
+        assert type(node.tags[1].weight) is float
+
+    def test_cached_per_class(self) -> None:
+        """Each class compiles once."""
+        assert compile_decoder(_Tag) is compile_decoder(_Tag)
+        assert compile_decoder(_Tag) is not compile_decoder(_Node)
+
+    @pytest.mark.parametrize(
+        ("data", "message"),
+        [
+            (
+                {"id": True, "label": None, "tags": []},
+                "_Node.id: expected int, got bool",
+            ),
+            ({"id": 1, "label": 2, "tags": []}, "_Node.label: expected str, got int"),
+            ({"id": 1, "label": "", "tags": {}}, "_Node.tags: expected list, got dict"),
+            ({"id": 1, "label": "", "tags": [{}]}, "_Tag: missing field 'name'"),
+            ({"id": 1, "label": "", "tags": [], "attrs": []}, "expected dict, got"),
+            ({"id": 1, "label": "", "tags": [], "nothing": 0}, "expected NoneType"),
+            ({"id": 1, "label": "", "tags": [[]]}, "_Tag: expected a JSON object"),
+            (
+                {"id": 1, "label": "", "tags": [{"name": "a", "weight": "1"}]},
+                "_Tag.weight: expected float, got str",
+            ),
+        ],
+    )
+    def test_mismatch_raises(self, data: dict[str, object], message: str) -> None:
+        """Values of the wrong type or shape raise ValueError naming the field."""
+        with pytest.raises(ValueError, match=message):
+            compile_decoder(_Node)(data)
+
+    @pytest.mark.parametrize(
+        "tp", [tuple[int, int], int | str, int | str | None, dict[int, str], "set[int]"]
+    )
+    def test_unsupported_field_type(self, tp: object) -> None:
+        """Field types without a JSON mapping fail when compiling."""
+        cls = dataclasses.make_dataclass("_Bad", [("field", tp)])
+        with pytest.raises(TypeError, match=r"unsupported field type .* _Bad\.field"):
+            compile_decoder(cls)
+
+    @pytest.mark.parametrize("cls", [int, _Tag("a")])
+    def test_not_a_dataclass_type(self, cls: object) -> None:
+        """Only dataclass types can be compiled."""
+        with pytest.raises(TypeError, match="expected a dataclass type"):
+            compile_decoder(cls)  # type: ignore[arg-type]
+
+
+class TestDecodeJson:
+    """Test suite for decode_json."""
+
+    def test_decodes_object(self) -> None:
+        """Text and bytes both decode; unknown keys are ignored."""
+        data = '{"name": "t", "extra": [1, 2]}'
+        assert decode_json(_Tag, data) == decode_json(_Tag, data.encode()) == _Tag("t")
+
+    def test_post_init_runs(self) -> None:
+        """Decoding goes through __init__, so __post_init__ checks apply."""
+        assert decode_json(_Derived, '{"x": 2}').double == 4.0
+        with pytest.raises(ValueError, match="non-negative"):
+            decode_json(_Checked, '{"x": -1}')
+
+    def test_invalid_json_raises(self) -> None:
+        """Invalid JSON raises JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            decode_json(_Tag, '{"name": ')
+
+
+class TestDecodeJsonList:
+    """Test suite for decode_json_list."""
+
+    def test_matches_constructor(self) -> None:
+        """Filled instances equal, hash and compare like constructed ones."""
+        from reprorusted_std_only.dataclasses.basic_example import Point
+
+        points = decode_json_list(Point, '[{"x": 0.5, "y": 1.5}, {"y": 0.0, "x": 3.0}]')
+        assert points == [Point(0.5, 1.5), Point(3.0, 0.0)]
+        assert hash(points[0]) == hash(Point(0.5, 1.5))
+        assert points[1].distance(Point(0.0, 4.0)) == 5.0
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            points[0].x = 2.0  # type: ignore[misc]
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            '[{"x": 1.0, "y": 2}]',
+            '[{"x": 1.0, "y": 2.0, "z": 3.0}]',
+            '[{"y": 2.0, "x": 1}, {"x": 1.0, "y": 2.0}]',
+        ],
+    )
+    def test_falls_back_per_item(self, data: str) -> None:
+        """Integers for floats and extra keys still decode, one by one."""
+        from reprorusted_std_only.dataclasses.basic_example import Point
+
+        points = decode_json_list(Point, data)
+        assert points[0] == Point(1.0, 2.0)
+        assert all(type(p.x) is type(p.y) is float for p in points)
+
+    @pytest.mark.parametrize(
+        ("data", "message"),
+        [
+            ('[{"x": 1.0, "y": 1.0}, {"x": 1.0, "z": 1.0}]', "item 1: .* field 'y'"),
+            ('[{"x": 1.0, "y": 1.0}, 5]', "item 1: Point: expected a JSON object"),
+            ('[{"x": 1.0, "y": true}]', "item 0: Point.y: expected float, got bool"),
+        ],
+    )
+    def test_mismatch_names_item(self, data: str, message: str) -> None:
+        """The first bad item is reported by index."""
+        from reprorusted_std_only.dataclasses.basic_example import Point
+
+        with pytest.raises(ValueError, match=message):
+            decode_json_list(Point, data)
+
+    @pytest.mark.parametrize(
+        ("cls", "data", "expected"),
+        [
+            (_Single, '[{"n": 1}, {"n": 2}]', [_Single(1), _Single(2)]),
+            (_Slotted, '[{"x": 1.5}]', [_Slotted(1.5)]),
+            (_Derived, '[{"x": 1.5}]', [_Derived(1.5)]),
+            (_Empty, "[{}, {}]", [_Empty(), _Empty()]),
+            (_SlottedChild, '[{"x": 1.5, "y": 2.5}]', [_SlottedChild(1.5, 2.5)]),
+        ],
+    )
+    def test_class_shapes(self, cls: type, data: str, expected: list[object]) -> None:
+        """Single-field, slotted, init=False and empty classes all decode."""
+        assert decode_json_list(cls, data) == expected
+
+    @pytest.mark.parametrize("cls", [_Checked, _CheckedChild])
+    def test_post_init_runs(self, cls: type) -> None:
+        """Classes with __post_init__, own or inherited, go through __init__."""
+        with pytest.raises(ValueError, match="item 1: x must be non-negative"):
+            decode_json_list(cls, '[{"x": 1}, {"x": -1}]')
+
+    def test_custom_init_runs(self) -> None:
+        """A hand-written __init__ is called instead of being bypassed."""
+        assert decode_json_list(_Scaled, '[{"x": 1.5}]')[0].x == 15.0
+
+    def test_not_an_array(self) -> None:
+        """A top-level value other than an array raises ValueError."""
+        with pytest.raises(ValueError, match="expected a JSON array, got str"):
+            decode_json_list(_Tag, '"x"')
+
+
+# Nesting deeper than the one-match skip reaches
+_DEEP = "[" * 12 + '1, {"k": "]"}' + "]" * 12
+
+
+class TestParsePath:
+    """Test suite for parse_path."""
+
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("a", ("a",)),
+            ("a.b[3].c", ("a", "b", 3, "c")),
+            ("[0][12]", (0, 12)),
+            ("x y.é-1[0]", ("x y", "é-1", 0)),
+        ],
+    )
+    def test_valid(self, path: str, expected: tuple[str | int, ...]) -> None:
+        """Keys split on dots; indexes in brackets."""
+        assert parse_path(path) == expected
+
+    @pytest.mark.parametrize("path", ["", "a.", ".a", "a..b", "a[x]", "[0]x", "a[-1]"])
+    def test_invalid(self, path: str) -> None:
+        """Empty steps, bad indexes and missing dots raise ValueError."""
+        with pytest.raises(ValueError, match="invalid path"):
+            parse_path(path)
+
+
+class TestQuery:
+    """Test suite for query."""
+
+    def test_matches_full_parse(self) -> None:
+        """Every path into a pretty-printed document agrees with json.loads."""
+        doc = {
+            "id": 7,
+            "name": 'x "y" \\ [z]',
+            "tags": ["a", "b{", {"c": [1.5, None, True]}],
+            "empty": {"o": {}, "l": []},
+            "é": {"deep": json.loads(_DEEP)},
+        }
+        text = json.dumps(doc, indent=2)
+        paths = {
+            "id": 7,
+            "name": doc["name"],
+            "tags[1]": "b{",
+            "tags[2].c[2]": True,
+            "empty.o": {},
+            "empty.l": [],
+            "é.deep[0][0][0]": doc["é"]["deep"][0][0][0],
+        }
+        for path, expected in paths.items():
+            assert query(text, path) == expected
+            assert query(text.encode(), path) == expected
+
+    @pytest.mark.parametrize(
+        "path",
+        ["a.x", "a[0]", "b[3]", "b.x", "b[0].x", "b[0][0]", "c.x", "c[0]", "d.e"],
+    )
+    def test_missing_path(self, path: str) -> None:
+        """Absent keys, out-of-range indexes and wrong container types."""
+        with pytest.raises(KeyError):
+            query('{"a": 1, "b": [[]], "c": "x", "d": {}}', path)
+
+    def test_stops_after_last_path(self) -> None:
+        """Text after the last requested array item is never read."""
+        assert query('[[0, {"b": 1}, 2], "junk', "[0][1].b") == 1
+
+    def test_last_duplicate_wins(self) -> None:
+        """The last occurrence of a repeated key is used, as json.loads does."""
+        assert query('{"a": 1, "a": 2}', "a") == 2
+        text = '{"a": {"b": 1, "b": 2}, "c": [{"d": 3}], "c": [{"e": 4}]}'
+        paths = ["a", "a.b", "c[0].d", "c[0].e"]
+        assert query_many(text, ["a.b"]) == {"a.b": 2}
+        assert query_many(text, paths) == {"a": {"b": 2}, "a.b": 2, "c[0].e": 4}
+
+
+class TestQueryMany:
+    """Test suite for query_many."""
+
+    def test_order_and_missing(self) -> None:
+        """Results follow the requested order; missing paths are left out."""
+        text = '{"b": {"x": 1, "y": [2, 3]}, "a": [4, 5], "c": 6}'
+        paths = ["c", "b.y[1]", "a[1]", "a[9]", "b.x", "b.z", "b.x"]
+        assert list(query_many(text, paths).items()) == [
+            ("c", 6),
+            ("b.y[1]", 3),
+            ("a[1]", 5),
+            ("b.x", 1),
+        ]
+
+    def test_paths_below_a_selected_value(self) -> None:
+        """Paths inside a decoded value are looked up in it."""
+        text = '{"a": {"l": [1, 2], "k": "v"}, "n": 0}'
+        paths = ["a", "a.l[1]", "a.l[2]", "a.k", "a.k.z", "a.l.z", "a.x[0]", "n"]
+        assert query_many(text, paths) == {
+            "a": {"l": [1, 2], "k": "v"},
+            "a.l[1]": 2,
+            "a.k": "v",
+            "n": 0,
+        }
+
+    def test_no_paths(self) -> None:
+        """No paths means no scan at all."""
+        assert query_many("not json", []) == {}
+
+    def test_deep_skips(self) -> None:
+        """Containers nested past the one-match skip are walked bracket by bracket."""
+        text = f'{{"d": {_DEEP}, "e": [{_DEEP}, 1], "a": 1, "z": 2}}'
+        assert query_many(text, ["e[1]", "a"]) == {"e[1]": 1, "a": 1}
+        assert query_many(text, ["z"]) == {"z": 2}
+
+    def test_long_containers(self) -> None:
+        """Runs of unwanted items and members are skipped together."""
+        members = {f"k{i}": [i, {"s": "]}"}] for i in range(200)}
+        doc = {"o": {**members, 'a"b': 1, "é": 2}, "l": [*range(200), 9]}
+        text = json.dumps(doc)
+        paths = ["o.é", 'o.a"b', "o.k150[0]", "l[3]", "l[150]", "l[200]"]
+        assert query_many(text, paths) == {p: query(text, p) for p in paths}
+        assert query_many(text, paths)["l[200]"] == 9
+        assert query_many(json.dumps(doc, ensure_ascii=False), ["o.é"]) == {"o.é": 2}
+
+    def test_long_containers_too_deep(self) -> None:
+        """Runs fall back to one at a time where items nest too deep."""
+        items = [json.loads(_DEEP)] * 100 + [1]
+        text = json.dumps({"l": items, "o": dict.fromkeys(map(str, range(100)), items)})
+        assert query_many(text, ["l[100]", "o.99[100]"]) == {
+            "l[100]": 1,
+            "o.99[100]": 1,
+        }
+
+    def test_escaped_key_matches(self) -> None:
+        """A key spelled with escapes still matches, even inside a long run."""
+        members = ", ".join(f'"k{i}": {i}' for i in range(100))
+        text = f'{{"a": 2, {members}, "\\u0061": 1}}'
+        assert query(text, "a") == 1
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            '{"a": }',
+            '{"a": [1, }',
+            "{a: 1}",
+            '{"a" 1}',
+            '{"x": 1 "a": 2}',
+            '{"x": , "a": 1}',
+            '{"x": "abc',
+            '{"x": [1, 2',
+            '{"x": [[[[[[[[[["abc',
+            '{"x": [[[[[[[[[[1',
+            '{"a": [0 1]}',
+        ],
+    )
+    def test_malformed_on_the_way(self, text: str) -> None:
+        """Malformed text that the scan has to read raises JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            query_many(text, ["a[1]" if text.startswith('{"a": [0') else "a"])
@@ -0,0 +1,214 @@
+"""Tests for scripts/parse_cache.py."""
+
+from __future__ import annotations
+
+import ast
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Load the script module directly since scripts/ is not a package
+_SCRIPT_PATH = Path(__file__).parent.parent.parent / "scripts" / "parse_cache.py"
+_spec = importlib.util.spec_from_file_location("parse_cache", _SCRIPT_PATH)
+assert _spec is not None and _spec.loader is not None
+_mod = importlib.util.module_from_spec(_spec)
+sys.modules["parse_cache"] = _mod
+_spec.loader.exec_module(_mod)
+
+extract_functions = _mod.extract_functions  # type: ignore[attr-defined]
+extract_imports = _mod.extract_imports  # type: ignore[attr-defined]
+analyze_source = _mod.analyze_source  # type: ignore[attr-defined]
+ParseCache = _mod.ParseCache  # type: ignore[attr-defined]
+
+
+class TestExtractFunctions:
+    """Test suite for extract_functions."""
+
+    def test_single_function(self) -> None:
+        """Extracts a single function definition."""
+        source = 'def hello():\n    """Say hello."""\n    return "hi"\n'
+        funcs = extract_functions(source)
+        assert len(funcs) == 1
+        assert funcs[0]["name"] == "hello"
+
+    def test_multiple_functions(self) -> None:
+        """Extracts multiple function definitions."""
+        source = "def a():\n    pass\n\ndef b():\n    pass\n"
+        funcs = extract_functions(source)
+        assert len(funcs) == 2
+        names = [f["name"] for f in funcs]
+        assert "a" in names
+        assert "b" in names
+
+    def test_no_functions(self) -> None:
+        """Empty source returns empty list."""
+        assert extract_functions("x = 1\n") == []
+
+    def test_function_with_docstring(self) -> None:
+        """Docstring is extracted."""
+        source = 'def greet():\n    """Greet someone."""\n    pass\n'
+        funcs = extract_functions(source)
+        assert funcs[0]["docstring"] == "Greet someone."
+
+    def test_function_line_number(self) -> None:
+        """Line number is captured."""
+        source = "# comment\ndef foo():\n    pass\n"
+        funcs = extract_functions(source)
+        assert funcs[0]["line_number"] == 2
+
+    def test_empty_source(self) -> None:
+        """Empty string returns empty list."""
+        assert extract_functions("") == []
+
+    def test_async_function(self) -> None:
+        """``async def`` is extracted and flagged."""
+        source = "async def fetch():\n    pass\n\ndef sync():\n    pass\n"
+        funcs = extract_functions(source)
+        assert [(f["name"], f["is_async"]) for f in funcs] == [
+            ("fetch", True),
+            ("sync", False),
+        ]
+
+    def test_qualified_names(self) -> None:
+        """Methods and nested functions get ``__qualname__``-style names."""
+        source = (
+            "class A:\n"
+            "    def m(self):\n"
+            "        def inner():\n"
+            "            pass\n"
+            "    class B:\n"
+            "        async def n(self):\n"
+            "            pass\n"
+            "def top():\n"
+            "    class C:\n"
+            "        def k(self):\n"
+            "            pass\n"
+        )
+        assert [f["qualname"] for f in extract_functions(source)] == [
+            "A.m",
+            "A.m.<locals>.inner",
+            "A.B.n",
+            "top",
+            "top.<locals>.C.k",
+        ]
+
+    def test_functions_in_compound_statements(self) -> None:
+        """Definitions under if/try/else bodies are found in source order."""
+        source = (
+            "if True:\n"
+            "    def a(): pass\n"
+            "try:\n"
+            "    pass\n"
+            "except Exception:\n"
+            "    def b(): pass\n"
+            "else:\n"
+            "    def c(): pass\n"
+        )
+        assert [f["name"] for f in extract_functions(source)] == ["a", "b", "c"]
+
+    @pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+    def test_segments_match_ast(self, newline: str) -> None:
+        """Segments equal ``ast.get_source_segment``, also for non-ASCII."""
+        lines = [
+            "x = 'é'",
+            "class Café:",
+            "    def ünïcode(self, s='ø'): return s",
+            "    @staticmethod",
+            "    async def two(a,",
+            "                  b='€'):",
+            '        """Docstring — with a dash."""',
+            "        return a",
+        ]
+        source = newline.join(lines) + newline
+        tree = ast.parse(source)
+        expected = [
+            ast.get_source_segment(source, node)
+            for node in ast.walk(tree)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ]
+        funcs = extract_functions(source, tree)
+        assert [f["source"] for f in funcs] == expected
+        assert funcs[1]["signature"] == "async def two(a,"
+        assert funcs[1]["docstring"] == "Docstring — with a dash."
+
+
+class TestAnalyzeSource:
+    """Test suite for analyze_source."""
+
+    def test_collects_all_facts(self) -> None:
+        """Imports, functions and line count come from one parse."""
+        source = "import os\nfrom json import dumps\n\ndef f():\n    pass\n"
+        result = analyze_source(source)
+        assert result["imports"] == [["os", 1], ["json", 2]]
+        assert [f["name"] for f in result["functions"]] == ["f"]
+        assert result["line_count"] == 5
+
+    def test_nested_imports_found(self) -> None:
+        """Imports inside functions are reported with their line."""
+        source = "def f():\n    import numpy\n"
+        assert analyze_source(source)["imports"] == [["numpy", 2]]
+
+    def test_relative_import_without_module_skipped(self) -> None:
+        """``from . import x`` has no module name to check."""
+        assert analyze_source("from . import x\n")["imports"] == []
+
+    def test_syntax_error_propagates(self) -> None:
+        """Invalid source raises SyntaxError."""
+        with pytest.raises(SyntaxError):
+            analyze_source("def (:\n")
+
+
+class TestParseCache:
+    """Test suite for ParseCache."""
+
+    def test_miss_then_hit(self, tmp_path: Path) -> None:
+        """Second lookup of the same content is served from disk."""
+        cache = ParseCache(tmp_path)
+        first = cache.analyze("import os\n")
+        second = cache.analyze("import os\n")
+        assert first == second
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_shared_between_instances(self, tmp_path: Path) -> None:
+        """A new instance over the same directory reuses entries."""
+        ParseCache(tmp_path).analyze("x = 1\n")
+        cache = ParseCache(tmp_path)
+        cache.analyze("x = 1\n")
+        assert cache.hits == 1
+
+    def test_different_content_different_key(self, tmp_path: Path) -> None:
+        """Keys are derived from content."""
+        cache = ParseCache(tmp_path)
+        assert cache.key("a = 1\n") != cache.key("a = 2\n")
+
+    def test_corrupt_entry_reparsed(self, tmp_path: Path) -> None:
+        """An unreadable entry is treated as a miss and rewritten."""
+        cache = ParseCache(tmp_path)
+        cache.analyze("y = 2\n")
+        (entry,) = tmp_path.glob("*/*.json")
+        entry.write_text("{")
+        assert cache.analyze("y = 2\n")["line_count"] == 1
+        assert cache.misses == 2
+        assert json.loads(entry.read_text())["line_count"] == 1
+
+    def test_prune_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """Pruning keeps the most recently used entries within budget."""
+        cache = ParseCache(tmp_path, max_bytes=0)
+        sources = [f"v{i} = {i}\n" for i in range(3)]
+        for source in sources:
+            cache.analyze(source)
+        entries = sorted(tmp_path.glob("*/*.json"))
+        for age, entry in enumerate(entries):
+            ns = 10**18 + age * 10**9
+            os.utime(entry, ns=(ns, ns))
+        cache.max_bytes = entries[-1].stat().st_size
+        assert cache.prune() == 2
+        assert list(tmp_path.glob("*/*.json")) == [entries[-1]]
+
+    def test_prune_missing_dir(self, tmp_path: Path) -> None:
+        """Pruning a cache that was never written is a no-op."""
+        assert ParseCache(tmp_path / "absent").prune() == 0
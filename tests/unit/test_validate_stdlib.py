@@ -7,6 +7,8 @@ import sys
 from pathlib import Path
 from unittest import mock
 
+import pytest
+
 # Load the script module directly since scripts/ is not a package
 _SCRIPT_PATH = (
     Path(__file__).parent.parent.parent / "scripts" / "validate_stdlib_only.py"
@@ -19,6 +21,11 @@ _spec.loader.exec_module(_mod)
 
 check_file = _mod.check_file  # type: ignore[attr-defined]
 main = _mod.main  # type: ignore[attr-defined]
+ParseCache = _mod.ParseCache  # type: ignore[attr-defined]
+scan_files = _mod.scan_files  # type: ignore[attr-defined]
+extract_imports = _mod.extract_imports  # type: ignore[attr-defined]
+
+SRC_DIR = Path(__file__).parent.parent.parent / "src" / "reprorusted_std_only"
 
 
 class TestCheckFile:
@@ -65,6 +72,62 @@ class TestCheckFile:
         violations = check_file(p)
         assert len(violations) == 2
 
+    def test_nested_import_flagged(self, tmp_path: Path) -> None:
+        """Imports inside function bodies are still checked."""
+        p = tmp_path / "nested.py"
+        p.write_text("def f():\n    import yaml\n")
+        assert check_file(p) == [f"{p}:2 imports 'yaml'"]
+
+    @pytest.mark.parametrize(
+        "body", ["import os\nx = = 1\n", "def f():\n    import os\n    x = = 1\n"]
+    )
+    def test_syntax_error_fails(self, tmp_path: Path, body: str) -> None:
+        """Files that do not parse fail on both the tokenizer and ast paths."""
+        p = tmp_path / "broken.py"
+        p.write_text(body)
+        with pytest.raises(SyntaxError):
+            check_file(p)
+
+    def test_cached_matches_uncached(self, tmp_path: Path) -> None:
+        """Cached and uncached scans report the same violations."""
+        p = tmp_path / "mixed.py"
+        p.write_text("import os\nif os:\n    import numpy\nfrom flask import Flask\n")
+        cache = ParseCache(tmp_path / "cache")
+        expected = check_file(p)
+        assert check_file(p, cache) == expected
+        assert check_file(p, cache) == expected
+        assert cache.hits == 1
+
+
+class TestScanFiles:
+    """Test suite for scan_files."""
+
+    def test_parallel_matches_serial(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Pool mode reports the same violations in the same order."""
+        monkeypatch.setattr(_mod, "CHUNK_SIZE", 2)
+        paths = []
+        for i, body in enumerate(
+            ["import numpy\n", "import os\n", "def f():\n    import yaml\n"] * 2
+        ):
+            p = tmp_path / f"m{i}.py"
+            p.write_text(body)
+            paths.append(p)
+        serial = scan_files(paths)
+        assert scan_files(paths, jobs=2) == serial
+        assert serial[1] == len(paths)
+        assert len(serial[0]) == 4
+
+    def test_full_parse_result_cached(self, tmp_path: Path) -> None:
+        """Files that need ast are parsed once and then served from cache."""
+        p = tmp_path / "nested.py"
+        p.write_text("def f():\n    import yaml\n")
+        cache = ParseCache(tmp_path / "cache")
+        assert scan_files([p], cache=cache)[1] == 1
+        assert scan_files([p], cache=cache)[1] == 0
+        assert cache.hits == 1
+
 
 class TestMain:
     """Test suite for main function."""
@@ -79,3 +142,34 @@ class TestMain:
         with mock.patch.object(Path, "exists", return_value=False):
             result = main()
             assert result == 1
+
+    def test_main_without_cache(self) -> None:
+        """Main succeeds with the parse cache disabled."""
+        assert main(["--no-cache"]) == 0
+
+    def test_main_reports_throughput(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Main prints scan time and files/sec."""
+        assert main(["--jobs", "2", "--no-cache"]) == 0
+        assert "files/sec" in capsys.readouterr().out
+
+    def test_main_counts_every_parse(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Every file is parsed once, then served from the cache."""
+        files = len(list(SRC_DIR.rglob("*.py")))
+        cache_dir = str(tmp_path / "cache")
+        for parses in (files, 0):
+            assert main(["--cache-dir", cache_dir]) == 0
+            out = capsys.readouterr().out
+            assert f"Full AST parses: {parses} ({files - parses} from cache)" in out
+
+    def test_main_rejects_negative_jobs(self) -> None:
+        """Negative worker counts are a usage error."""
+        with pytest.raises(SystemExit):
+            main(["--jobs", "-1"])
+
+    def test_main_populates_cache(self, tmp_path: Path) -> None:
+        """Main writes parse results to the requested cache directory."""
+        cache_dir = tmp_path / "cache"
+        assert main(["--cache-dir", str(cache_dir)]) == 0
+        assert any(cache_dir.glob("*/*.json"))